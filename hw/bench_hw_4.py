@@ -0,0 +1,93 @@
+"""Бенчмарк восстановления ядра свёртки (hw_4.py): прежняя система из четырёх
+вложенных циклов + lstsq против im2col, нормальных уравнений и БПФ.
+
+Запуск: python bench_hw_4.py [--size 2000] [--kernels 3 7 15]
+
+Прежний способ проверяется только на маленьком изображении (--legacy-size):
+на мегапиксельных он не успевает и не помещается в память.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import hw_4
+
+
+def legacy_recover(A, C, h, w):
+    """Прежний solve() из hw_4.py без чтения ввода - эталон по результату"""
+    m, n = A.shape
+    pad_h = (h - 1) // 2
+    pad_w = (w - 1) // 2
+    equations = []
+    rhs = []
+    for i in range(m):
+        for j in range(n):
+            equation = np.zeros((h, w), dtype=np.int32)
+            for k in range(h):
+                for r in range(w):
+                    a_i = i - k + pad_h
+                    a_j = j - r + pad_w
+                    if 0 <= a_i < m and 0 <= a_j < n:
+                        equation[k, r] = A[a_i, a_j]
+            equations.append(equation.flatten())
+            rhs.append(C[i, j])
+    A_matrix = np.array(equations, dtype=np.int32)
+    b_vector = np.array(rhs, dtype=np.int32)
+    B_flat = np.linalg.lstsq(A_matrix, b_vector, rcond=None)[0]
+    return np.round(B_flat).reshape((h, w)).astype(np.int32)
+
+
+def make_problem(rng, m, n, h, w):
+    """Изображение 0..255, целочисленное ядро и точная свёртка (int64, блоками)"""
+    A = rng.integers(0, 256, (m, n), dtype=np.int32)
+    B = rng.integers(-4, 5, (h, w), dtype=np.int32)
+    windows = hw_4.shifted_windows(A, h, w)
+    C = np.empty((m, n), dtype=np.int64)
+    rows = max(1, hw_4.CHUNK_ELEMENTS // (n * h * w))
+    for start in range(0, m, rows):
+        C[start:start + rows] = np.einsum('ijkr,kr->ij', windows[start:start + rows].astype(np.int64), B)
+    return A, B, C.astype(np.int32)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def run(size, kernels, legacy_size, dense_limit):
+    rng = np.random.default_rng(0)
+
+    A, B, C = make_problem(rng, legacy_size, legacy_size, 3, 3)
+    expected, legacy_time = timed(legacy_recover, A, C, 3, 3)
+    assert np.array_equal(expected, B)
+    print(f"{legacy_size}x{legacy_size}, ядро 3x3: прежний способ {legacy_time:.2f} с")
+    for method in hw_4.METHODS:
+        result, elapsed = timed(hw_4.recover_kernel, A, C, 3, 3, method)
+        assert np.array_equal(result, expected), method
+        print(f"{'':>12}{method:>7}: {elapsed * 1e3:8.1f} мс, x{legacy_time / elapsed:.0f}")
+
+    for kernel in kernels:
+        A, B, C = make_problem(rng, size, size, kernel, kernel)
+        methods = [m for m in hw_4.METHODS if m != 'lstsq' or size * size * kernel * kernel <= dense_limit]
+        times = {}
+        for method in methods:
+            result, times[method] = timed(hw_4.recover_kernel, A, C, kernel, kernel, method)
+            assert np.array_equal(result, B), method
+        auto = hw_4.choose_method(size, size, kernel, kernel)
+        print(
+            f"{size}x{size} ({size * size / 1e6:.1f} Мп), ядро {kernel}x{kernel}: "
+            + ", ".join(f"{method} {elapsed:.2f} с" for method, elapsed in times.items())
+            + f"; auto выбирает {auto}"
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--kernels', type=int, nargs='+', default=[3, 7, 15])
+    parser.add_argument('--legacy-size', type=int, default=200)
+    parser.add_argument('--dense-limit', type=int, default=2 * 10**7, help='максимум m*n*h*w для lstsq по всей матрице')
+    args = parser.parse_args()
+    run(args.size, args.kernels, args.legacy_size, args.dense_limit)
@@ -0,0 +1,88 @@
+"""Бенчмарк пакетного режима hw_4.py: отдельный процесс на задачу против
+python hw_4.py --batch с пулом процессов.
+
+Запуск: python bench_hw_4_batch.py [--problems 200] [--size 200] [--workers N]
+
+Задачи генерируются во временную папку (текст) и в .zip с .npy-файлами.
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+
+import hw_4
+from bench_hw_4 import make_problem
+from bench_hw_4_input import problem_text
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hw_4.py')
+
+
+def generate(root, problems, size, seed=0):
+    rng = np.random.default_rng(seed)
+    kernels = {}
+    folder = os.path.join(root, 'problems')
+    os.makedirs(folder)
+    archive_path = os.path.join(root, 'problems.zip')
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        for i in range(problems):
+            h, w = rng.choice([1, 3, 5], 2)
+            A, B, C = make_problem(rng, size, size, h, w)
+            name = f'{i:04}'
+            kernels[name] = B.tolist()
+            with open(os.path.join(folder, f'{name}.txt'), 'w') as file:
+                file.write(problem_text(A, C, h, w))
+            buffer = io.BytesIO()
+            hw_4.save_npy(buffer, A, C, h, w)
+            archive.writestr(f'{name}.npy', buffer.getvalue())
+    return folder, archive_path, kernels
+
+
+def run_batch(source, workers, kernels):
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, SCRIPT, source, '--batch', '--workers', str(workers)],
+        capture_output=True, text=True, check=True,
+    )
+    elapsed = time.perf_counter() - started
+    results = [json.loads(line) for line in completed.stdout.splitlines()]
+    for result in results:
+        assert result['kernel'] == kernels[os.path.splitext(result['name'])[0]], result['name']
+    return elapsed, len(results), completed.stderr.strip()
+
+
+def run(problems, size, workers, single):
+    with tempfile.TemporaryDirectory() as root:
+        folder, archive, kernels = generate(root, problems, size)
+        names = sorted(os.listdir(folder))[:single]
+
+        started = time.perf_counter()
+        for name in names:
+            completed = subprocess.run([sys.executable, SCRIPT, os.path.join(folder, name)],
+                                       capture_output=True, text=True, check=True)
+            kernel = [list(map(int, row.split(','))) for row in completed.stdout.split()]
+            assert kernel == kernels[os.path.splitext(name)[0]], name
+        per_problem = (time.perf_counter() - started) / len(names)
+        print(f"процесс на задачу: {per_problem * 1e3:.0f} мс на задачу, {1 / per_problem:.1f} задач/с "
+              f"(по {len(names)} задачам)")
+
+        for label, source in (('--batch, папка .txt', folder), ('--batch, .zip с .npy', archive)):
+            elapsed, count, report = run_batch(source, workers, kernels)
+            print(f"{label}: {count} задач за {elapsed:.2f} с, {count / elapsed:.1f} задач/с "
+                  f"(x{per_problem * count / elapsed:.0f})\n    {report}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--problems', type=int, default=200)
+    parser.add_argument('--size', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--single', type=int, default=20, help='сколько задач запустить по одной для сравнения')
+    args = parser.parse_args()
+    run(args.problems, args.size, args.workers, args.single)
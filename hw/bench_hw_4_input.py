@@ -0,0 +1,111 @@
+"""Бенчмарк чтения задачи hw_4.py: прежний split по строкам и list(map(int, ...))
+против потокового разбора в int32 (stdin, mmap) и бинарного .npy.
+
+Запуск: python bench_hw_4_input.py [--size 2000]
+
+Пик памяти Python считается через tracemalloc (буферы NumPy он тоже видит).
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import hw_4
+
+
+def legacy_read(text):
+    """Прежнее чтение из solve() в hw_4.py"""
+    input = text.split('\n')
+    ptr = 0
+    while ptr < len(input) and input[ptr].strip() == '':
+        ptr += 1
+    m, n = map(int, input[ptr].strip().split())
+    ptr += 1
+    A = []
+    for _ in range(m):
+        while ptr < len(input) and input[ptr].strip() == '':
+            ptr += 1
+        A.append(list(map(int, input[ptr].strip().split(','))))
+        ptr += 1
+    A = np.array(A, dtype=np.int32)
+    while ptr < len(input) and input[ptr].strip() == '':
+        ptr += 1
+    h, w = map(int, input[ptr].strip().split())
+    ptr += 1
+    C = []
+    for _ in range(m):
+        while ptr < len(input) and input[ptr].strip() == '':
+            ptr += 1
+        C.append(list(map(int, input[ptr].strip().split(','))))
+        ptr += 1
+    C = np.array(C, dtype=np.int32)
+    return A, C, h, w
+
+
+def problem_text(A, C, h, w):
+    m, n = A.shape
+    rows = lambda M: '\n'.join(','.join(map(str, row)) for row in M.tolist())
+    return f"{m} {n}\n{rows(A)}\n\n{h} {w}\n{rows(C)}\n"
+
+
+def load(func, source):
+    A, C, h, w = func(source() if callable(source) else source)
+    # Для .npy данные читаются с диска только при обращении
+    int(A.sum(dtype=np.int64) + C.sum(dtype=np.int64))
+    return A, C, h, w
+
+
+def measure(func, source):
+    """Результат, время и пик памяти; время - отдельным прогоном, tracemalloc замедляет Python-код"""
+    started = time.perf_counter()
+    result = load(func, source)
+    elapsed = time.perf_counter() - started
+    del result
+    tracemalloc.start()
+    result = load(func, source)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(size):
+    rng = np.random.default_rng(0)
+    A = rng.integers(0, 256, (size, size), dtype=np.int32)
+    C = rng.integers(-10**6, 10**6, (size, size), dtype=np.int32)
+    text = problem_text(A, C, 3, 3)
+    data = text.encode()
+    print(f"Задача {size}x{size}: текст {len(text) / 2**20:.1f} МБ, массивы {2 * A.nbytes / 2**20:.1f} МБ")
+
+    with tempfile.TemporaryDirectory() as root:
+        text_path = os.path.join(root, 'problem.txt')
+        npy_path = os.path.join(root, 'problem.npy')
+        with open(text_path, 'w') as file:
+            file.write(text)
+        hw_4.save_npy(npy_path, A, C, 3, 3)
+
+        readers = {
+            'прежний split': (legacy_read, text),
+            'поток (stdin)': (hw_4.read_text, lambda: io.BytesIO(data)),
+            'mmap текста': (hw_4.read_problem, text_path),
+            '.npy (mmap)': (hw_4.read_problem, npy_path),
+        }
+        baseline = None
+        for name, (func, source) in readers.items():
+            (A2, C2, h, w), elapsed, peak = measure(func, source)
+            assert np.array_equal(A2, A) and np.array_equal(C2, C) and (h, w) == (3, 3), name
+            baseline = baseline or elapsed
+            print(
+                f"{name:>14}: {elapsed:7.3f} с (x{baseline / elapsed:.0f}), "
+                f"{len(text) / 2**20 / elapsed:7.0f} МБ/с текста, пик памяти {peak / 2**20:6.1f} МБ"
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=2000)
+    args = parser.parse_args()
+    run(args.size)
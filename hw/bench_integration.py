@@ -0,0 +1,106 @@
+"""Бенчмарк интегрирования (numpy_tasks.py): постоянный шаг compute_integral
+против адаптивных integrate (Гаусс-Кронрод G7-K15 и Симпсон) - точность на
+число вычислений f; память compute_integral при очень малом dx; пакетное
+интегрирование многих интервалов одним вызовом.
+
+Запуск: python bench_integration.py
+"""
+import math
+import time
+import tracemalloc
+
+import numpy as np
+
+from numpy_tasks import compute_integral, integrate
+
+FUNCTIONS = [
+    # Первообразная (x^2+3)/(x-2) = x^2/2 + 2x + 7 ln(x-2)
+    ('(x^2+3)/(x-2) на [3, 4]', lambda x: (x**2 + 3) / (x - 2), 3, 4, 5.5 + 7 * math.log(2)),
+    ('cos^3 на [0, pi/2]', lambda x: np.cos(x)**3, 0, np.pi / 2, 2 / 3),
+    ('exp(-x^2) на [-3, 3]', lambda x: np.exp(-x**2), -3, 3, math.sqrt(math.pi) * math.erf(3)),
+    ('sqrt(x) на [0, 1]', np.sqrt, 0, 1, 2 / 3),
+    ('1/(1+25x^2) на [-1, 1]', lambda x: 1 / (1 + 25 * x**2), -1, 1, 2 / 5 * math.atan(5)),
+    ('sin(50x) на [0, 1]', lambda x: np.sin(50 * x), 0, 1, (1 - math.cos(50)) / 50),
+]
+STEPS = [1e-2, 1e-3, 1e-4, 1e-5]
+TOLERANCES = [1e-6, 1e-10, 1e-13]
+
+
+class Counter:
+    """Обёртка, считающая точки, в которых вычислялась f"""
+
+    def __init__(self, f):
+        self.f = f
+        self.points = 0
+
+    def __call__(self, x):
+        self.points += np.size(x)
+        return self.f(x)
+
+
+def accuracy_table():
+    for title, f, a, b, exact in FUNCTIONS:
+        print(f"\n{title} = {exact:.15g}")
+        print(f"{'метод':>18} {'шаг/tol':>8} {'вычислений f':>13} {'ошибка':>10}")
+        for method in ('rectangular', 'trapezoidal', 'simpson'):
+            for dx in STEPS:
+                counter = Counter(f)
+                error = abs(compute_integral(a, b, counter, dx, method) - exact)
+                print(f"{method:>18} {dx:>8.0e} {counter.points:>13} {error:>10.1e}")
+        for method in ('adaptive_simpson', 'gauss_kronrod'):
+            for tol in TOLERANCES:
+                counter = Counter(f)
+                error = abs(integrate(counter, a, b, method, tol) - exact)
+                print(f"{method:>18} {tol:>8.0e} {counter.points:>13} {error:>10.1e}")
+
+
+def chunked_memory(dx=1e-7):
+    f = lambda x: np.cos(x)**3
+    points = int(np.pi / 2 / dx) + 1
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = compute_integral(0, np.pi / 2, f, dx, 'simpson')
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"\ncompute_integral, dx={dx:g} ({points / 1e6:.0f} млн точек): {elapsed:.2f} с, "
+        f"пик памяти {peak / 2**20:.0f} МБ (массив x целиком - {points * 8 / 2**20:.0f} МБ), "
+        f"ошибка {abs(value - 2 / 3):.1e}"
+    )
+
+
+def batched(count=10_000):
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-2, 0, count)
+    b = rng.uniform(0, 2, count)
+    f = lambda x: np.exp(-x**2)
+    exact = np.sqrt(np.pi) / 2 * (np.array([math.erf(v) for v in b]) - np.array([math.erf(v) for v in a]))
+
+    started = time.perf_counter()
+    values = integrate(f, a, b, tol=1e-12)
+    batch_time = time.perf_counter() - started
+    started = time.perf_counter()
+    single = [integrate(f, lo, hi, tol=1e-12) for lo, hi in zip(a[:1000], b[:1000])]
+    loop_time = (time.perf_counter() - started) * count / 1000
+    assert np.allclose(values[:1000], single, rtol=1e-13, atol=0)
+    print(
+        f"\n{count} интервалов exp(-x^2): одним вызовом {batch_time * 1e3:.0f} мс, "
+        f"по одному ~{loop_time * 1e3:.0f} мс (x{loop_time / batch_time:.0f}); "
+        f"макс. ошибка {np.max(np.abs(values - exact)):.1e}"
+    )
+
+    functions = [lambda x, k=k: np.sin(k * x) for k in range(1, 51)]
+    started = time.perf_counter()
+    values = integrate(functions, 0, np.pi, tol=1e-12)
+    exact = np.array([(1 - math.cos(k * math.pi)) / k for k in range(1, 51)])
+    print(
+        f"50 функций sin(kx) на [0, pi]: {(time.perf_counter() - started) * 1e3:.0f} мс, "
+        f"макс. ошибка {np.max(np.abs(values - exact)):.1e}"
+    )
+
+
+if __name__ == '__main__':
+    accuracy_table()
+    chunked_memory()
+    batched()
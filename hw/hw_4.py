@@ -1,77 +1,416 @@
+import argparse
+import io
+import json
+import mmap
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Восстановление ядра свёртки B (h x w) по изображению A (m x n) и результату
+# C = A * B (режим 'same', нули за краем):
+#     C[i, j] = sum_{k, r} B[k, r] * A[i - k + pad_h, j - r + pad_w]
+# Это система из m*n уравнений с h*w неизвестными. Три способа её решить:
+# - 'lstsq': матрица системы целиком (im2col без циклов) и np.linalg.lstsq;
+# - 'normal': нормальные уравнения G x = b размера (h*w)^2, матрица im2col
+#   строится и умножается блоками строк, поэтому память не растёт с размером A;
+# - 'fft': G - автокорреляция A, b - взаимная корреляция C и A, обе через БПФ;
+#   из G вычитается вклад "рамки" полной свёртки, которой нет в режиме 'same'.
+METHODS = ('lstsq', 'normal', 'fft')
+# Сколько элементов im2col держать в памяти одновременно (float64, ~32 МБ)
+CHUNK_ELEMENTS = 4 * 2**20
+# Относительная стоимость одного элемента БПФ (подобрана по бенчмарку bench_hw_4.py)
+FFT_COST = 8
+
+
+def paddings(h, w):
+    return (h - 1) // 2, (w - 1) // 2
+
+
+def shifted_windows(A, h, w):
+    """Представление (m, n, h, w): [i, j, k, r] = A[i - k + pad_h, j - r + pad_w] или 0 за краем"""
+    pad_h, pad_w = paddings(h, w)
+    P = np.pad(A, ((h - 1 - pad_h, pad_h), (w - 1 - pad_w, pad_w)))
+    return sliding_window_view(P, (h, w))[:, :, ::-1, ::-1]
+
+
+def design_matrix(A, h, w):
+    """Матрица системы (m*n, h*w) целиком"""
+    m, n = A.shape
+    return shifted_windows(A, h, w).reshape(m * n, h * w).astype(np.float64)
+
+
+class Scratch:
+    """Переиспользуемый буфер float64: в пакетном режиме блоки im2col не выделяются заново"""
+
+    def __init__(self):
+        self._buffer = np.empty(0)
+
+    def array(self, shape):
+        size = int(np.prod(shape))
+        if self._buffer.size < size:
+            self._buffer = np.empty(size)
+        return self._buffer[:size].reshape(shape)
+
+
+def normal_equations(A, C, h, w, scratch=None):
+    """G = M^T M и b = M^T c, где M строится блоками по CHUNK_ELEMENTS элементов"""
+    m, n = A.shape
+    windows = shifted_windows(A, h, w)
+    rows = max(1, CHUNK_ELEMENTS // (n * h * w))
+    scratch = scratch or Scratch()
+    G = np.zeros((h * w, h * w))
+    b = np.zeros(h * w)
+    for start in range(0, m, rows):
+        part = windows[start:start + rows]
+        block = scratch.array(part.shape)
+        np.copyto(block, part)
+        block = block.reshape(-1, h * w)
+        G += block.T @ block
+        b += block.T @ C[start:start + rows].ravel()
+    return G, b
+
+
+def fft_size(n):
+    """Ближайший размер >= n вида 2^a * 3^b * 5^c: на таких длинах БПФ самое быстрое"""
+    best = 2 * n
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def kernel_offsets(h, w):
+    k, r = np.divmod(np.arange(h * w), w)
+    return k, r
+
+
+def frame_rows(A, h, w):
+    """Строки системы полной свёртки для пикселей вне кадра m x n"""
+    m, n = A.shape
+    pad_h, pad_w = paddings(h, w)
+    rows = np.arange(-pad_h, m + h - 1 - pad_h)
+    cols = np.arange(-pad_w, n + w - 1 - pad_w)
+    outside = np.ones((rows.size, cols.size), dtype=bool)
+    outside[pad_h:pad_h + m, pad_w:pad_w + n] = False
+    i, j = np.nonzero(outside)
+    k, r = kernel_offsets(h, w)
+    Q = np.pad(A, ((h - 1, h - 1), (w - 1, w - 1)))
+    return Q[(rows[i] + pad_h + h - 1)[:, None] - k, (cols[j] + pad_w + w - 1)[:, None] - r].astype(np.float64)
+
+
+def fft_normal_equations(A, C, h, w):
+    """Те же G и b за O(m*n*log(m*n)) независимо от размера ядра"""
+    m, n = A.shape
+    pad_h, pad_w = paddings(h, w)
+    shape = (fft_size(m + h - 1), fft_size(n + w - 1))
+    FA = np.fft.rfft2(A, shape)
+    autocorrelation = np.fft.irfft2(FA * FA.conj(), shape)
+    correlation = np.fft.irfft2(np.fft.rfft2(C, shape) * FA.conj(), shape)
+
+    k, r = kernel_offsets(h, w)
+    # По всей плоскости (полная свёртка) элемент G зависит только от разности сдвигов
+    G = autocorrelation[(k[:, None] - k) % shape[0], (r[:, None] - r) % shape[1]]
+    frame = frame_rows(A, h, w)
+    G -= frame.T @ frame
+    b = correlation[(k - pad_h) % shape[0], (r - pad_w) % shape[1]]
+    return G, b
+
+
+def choose_method(m, n, h, w):
+    normal_cost = m * n * (h * w) ** 2
+    frame = (h - 1) * (n + w) + (w - 1) * m
+    fft_cost = FFT_COST * m * n * np.log2(max(m * n, 2)) + frame * (h * w) ** 2
+    return 'fft' if fft_cost < normal_cost else 'normal'
+
+
+def recover_kernel(A, C, h, w, method=None, scratch=None):
+    """Целочисленное ядро h x w, при котором свёртка A даёт C (МНК, минимальная норма)"""
+    A = np.asarray(A)
+    C = np.asarray(C, dtype=np.float64)
+    m, n = A.shape
+    method = method or choose_method(m, n, h, w)
+    if method == 'lstsq':
+        B_flat = np.linalg.lstsq(design_matrix(A, h, w), C.ravel(), rcond=None)[0]
+    elif method == 'normal' or method == 'fft':
+        if method == 'normal':
+            G, b = normal_equations(A, C, h, w, scratch)
+        else:
+            G, b = fft_normal_equations(A, C, h, w)
+        # lstsq, а не solve: для вырожденной системы даёт то же решение минимальной нормы
+        B_flat = np.linalg.lstsq(G, b, rcond=None)[0]
+    else:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+    return np.round(B_flat).reshape((h, w)).astype(np.int32)
+
+
+# Ввод. Текстовый формат: строка "m n", m строк A через запятую, строка "h w",
+# затем C (m x n, как и A); пустые строки между блоками допускаются. Текст
+# читается кусками по READ_CHUNK байт (4 МБ) и разбирается np.fromstring сразу в
+# заранее выделенные массивы int32, без промежуточных строк и списков.
+# Бинарный формат .npy - плоский int32 [m, n, h, w, A..., C...]: файл
+# отображается в память, A и C - представления без копирования.
+READ_CHUNK = 1 << 22
+SEPARATORS = bytes.maketrans(b',;\r\n\t', b'     ')
+
+
+class IntReader:
+    """Поток целых чисел из текста, разделённого запятыми, пробелами и переводами строк.
+
+    stream - любой объект с методом read(size): sys.stdin.buffer, файл или mmap.
+    """
+
+    def __init__(self, stream, chunk_size=READ_CHUNK):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._tail = b''
+        self._pending = np.empty(0, dtype=np.int64)
+
+    def _parse(self, data):
+        return np.fromstring(data, dtype=np.int64, sep=' ') if data.strip() else self._pending[:0]
+
+    def _next_values(self):
+        """Очередная порция чисел; пустой массив - конец потока"""
+        while True:
+            data = self.stream.read(self.chunk_size)
+            if not data:
+                data, self._tail = self._tail, b''
+                return self._parse(data)
+            data = self._tail + data.translate(SEPARATORS)
+            # Последнее число куска может продолжиться в следующем
+            cut = data.rfind(b' ') + 1
+            data, self._tail = data[:cut], data[cut:]
+            values = self._parse(data)
+            if values.size:
+                return values
+
+    def read_into(self, out):
+        """Заполняет одномерный массив out следующими out.size числами"""
+        filled = 0
+        while filled < out.size:
+            if not self._pending.size:
+                self._pending = self._next_values()
+                if not self._pending.size:
+                    raise ValueError(f"unexpected end of input: expected {out.size} values, got {filled}")
+            take = min(out.size - filled, self._pending.size)
+            values = self._pending[:take]
+            if values.dtype != out.dtype and np.issubdtype(out.dtype, np.integer):
+                # Присваивание в более узкий тип молча переполняется - проверяем диапазон заранее
+                limits = np.iinfo(out.dtype)
+                bad = values[(values < limits.min) | (values > limits.max)]
+                if bad.size:
+                    raise ValueError(f"value {bad[0]} is out of range for {out.dtype}")
+            out[filled:filled + take] = values
+            self._pending = self._pending[take:]
+            filled += take
+        return out
+
+    def read_ints(self, count):
+        return self.read_into(np.empty(count, dtype=np.int64)).tolist()
+
+    def at_end(self):
+        if not self._pending.size:
+            self._pending = self._next_values()
+        return not self._pending.size
+
+
+def read_text(stream):
+    reader = IntReader(stream)
+    m, n = reader.read_ints(2)
+    A = reader.read_into(np.empty(m * n, dtype=np.int32)).reshape(m, n)
+    h, w = reader.read_ints(2)
+    # C той же формы, что и A; лишние или недостающие числа - ошибка формата
+    C = reader.read_into(np.empty(m * n, dtype=np.int32)).reshape(m, n)
+    if not reader.at_end():
+        raise ValueError(f"extra values after C, expected C of shape {m}x{n}")
+    return A, C, h, w
+
+
+def save_npy(path, A, C, h, w):
+    m, n = A.shape
+    np.save(path, np.concatenate([[m, n, h, w], np.ravel(A), np.ravel(C)]).astype(np.int32))
+
+
+def load_npy(path):
+    """Задача из .npy; путь отображается в память, файловый объект читается целиком"""
+    data = np.load(path, mmap_mode='r' if isinstance(path, (str, os.PathLike)) else None)
+    m, n, h, w = data[:4].tolist()
+    if data.size != 4 + 2 * m * n:
+        raise ValueError(f"{path}: expected {4 + 2 * m * n} values, got {data.size}")
+    return data[4:4 + m * n].reshape(m, n), data[4 + m * n:].reshape(m, n), h, w
+
+
+def read_problem(source=None):
+    """A, C, h, w из stdin (source None или '-'), текстового файла или .npy"""
+    if source in (None, '-'):
+        return read_text(sys.stdin.buffer)
+    if str(source).endswith('.npy'):
+        return load_npy(source)
+    with open(source, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return read_text(file)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return read_text(data)
+
+
+def format_kernel(B):
+    return '\n'.join(','.join(map(str, row)) for row in B.tolist())
+
+
+def solve(source=None):
+    A, C, h, w = read_problem(source)
+    B = recover_kernel(A, C, h, w)
+    print(format_kernel(B))
+
+
+# Пакетный режим: задачи из папки или архива (.zip, .tar, .tar.gz) решаются
+# в пуле процессов. Процессы живут всё время работы: NumPy импортирован один
+# раз, буферы Scratch переиспользуются. В работе одновременно не больше
+# BATCH_INFLIGHT задач на процесс, поэтому большой архив не читается в память
+# целиком. Результаты пишутся по мере готовности, по строке JSON на задачу.
+BATCH_INFLIGHT = 2
+
+_scratch = None
+
+
+def iter_problems(source):
+    """Пары (имя, путь или содержимое файла) в порядке имён"""
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path) and not name.startswith('.'):
+                yield name, path
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                if not info.is_dir():
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(source):
+        # tar читается последовательно, поэтому в порядке архива
+        with tarfile.open(source) as archive:
+            for member in archive:
+                if member.isfile():
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{source}: expected a directory, .zip or .tar archive")
+
+
+def read_payload(name, payload):
+    if not isinstance(payload, bytes):
+        return read_problem(payload)
+    if name.endswith('.npy'):
+        return load_npy(io.BytesIO(payload))
+    return read_text(io.BytesIO(payload))
+
+
+def init_worker():
+    """Прогрев процесса пула: LAPACK и БПФ загружаются до первой настоящей задачи"""
+    global _scratch
+    _scratch = Scratch()
+    A = np.arange(16, dtype=np.int32).reshape(4, 4)
+    for method in METHODS:
+        recover_kernel(A, A, 1, 1, method, _scratch)
+
+
+def solve_task(name, payload):
+    started = time.perf_counter()
+    try:
+        A, C, h, w = read_payload(name, payload)
+        B = recover_kernel(A, C, h, w, scratch=_scratch)
+        result = {'name': name, 'shape': [*A.shape, h, w], 'kernel': B.tolist()}
+    except Exception as e:
+        result = {'name': name, 'error': f"{type(e).__name__}: {e}"}
+    result['seconds'] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def run_batch(source, out, workers=None):
+    """Решает все задачи из source, пишет результаты в out и возвращает статистику"""
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    timings = []
+    errors = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        pending = set()
+        for name, payload in iter_problems(source):
+            pending.add(pool.submit(solve_task, name, payload))
+            if len(pending) < workers * BATCH_INFLIGHT:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            errors += _write_results(done, out, timings)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            errors += _write_results(done, out, timings)
+
+    elapsed = time.perf_counter() - started
+    count = len(timings)
+    timings = np.array(timings or [0.0])
+    return {
+        'problems': count,
+        'errors': errors,
+        'workers': workers,
+        'seconds': elapsed,
+        'throughput': count / elapsed,
+        'mean': float(timings.mean()),
+        'p50': float(np.percentile(timings, 50)),
+        'p95': float(np.percentile(timings, 95)),
+        'max': float(timings.max()),
+    }
+
+
+def _write_results(futures, out, timings):
+    errors = 0
+    for future in futures:
+        result = future.result()
+        timings.append(result['seconds'])
+        errors += 'error' in result
+        out.write(json.dumps(result) + '\n')
+    out.flush()
+    return errors
+
+
+def format_batch_stats(stats):
+    return (
+        f"{stats['problems']} problems ({stats['errors']} errors) in {stats['seconds']:.2f} s "
+        f"on {stats['workers']} workers: {stats['throughput']:.1f} problems/s; "
+        f"per problem mean {stats['mean'] * 1e3:.1f} ms, p50 {stats['p50'] * 1e3:.1f} ms, "
+        f"p95 {stats['p95'] * 1e3:.1f} ms, max {stats['max'] * 1e3:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Восстановление ядра свёртки по A и C')
+    parser.add_argument('input', nargs='?', default='-', help='текстовый файл или .npy; по умолчанию stdin')
+    parser.add_argument('--to-npy', metavar='PATH', help='не решать, а сохранить задачу в бинарном формате')
+    parser.add_argument('--batch', action='store_true', help='input - папка или архив с задачами')
+    parser.add_argument('--workers', type=int, help='число процессов в пакетном режиме (по умолчанию - все ядра)')
+    parser.add_argument('--out', help='файл результатов пакетного режима (JSON Lines); по умолчанию stdout')
+    args = parser.parse_args()
+    if args.batch:
+        out = open(args.out, 'w') if args.out else sys.stdout
+        try:
+            stats = run_batch(args.input, out, args.workers)
+        finally:
+            if args.out:
+                out.close()
+        print(format_batch_stats(stats), file=sys.stderr)
+    elif args.to_npy:
+        save_npy(args.to_npy, *read_problem(args.input))
+    else:
+        solve(args.input)
 
-def solve():
-    import sys
-    input = sys.stdin.read().split('\n')
-    ptr = 0
-    
-    # Чтение размеров m, n
-    while ptr < len(input) and input[ptr].strip() == '':
-        ptr += 1
-    m, n = map(int, input[ptr].strip().split())
-    ptr += 1
-    
-    # Чтение матрицы A
-    A = []
-    for _ in range(m):
-        while ptr < len(input) and input[ptr].strip() == '':
-            ptr += 1
-        row = list(map(int, input[ptr].strip().split(',')))
-        A.append(row)
-        ptr += 1
-    A = np.array(A, dtype=np.int32)
-    
-    # Чтение размеров h, w
-    while ptr < len(input) and input[ptr].strip() == '':
-        ptr += 1
-    h, w = map(int, input[ptr].strip().split())
-    ptr += 1
-    
-    # Чтение матрицы C
-    C = []
-    for _ in range(m):
-        while ptr < len(input) and input[ptr].strip() == '':
-            ptr += 1
-        row = list(map(int, input[ptr].strip().split(',')))
-        C.append(row)
-        ptr += 1
-    C = np.array(C, dtype=np.int32)
-    
-    # Определение паддинга
-    pad_h = (h - 1) // 2
-    pad_w = (w - 1) // 2
-    
-    # Создание системы уравнений для нахождения B
-    equations = []
-    rhs = []
-    
-    for i in range(m):
-        for j in range(n):
-            # Для каждого пикселя C[i,j] формируем уравнение
-            equation = np.zeros((h, w), dtype=np.int32)
-            for k in range(h):
-                for r in range(w):
-                    a_i = i - k + pad_h
-                    a_j = j - r + pad_w
-                    if 0 <= a_i < m and 0 <= a_j < n:
-                        equation[k, r] = A[a_i, a_j]
-            equations.append(equation.flatten())
-            rhs.append(C[i, j])
-    
-    # Преобразуем уравнения в матрицу коэффициентов
-    A_matrix = np.array(equations, dtype=np.int32)
-    b_vector = np.array(rhs, dtype=np.int32)
-    
-    # Решаем систему линейных уравнений
-    B_flat, residuals, rank, singular_values = np.linalg.lstsq(A_matrix, b_vector, rcond=None)
-    
-    # Преобразуем решение обратно в матрицу h x w
-    B = np.round(B_flat).reshape((h, w)).astype(np.int32)
-    
-    # Выводим результат
-    for i in range(h):
-        row = ','.join(map(str, B[i].tolist()))
-        print(row)
 
 if __name__ == '__main__':
-    solve()
\ No newline at end of file
+    main()
@@ -57,6 +57,64 @@ def test10():
     assert np.allclose(compute_integral(0, np.pi/2, f2, 0.001, method="trapezoidal"), 2/3, rtol=0.01)
     assert np.allclose(compute_integral(0, np.pi/2, f2, 0.001, method="simpson"), 2/3, rtol=0.001)
 
+def test11():
+    f1 = lambda x: (x**2 + 3) / (x - 2)
+    f2 = lambda x: np.cos(x)**3
+    for method in ('gauss_kronrod', 'adaptive_simpson'):
+        assert np.abs(integrate(f1, 3, 4, method=method, tol=1e-10) - 10.352030263919616) < 1e-9
+        assert np.abs(integrate(f2, 0, np.pi/2, method=method, tol=1e-10) - 2/3) < 1e-9
+        assert np.abs(integrate(np.sin, 0, 2*np.pi, method=method)) < 1e-9
+        assert np.abs(integrate(np.exp, 1, 0, method=method) - (1 - np.e)) < 1e-9
+
+def test12():
+    a = np.array([0.0, 1.0, -2.0])
+    b = np.array([1.0, 3.0, 2.0])
+    assert np.allclose(integrate(np.exp, a, b), np.exp(b) - np.exp(a), rtol=1e-12)
+    values = integrate([np.sin, np.cos, lambda x: 1], 0, np.array([1.0, 2.0]), method='adaptive_simpson')
+    assert values.shape == (3, 2)
+    assert np.allclose(values, [[1 - np.cos(1), 1 - np.cos(2)], [np.sin(1), np.sin(2)], [1, 2]], rtol=1e-9)
 
+def test13():
+    f = lambda x: np.cos(x)**3
+    for method in ("rectangular", "trapezoidal", "simpson"):
+        assert np.isclose(compute_integral(0, np.pi/2, f, 0.001, method, chunk=7),
+                          compute_integral(0, np.pi/2, f, 0.001, method), rtol=1e-13)
+    # Число отрезков нечётное: Симпсон берёт на один отрезок больше с меньшим шагом
+    assert np.abs(compute_integral(0, 1, lambda x: x**3, 0.3, method="simpson") - 0.25) < 1e-15
 
+def test14():
+    for n in (1, 2, 5):
+        assert np.array_equal(sum_index_view(n), matrix_with_sum_index(n))
+        assert np.array_equal(chess_board_view(n), chess_board(n))
+        assert np.array_equal(cyclic123_view(n).ravel(), cyclic123_array(n))
+        assert np.array_equal(border_view(n), zeros_array_with_border(n))
+    view = sum_index_view(1000)
+    assert not view.flags.writeable
+    assert sum_index_view(1000) is view
+    # Представление не хранит n x n элементов
+    low, high = np.lib.array_utils.byte_bounds(view)
+    assert high - low < 2 * 1000 * view.itemsize
+    # Рамку приходится хранить целиком, но не больше VIEW_CACHE_BYTES
+    border = border_view(1000)
+    assert not border.flags.writeable and border_view(1000) is border
+    for n in range(1001, 1010):
+        border_view(n)
+    import numpy_tasks
+    assert numpy_tasks._view_arrays.nbytes <= VIEW_CACHE_BYTES
 
+def test15():
+    cache = enable_array_cache(max_bytes=3 * 100 * 100 * 8)
+    try:
+        board = chess_board(100)
+        assert chess_board(100) is board
+        assert not board.flags.writeable
+        assert np.array_equal(board, chess_board_view(100))
+        zeros_array_with_border(100)
+        matrix_with_sum_index(100)
+        cyclic123_array(100)
+        # Лимит по байтам: самый давно использованный массив вытеснен
+        assert cache.nbytes <= cache.max_bytes
+        assert chess_board(100) is not board
+    finally:
+        disable_array_cache()
+    assert chess_board(3).flags.writeable
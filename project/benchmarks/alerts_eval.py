@@ -0,0 +1,83 @@
+"""Скорость проверки алертов на тик: bisect по отсортированным порогам против перебора.
+
+Пример: python -m benchmarks.alerts_eval --alerts 100000 --ticks 50
+"""
+import argparse
+import random
+import time
+
+from bot.alerts import ABOVE, BELOW, CHANGE, PRICE, AlertEngine, metric_values
+from bot.poller import universe
+
+
+def naive_evaluate(alerts: dict, last: dict, quotes: dict) -> set:
+    """Перебор всех алертов с той же семантикой пересечения порога"""
+    values = {ticker: metric_values(closes) for ticker, closes in quotes.items()}
+    triggered = set()
+    for alert in alerts.values():
+        new = values[alert.ticker][alert.metric]
+        old = last.get((alert.ticker, alert.metric))
+        if alert.direction == ABOVE:
+            crossed = new >= alert.threshold and (old is None or old < alert.threshold)
+        else:
+            crossed = new <= alert.threshold and (old is None or old > alert.threshold)
+        if crossed:
+            triggered.add(alert.id)
+    for alert_id in triggered:
+        del alerts[alert_id]
+    for ticker, ticker_values in values.items():
+        for metric, value in ticker_values.items():
+            last[(ticker, metric)] = value
+    return triggered
+
+
+def run(count: int, ticks: int, seed: int) -> None:
+    rng = random.Random(seed)
+    tickers = universe()
+    prices = {ticker: rng.uniform(20, 500) for ticker in tickers}
+    opens = dict(prices)
+
+    engine = AlertEngine()
+    for i in range(count):
+        ticker = rng.choice(tickers)
+        if rng.random() < 0.5:
+            metric, threshold = PRICE, prices[ticker] * rng.uniform(0.8, 1.2)
+        else:
+            metric, threshold = CHANGE, rng.uniform(-10, 10)
+        direction = ABOVE if threshold > (prices[ticker] if metric == PRICE else 0) else BELOW
+        engine.add(user_id=i % 20_000, ticker=ticker, metric=metric, direction=direction, threshold=threshold)
+    naive_alerts = dict(engine.alerts)
+    naive_last = {}
+    engine.evaluate({ticker: [opens[ticker], prices[ticker]] for ticker in tickers})
+    naive_evaluate(naive_alerts, naive_last, {ticker: [opens[ticker], prices[ticker]] for ticker in tickers})
+
+    fast_time = naive_time = 0.0
+    fired = 0
+    for _ in range(ticks):
+        for ticker in tickers:
+            prices[ticker] *= 1 + rng.gauss(0, 0.01)
+        quotes = {ticker: [opens[ticker], prices[ticker]] for ticker in tickers}
+
+        started = time.perf_counter()
+        triggered = engine.evaluate(quotes)
+        fast_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        expected = naive_evaluate(naive_alerts, naive_last, quotes)
+        naive_time += time.perf_counter() - started
+
+        assert {alert.id for alert in triggered} == expected
+        fired += len(triggered)
+
+    print(f"{count} алертов, {ticks} тиков, сработало {fired}, осталось {len(engine)}")
+    print(f"bisect: {fast_time / ticks * 1000:.3f} мс на тик")
+    print(f"перебор: {naive_time / ticks * 1000:.3f} мс на тик (x{naive_time / fast_time:.0f} медленнее)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--alerts', type=int, default=100_000)
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args.alerts, args.ticks, args.seed)
@@ -0,0 +1,133 @@
+"""Графики: пропускная способность пула отрисовки и экономия загрузок за счёт file_id.
+
+Пример: python -m benchmarks.charts --charts 60 --requests 1000 --workers 4
+"""
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from aiogram.methods import SendPhoto
+from aiogram.types import Chat, Message, PhotoSize
+from aiogram.types.input_file import BufferedInputFile
+
+from benchmarks.harness import FakeSession, make_bot
+from bot import charts, market_data
+from bot.chart_render import CHART_PERIODS, init_worker, render_chart
+from bot.history_store import HistoryStore, set_store
+from bot.poller import universe
+from bot.providers import FakeProvider
+
+
+class PhotoSession(FakeSession):
+    """Отвечает на sendPhoto сообщением с file_id и считает загруженные байты"""
+
+    def __init__(self):
+        super().__init__()
+        self.upload_bytes = 0
+        self._file_ids = 0
+
+    async def make_request(self, bot, method, timeout=None):
+        if not isinstance(method, SendPhoto):
+            return await super().make_request(bot, method, timeout)
+        self.calls += 1
+        if isinstance(method.photo, BufferedInputFile):
+            self.upload_bytes += len(method.photo.data)
+        self._file_ids += 1
+        return Message(
+            message_id=self._file_ids,
+            date=datetime.now(),
+            chat=Chat(id=method.chat_id, type='private'),
+            photo=[PhotoSize(file_id=f'photo{self._file_ids}', file_unique_id=f'u{self._file_ids}', width=800, height=450)],
+        )
+
+
+async def measure_stall(work) -> tuple:
+    """Время работы и наибольшая задержка тика event loop, пока идёт work"""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stalls.append(time.perf_counter() - started - 0.005)
+
+    probe = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe
+    return elapsed, max(stalls, default=0.0)
+
+
+async def run(count: int, requests: int, workers: int) -> None:
+    market_data.set_provider(FakeProvider())
+    tickers = universe()
+    with tempfile.TemporaryDirectory() as root:
+        store = HistoryStore(root)
+        set_store(store)
+        await store.warm_up(tickers)
+        jobs = [(tickers[i % len(tickers)], list(CHART_PERIODS)[i % len(CHART_PERIODS)]) for i in range(count)]
+        windows = {job: store.window(job[0], start=store.last_timestamp(job[0]) - CHART_PERIODS[job[1]] * 86400)
+                   for job in set(jobs)}
+
+        init_worker()
+
+        async def in_loop():
+            for ticker, period in jobs:
+                window = windows[(ticker, period)]
+                render_chart(ticker, period, window['timestamp'], window['close'], 'USD')
+                await asyncio.sleep(0)
+
+        elapsed, stall = await measure_stall(in_loop)
+        print(f"В event loop: {count / elapsed:.1f} графиков/c, задержка цикла до {stall * 1000:.0f} мс")
+
+        service = charts.ChartService(workers=workers)
+        await service.warm_up()
+
+        async def in_pool():
+            await asyncio.gather(*(
+                service._render(
+                    ticker, period, windows[(ticker, period)]['timestamp'], windows[(ticker, period)]['close'], 'USD'
+                )
+                for ticker, period in jobs
+            ))
+
+        elapsed, stall = await measure_stall(in_pool)
+        print(f"Пул из {workers} процессов: {count / elapsed:.1f} графиков/c, задержка цикла до {stall * 1000:.0f} мс")
+
+        # Популярные тикеры запрашивают чаще: распределение Ципфа по тикерам и периодам
+        charts.service = service
+        bot = make_bot()
+        bot.session = PhotoSession()
+        rng = random.Random(0)
+        keys = [(ticker, period) for ticker in tickers for period in CHART_PERIODS]
+        weights = [1 / (rank + 1) for rank in range(len(keys))]
+        started = time.perf_counter()
+        for i in range(requests):
+            ticker, period = rng.choices(keys, weights)[0]
+            await charts.send_chart(bot, 1000 + i, ticker, period)
+        elapsed = time.perf_counter() - started
+        average = bot.session.upload_bytes / max(service.uploads, 1)
+        print(
+            f"Отправка {requests} графиков за {elapsed:.2f} c: отрисовано {service.rendered - count}, "
+            f"загрузок {service.uploads}, по file_id {service.file_id_sends}, "
+            f"загружено {bot.session.upload_bytes / 1024:.0f} КБ вместо {requests * average / 1024:.0f} КБ"
+        )
+        service.shutdown()
+    market_data.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--charts', type=int, default=60)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=charts.CHART_WORKERS)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.charts, args.requests, args.workers))
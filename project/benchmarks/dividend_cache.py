@@ -0,0 +1,80 @@
+"""Бенчмарк кэша дивидендов: скорость попаданий (память, SQLite) и сколько
+обращений к сайтам остаётся при повторяющихся запросах.
+
+Пример: python -m benchmarks.dividend_cache --tickers 200 --lookups 100000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from bot.dividend_cache import DividendCache
+
+
+def fake_dividends(rng: random.Random, today: datetime) -> dict:
+    """Квартальная история и ближайшая экс-дивидендная дата, как у парсера Yahoo"""
+    if rng.random() < 0.2:
+        return {}
+    last = today - timedelta(days=rng.randrange(1, 90))
+    dividends = [
+        {'Date': (last - timedelta(days=91 * i)).strftime('%b %d, %Y'), 'Dividend': f"{rng.uniform(0.1, 2):.2f} Dividend"}
+        for i in range(12)
+    ]
+    next_dividend = {'ex_date': (last + timedelta(days=91)).strftime('%b %d, %Y')} if rng.random() < 0.7 else {}
+    return {'dividends': dividends, 'next_dividend': next_dividend, 'dividend_yield': '0.50%'}
+
+
+def run(tickers: int, lookups: int, days: int, memory_size: int) -> None:
+    rng = random.Random(0)
+    names = [f'T{i:04}' for i in range(tickers)]
+    start = time.time()
+    clock = {'now': start}
+    scrapes = 0
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = DividendCache(os.path.join(root, 'dividends.sqlite3'), memory_size=memory_size, clock=lambda: clock['now'])
+
+        # Популярные тикеры запрашивают чаще; запросы равномерно распределены по days дням
+        weights = [1 / (rank + 1) for rank in range(tickers)]
+        started = time.perf_counter()
+        for i in range(lookups):
+            clock['now'] = start + days * 86400 * i / lookups
+            ticker = rng.choices(names, weights)[0]
+            if cache.get(ticker) is None:
+                scrapes += 1
+                cache.put(ticker, fake_dividends(rng, datetime.fromtimestamp(clock['now'])))
+        elapsed = time.perf_counter() - started
+        print(
+            f"{lookups} запросов за {days} дн.: скрапингов {scrapes} вместо {lookups} "
+            f"(x{lookups / scrapes:.0f} меньше), в среднем {elapsed / lookups * 1e6:.1f} мкс на запрос"
+        )
+
+        hot = names[0]
+        cache.get(hot)
+        number = 100_000
+        started = time.perf_counter()
+        for _ in range(number):
+            cache.get(hot)
+        print(f"Попадание в память: {(time.perf_counter() - started) / number * 1e6:.2f} мкс")
+
+        stored = [ticker for ticker in names if cache.get(ticker) is not None]
+        number = 2000
+        started = time.perf_counter()
+        for i in range(number):
+            cache._memory.clear()
+            cache.get(stored[i % len(stored)])
+        print(f"Попадание в SQLite: {(time.perf_counter() - started) / number * 1e6:.1f} мкс")
+        print(f"Статистика: {cache.stats()}")
+        cache.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickers', type=int, default=200)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--memory-size', type=int, default=512)
+    args = parser.parse_args()
+    run(args.tickers, args.lookups, args.days, args.memory_size)
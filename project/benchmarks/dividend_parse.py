@@ -0,0 +1,257 @@
+"""Бенчмарк разбора страниц дивидендов: прежний BeautifulSoup(html.parser) по всей
+странице против dividend_parsers (якорь + участок + lxml + XPath).
+
+Пример: python -m benchmarks.dividend_parse [--fixtures папка_с_сохранёнными_страницами]
+
+В папке ожидаются файлы yahoo_history.html, yahoo_quote.html, yahoo_stats.html,
+investing_history.html, investing_quote.html. Без --fixtures страницы
+генерируются: реальный по объёму HTML (скрипты, меню, лишние таблицы) с нужными
+блоками в середине.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from bot import dividend_parsers
+
+PAGES = ['yahoo_history', 'yahoo_quote', 'yahoo_stats', 'investing_history', 'investing_quote']
+
+
+# Прежние парсеры на BeautifulSoup (из бывшего hw/dividend_bot.py) - эталон по скорости и по результату
+
+def soup_yahoo_history(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'data-test': 'historical-prices'})
+    if not table:
+        return None
+    dividends = []
+    for row in table.find_all('tr')[1:]:
+        cols = row.find_all('td')
+        if len(cols) == 2:
+            dividends.append({'Date': cols[0].text.strip(), 'Dividend': cols[1].text.strip()})
+    return dividends
+
+
+def soup_yahoo_next_dividend(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    dividend_info = {}
+    for item in soup.find_all('td', {'class': 'Ta(end)'}):
+        if 'Forward Dividend & Yield' in str(item.previous_sibling):
+            parts = item.text.split('(')
+            if len(parts) == 2:
+                dividend_info['amount'] = parts[0].strip()
+                dividend_info['yield'] = parts[1].replace(')', '').strip()
+            break
+    for item in soup.find_all('span', string='Ex-Dividend Date'):
+        dividend_info['ex_date'] = item.find_next('span').text.strip()
+        break
+    return dividend_info
+
+
+def soup_yahoo_dividend_yield(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    for item in soup.find_all('td'):
+        if 'Trailing Annual Dividend Yield' in str(item):
+            return item.find_next('td').text.strip()
+    return "N/A"
+
+
+def soup_investing_history(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'id': 'dividendsHistoryData'})
+    if not table:
+        return None
+    dividends = []
+    for row in table.find_all('tr')[1:]:
+        cols = row.find_all('td')
+        if len(cols) >= 5:
+            dividends.append({
+                'Date': cols[0].text.strip(),
+                'Dividend': cols[1].text.strip(),
+                'Declaration Date': cols[2].text.strip(),
+                'Record Date': cols[3].text.strip(),
+                'Payment Date': cols[4].text.strip()
+            })
+    return dividends
+
+
+def soup_investing_next_dividend(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    dividend_info = {}
+    for item in soup.find_all('div', {'class': 'dividend'}):
+        if 'Прогноз дивиденда' in item.text:
+            dividend_info['amount'] = item.find('span').text.strip()
+            break
+    for item in soup.find_all('div', {'class': 'next-dividend-info'}):
+        if 'Дата закрытия реестра' in item.text:
+            dividend_info['record_date'] = item.find('span').text.strip()
+            break
+    return dividend_info
+
+
+PARSERS = {
+    'soup': dict(zip(PAGES, [soup_yahoo_history, soup_yahoo_next_dividend, soup_yahoo_dividend_yield,
+                             soup_investing_history, soup_investing_next_dividend])),
+    'lxml': dict(zip(PAGES, [dividend_parsers.parse_yahoo_history, dividend_parsers.parse_yahoo_next_dividend,
+                             dividend_parsers.parse_yahoo_dividend_yield, dividend_parsers.parse_investing_history,
+                             dividend_parsers.parse_investing_next_dividend])),
+}
+
+
+def noise(rng: random.Random, blocks: int) -> str:
+    """Типичная обвязка страницы: меню, карточки новостей, встроенные скрипты, чужие таблицы"""
+    parts = []
+    for i in range(blocks):
+        kind = i % 4
+        if kind == 0:
+            links = ''.join(f'<li class="nav-item"><a href="/n/{rng.randrange(10**6)}">Раздел {j}</a></li>' for j in range(12))
+            parts.append(f'<nav class="menu"><ul>{links}</ul></nav>')
+        elif kind == 1:
+            parts.append(
+                f'<div class="news-card"><span class="time">{rng.randrange(60)}m ago</span>'
+                f'<h3><a href="/news/{rng.randrange(10**6)}">Markets move as investors weigh rates</a></h3>'
+                f'<p>{"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4}</p></div>'
+            )
+        elif kind == 2:
+            parts.append(f'<script>window.__data_{i} = {{"id": {rng.randrange(10**9)}, "v": "{"x" * 300}"}};</script>')
+        else:
+            cells = ''.join(f'<tr><td class="Ta(start)">Metric {j}</td><td class="Ta(end)">{rng.random():.2f}</td></tr>' for j in range(8))
+            parts.append(f'<table class="W(100%)"><tbody>{cells}</tbody></table>')
+    return ''.join(parts)
+
+
+def page(rng: random.Random, body: str, blocks: int) -> str:
+    return (
+        '<!DOCTYPE html><html><head><title>Quote</title>'
+        f'<style>{".c{color:red}" * 500}</style></head><body>'
+        f'{noise(rng, blocks)}{body}{noise(rng, blocks)}</body></html>'
+    )
+
+
+def generate_pages(blocks: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    history_rows = ''.join(
+        f'<tr><td>Jan {d % 28 + 1}, {2024 - d // 4}</td><td><strong>0.{d % 90 + 10}</strong> Dividend</td></tr>'
+        for d in range(80)
+    )
+    investing_rows = ''.join(
+        f'<tr><td>{d % 28 + 1:02}.07.{2024 - d}</td><td>{d + 10},50</td><td>01.05.{2024 - d}</td>'
+        f'<td>{d % 28 + 1:02}.07.{2024 - d}</td><td>01.08.{2024 - d}</td></tr>'
+        for d in range(20)
+    )
+    return {
+        'yahoo_history': page(rng, (
+            '<table data-test="historical-prices" class="W(100%)"><thead><tr><th>Date</th><th>Dividends</th></tr></thead>'
+            f'<tbody>{history_rows}</tbody></table>'
+        ), blocks),
+        'yahoo_quote': page(rng, (
+            '<table class="W(100%)"><tbody>'
+            '<tr><td class="C($primaryColor)">Market Cap</td><td class="Ta(end)">3.1T</td></tr>'
+            '<tr><td class="C($primaryColor)">Forward Dividend &amp; Yield</td><td class="Ta(end)">1.00 (0.52%)</td></tr>'
+            '</tbody></table>'
+            '<ul><li><span class="label">Ex-Dividend Date</span><span class="value">Aug 12, 2024</span></li></ul>'
+        ), blocks),
+        'yahoo_stats': page(rng, (
+            '<table class="W(100%)"><tbody>'
+            '<tr><td><span>Trailing Annual Dividend Rate</span></td><td>0.98</td></tr>'
+            '<tr><td><span>Trailing Annual Dividend Yield</span> <sup>3</sup></td><td>0.51%</td></tr>'
+            '</tbody></table>'
+        ), blocks),
+        'investing_history': page(rng, (
+            '<table id="dividendsHistoryData" class="genTbl"><thead><tr><th>Дата</th><th>Дивиденд</th>'
+            f'<th>Объявлен</th><th>Реестр</th><th>Выплата</th></tr></thead><tbody>{investing_rows}</tbody></table>'
+        ), blocks),
+        'investing_quote': page(rng, (
+            '<div class="dividend"><p>Прогноз дивиденда</p><span>33,30 ₽</span></div>'
+            '<div class="next-dividend-info"><p>Дата закрытия реестра</p><span>11.07.2025</span></div>'
+        ), blocks),
+    }
+
+
+def load_pages(fixtures) -> dict:
+    if fixtures is None:
+        return generate_pages(blocks=1500)
+    return {name: (Path(fixtures) / f'{name}.html').read_text(encoding='utf-8') for name in PAGES}
+
+
+def best_time(func, html: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(html)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def python_peak(func, html: str) -> int:
+    gc.collect()
+    tracemalloc.start()
+    func(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def _status_kb(field: str) -> int:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def rss_growth(func, html: str):
+    """Рост пикового RSS (КБ) при разборе страницы, включая память libxml2.
+
+    Только Linux: пик сбрасывается записью 5 в /proc/self/clear_refs; иначе None.
+    """
+    gc.collect()
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        before = _status_kb('VmRSS')
+    except OSError:
+        return None
+    func(html)
+    return _status_kb('VmHWM') - before
+
+
+def run(fixtures, repeat: int) -> None:
+    pages = load_pages(fixtures)
+    total = {'soup': 0.0, 'lxml': 0.0}
+    for name in PAGES:
+        html = pages[name]
+        expected = PARSERS['soup'][name](html)
+        actual = PARSERS['lxml'][name](html)
+        if isinstance(expected, dict):
+            # Прежний парсер искал подпись в str(tag), где & уже экранирован как &amp;,
+            # поэтому "Forward Dividend & Yield" не находил никогда; новый находит
+            assert expected.items() <= actual.items(), (name, actual, expected)
+        else:
+            assert actual == expected, (name, actual, expected)
+
+        times = {kind: best_time(PARSERS[kind][name], html, repeat) for kind in PARSERS}
+        peaks = {kind: python_peak(PARSERS[kind][name], html) for kind in PARSERS}
+        rss = {kind: rss_growth(PARSERS[kind][name], html) for kind in PARSERS}
+        for kind in PARSERS:
+            total[kind] += times[kind]
+        print(
+            f"{name:>18} ({len(html) / 1024:5.0f} КБ): soup {times['soup'] * 1e3:7.1f} мс, "
+            f"lxml {times['lxml'] * 1e3:6.2f} мс, x{times['soup'] / times['lxml']:.0f}; "
+            f"пик Python-памяти {peaks['soup'] / 2**20:5.1f} МБ -> {peaks['lxml'] / 2**20:5.2f} МБ"
+            + ("" if None in rss.values() else f", RSS +{rss['soup'] / 1024:.1f} МБ -> +{rss['lxml'] / 1024:.1f} МБ")
+        )
+    print(f"{'все страницы':>18}: x{total['soup'] / total['lxml']:.0f} быстрее")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fixtures', help='папка с сохранёнными страницами')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.fixtures, args.repeat)
@@ -0,0 +1,95 @@
+"""Скринер дивидендов: параллельная загрузка против последовательной и повтор из кэша.
+
+Источник дивидендов - FakeProvider с задержкой каждого вызова, как у медленного
+сайта; постоянный кэш - SQLite в памяти.
+Пример: python -m benchmarks.dividend_screener --tickers 100 --latency 0.3 --concurrency 16
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message
+
+from aiogram import Bot
+
+from benchmarks.harness import FAKE_TOKEN, FakeSession
+from bot import dividend_sources, market_data, screener
+from bot.dividend_cache import DividendCache
+from bot.providers import FakeProvider
+
+CHAT_ID = 1
+
+
+class MessageSession(FakeSession):
+    """Отвечает на sendMessage сообщением, чтобы его можно было редактировать"""
+
+    async def make_request(self, bot, method, timeout=None):
+        result = await super().make_request(bot, method, timeout)
+        if isinstance(method, SendMessage):
+            return Message(
+                message_id=self.calls,
+                date=datetime.now(),
+                chat=Chat(id=method.chat_id, type='private'),
+                text=method.text,
+            )
+        return result
+
+
+async def timed_screen(tickers: list, concurrency: int) -> tuple:
+    """Время до первого результата и до последнего"""
+    started = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in screener.screen(tickers, concurrency):
+        count += 1
+        if first is None:
+            first = time.perf_counter() - started
+    return first, time.perf_counter() - started, count
+
+
+async def run(tickers: int, latency: float, concurrency: int) -> None:
+    provider = FakeProvider(latency=latency)
+    market_data.set_provider(provider)
+    dividend_sources.set_source('provider')
+    dividend_sources.set_cache(DividendCache(':memory:'))
+    symbols = [f'T{i:03}' for i in range(tickers)]
+
+    for label, limit in (('последовательно', 1), (f'параллельно по {concurrency}', concurrency)):
+        dividend_sources.get_cache().invalidate()
+        market_data.quote_cache.invalidate()
+        calls = provider.calls
+        first, total, count = await timed_screen(symbols, limit)
+        print(
+            f"{label:>22}: первый результат через {first:.2f} с, все {count} за {total:.2f} с, "
+            f"вызовов провайдера {provider.calls - calls}"
+        )
+
+    calls = provider.calls
+    first, total, count = await timed_screen(symbols, concurrency)
+    print(f"{'повтор из кэша':>22}: все {count} за {total * 1000:.1f} мс, вызовов провайдера {provider.calls - calls}")
+
+    # Полный путь команды: одно сообщение, которое редактируется по мере готовности
+    dividend_sources.get_cache().invalidate()
+    market_data.quote_cache.invalidate()
+    bot = Bot(token=FAKE_TOKEN, session=MessageSession())
+    message = Message(message_id=0, date=datetime.now(), chat=Chat(id=CHAT_ID, type='private'), text='/screener')
+    started = time.perf_counter()
+    results = await screener.run_screen(bot, message.as_(bot), 'yield', symbols)
+    print(
+        f"{'/screener':>22}: {len(results)} тикеров за {time.perf_counter() - started:.2f} с, "
+        f"запросов к Bot API {bot.session.calls} (сообщение + правки)"
+    )
+    market_data.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickers', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--concurrency', type=int, default=screener.SCREEN_CONCURRENCY)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.tickers, args.latency, args.concurrency))
@@ -0,0 +1,75 @@
+"""Проверка и замер FSM-хранилищ: сценарий сравнения двух акций на двух "воркерах".
+
+Первый воркер выставляет состояние и данные, второй читает их через то же
+хранилище - так ведут себя процессы бота за вебхуком; TTL здесь длинный.
+Затем на нескольких диалогах с TTL в секунду проверяется, что брошенные
+диалоги истекают.
+
+Пример: python -m benchmarks.fsm_storage --backend fakeredis --users 5000
+"""
+import argparse
+import asyncio
+import time
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+
+from benchmarks.harness import FAKE_TOKEN
+from bot.states import StockStates
+from bot.storage import make_storage
+
+BOT_ID = int(FAKE_TOKEN.split(':')[0])
+
+
+THROUGHPUT_TTL = 3600
+EXPIRY_TTL = 1
+EXPIRY_USERS = 20
+
+
+def storage_keys(users: int) -> list:
+    return [StorageKey(bot_id=BOT_ID, chat_id=user_id, user_id=user_id) for user_id in range(1, users + 1)]
+
+
+async def check_expiry(backend: str, redis_url: str) -> None:
+    """Короткий TTL на нескольких диалогах: через TTL не должно остаться ни состояния, ни данных"""
+    storage = make_storage(backend, redis_url=redis_url, state_ttl=EXPIRY_TTL, data_ttl=EXPIRY_TTL)
+    keys = storage_keys(EXPIRY_USERS)
+    for key in keys:
+        context = FSMContext(storage=storage, key=key)
+        await context.update_data(first_ticker='AAPL')
+        await context.set_state(StockStates.waiting_for_second_ticker)
+    await asyncio.sleep(EXPIRY_TTL + 0.1)
+    leftover = sum([await storage.get_state(key) is not None or bool(await storage.get_data(key)) for key in keys])
+    await storage.close()
+    assert leftover == 0, f"{leftover} of {len(keys)} dialogs outlived TTL"
+    print(f"{backend}: после истечения TTL осталось диалогов: {leftover}")
+
+
+async def run(backend: str, users: int, redis_url: str) -> None:
+    # TTL с запасом: запись тысяч диалогов не должна успеть истечь до проверки
+    storage = make_storage(backend, redis_url=redis_url, state_ttl=THROUGHPUT_TTL, data_ttl=THROUGHPUT_TTL)
+    keys = storage_keys(users)
+
+    started = time.perf_counter()
+    for key in keys:
+        worker_a = FSMContext(storage=storage, key=key)
+        await worker_a.update_data(first_ticker='AAPL')
+        await worker_a.set_state(StockStates.waiting_for_second_ticker)
+    for key in keys:
+        worker_b = FSMContext(storage=storage, key=key)
+        assert await worker_b.get_state() == StockStates.waiting_for_second_ticker.state
+        assert (await worker_b.get_data())['first_ticker'] == 'AAPL'
+    elapsed = time.perf_counter() - started
+    print(f"{backend}: {users} диалогов, {users * 4 / elapsed:.0f} операций/c")
+    await storage.close()
+
+    await check_expiry(backend, redis_url)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backend', choices=['memory', 'redis', 'fakeredis'], default='memory')
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    args = parser.parse_args()
+    asyncio.run(run(args.backend, args.users, args.redis_url))
@@ -0,0 +1,93 @@
+"""Общие помощники для бенчмарков: фейковая сессия Bot API и синтетические апдейты.
+
+Запуск бенчмарков из папки project: python -m benchmarks.<имя>
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import GetMe, GetUpdates
+from aiogram.types import Chat, Message, Update, User
+
+FAKE_TOKEN = '42:BENCHMARK'
+
+
+class FakeSession(BaseSession):
+    """Сессия, которая не ходит в сеть, а только считает вызовы Bot API.
+
+    getUpdates отдаёт апдейты из очереди updates пачками по limit штук,
+    имитируя сетевую задержку long polling (poll_latency).
+    """
+
+    def __init__(self, latency: float = 0.0, poll_latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.poll_latency = poll_latency
+        self.calls = 0
+        self.sent = []
+        self.updates = asyncio.Queue()
+
+    async def make_request(self, bot, method, timeout=None):
+        if isinstance(method, GetMe):
+            return User(id=bot.id, is_bot=True, first_name='bench')
+        if isinstance(method, GetUpdates):
+            return await self._get_updates(method)
+        self.calls += 1
+        self.sent.append((time.perf_counter(), method))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return True
+
+    async def _get_updates(self, method):
+        if self.poll_latency:
+            await asyncio.sleep(self.poll_latency)
+        if self.updates.empty():
+            await asyncio.sleep(0.01)
+        batch = []
+        while not self.updates.empty() and len(batch) < (method.limit or 100):
+            batch.append(self.updates.get_nowait())
+        return batch
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b''
+
+    async def close(self):
+        pass
+
+
+def make_bot(latency: float = 0.0, poll_latency: float = 0.0) -> Bot:
+    return Bot(token=FAKE_TOKEN, session=FakeSession(latency, poll_latency))
+
+
+def make_message_update(update_id: int, user_id: int, text: str) -> Update:
+    user = User(id=user_id, is_bot=False, first_name=f'user{user_id}')
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=update_id,
+            date=datetime.now(),
+            chat=Chat(id=user_id, type='private'),
+            from_user=user,
+            text=text,
+        ),
+    )
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, latencies, elapsed: float) -> None:
+    print(
+        f"{name}: {len(latencies)} апдейтов за {elapsed:.2f} c "
+        f"({len(latencies) / elapsed:.0f}/c), "
+        f"p50={percentile(latencies, 50) * 1000:.1f} мс, "
+        f"p99={percentile(latencies, 99) * 1000:.1f} мс"
+    )
+
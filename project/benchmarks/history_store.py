@@ -0,0 +1,67 @@
+"""Хранилище истории: холодный прогрев, инкрементальное обновление и чтение срезов
+против загрузки истории из источника на каждый запрос.
+
+Пример: python -m benchmarks.history_store --latency 0.3 --reads 2000
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from bot import market_data
+from bot.history_store import HistoryStore
+from bot.poller import universe
+from bot.providers import FakeProvider
+
+
+async def run(latency: float, reads: int) -> None:
+    provider = FakeProvider(latency=latency)
+    market_data.set_provider(provider)
+    tickers = universe()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = HistoryStore(root)
+        started = time.perf_counter()
+        await store.warm_up(tickers)
+        cold = time.perf_counter() - started
+        stats = store.stats()
+        print(f"Холодный прогрев: {len(tickers)} тикеров, {stats['history_bars']} баров за {cold:.2f} c")
+
+        started = time.perf_counter()
+        added = await store.warm_up(tickers)
+        incremental = time.perf_counter() - started
+        print(f"Инкрементальное обновление: {sum(added.values())} новых баров за {incremental:.2f} c")
+
+        year_ago = int((datetime.now(timezone.utc) - timedelta(days=365)).timestamp())
+        started = time.perf_counter()
+        for i in range(reads):
+            closes = store.window(tickers[i % len(tickers)], start=year_ago)['close']
+            closes.mean()
+        local = (time.perf_counter() - started) / reads
+        print(f"Срез за год из хранилища: {local * 1e6:.1f} мкс на чтение")
+
+        sample = min(reads, len(tickers))
+        started = time.perf_counter()
+        for ticker in tickers[:sample]:
+            history = await market_data.get_history(ticker, '1y')
+            sum(history['close']) / len(history['close'])
+        remote = (time.perf_counter() - started) / sample
+        print(f"Загрузка за год из источника: {remote * 1e3:.1f} мс на чтение, x{remote / local:.0f}")
+
+        assert list(store.window(tickers[0], start=year_ago)['close']) == history_closes(tickers[0], year_ago)
+    market_data.shutdown()
+
+
+def history_closes(ticker: str, start: int) -> list:
+    return FakeProvider().get_history(ticker, start=start)['close']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.3, help='задержка фейкового источника, c')
+    parser.add_argument('--reads', type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.latency, args.reads))
@@ -0,0 +1,101 @@
+"""Ядра индикаторов: векторизованный NumPy против циклов Python на той же вселенной.
+
+Пример: python -m benchmarks.indicators --tickers 10 --years 5
+"""
+import argparse
+import math
+import timeit
+
+import numpy as np
+
+from bot import indicators
+
+
+def loop_sma(row, window):
+    return [sum(row[i - window + 1:i + 1]) / window if i >= window - 1 else math.nan for i in range(len(row))]
+
+
+def loop_ewm(row, alpha):
+    out = [row[0]]
+    for value in row[1:]:
+        out.append((1 - alpha) * out[-1] + alpha * value)
+    return out
+
+
+def loop_rsi(row, period):
+    deltas = [b - a for a, b in zip(row, row[1:])]
+    gains = loop_ewm([max(d, 0.0) for d in deltas], 1 / period)
+    losses = loop_ewm([max(-d, 0.0) for d in deltas], 1 / period)
+    values = [100 - 100 / (1 + g / l) if l else (50.0 if not g else 100.0) for g, l in zip(gains, losses)]
+    return [math.nan] + values
+
+
+def loop_volatility(row, window):
+    returns = [math.log(b / a) for a, b in zip(row, row[1:])][-window:]
+    mean = sum(returns) / len(returns)
+    return math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1) * indicators.TRADING_DAYS)
+
+
+def loop_max_drawdown(row):
+    peak, worst = row[0], 0.0
+    for value in row:
+        peak = max(peak, value)
+        worst = min(worst, value / peak - 1)
+    return worst
+
+
+def loop_correlation(rows):
+    returns = [[math.log(b / a) for a, b in zip(row, row[1:])] for row in rows]
+    means = [sum(r) / len(r) for r in returns]
+    centered = [[x - m for x in r] for r, m in zip(returns, means)]
+    norms = [math.sqrt(sum(x * x for x in c)) for c in centered]
+    return [
+        [sum(x * y for x, y in zip(a, b)) / (na * nb) for b, nb in zip(centered, norms)]
+        for a, na in zip(centered, norms)
+    ]
+
+
+def cases(prices, rows):
+    return {
+        'SMA(50)': (lambda: indicators.sma(prices, 50), lambda: [loop_sma(r, 50) for r in rows]),
+        'EMA(20)': (lambda: indicators.ema(prices, 20), lambda: [loop_ewm(r, 2 / 21) for r in rows]),
+        'RSI(14)': (lambda: indicators.rsi(prices, 14), lambda: [loop_rsi(r, 14) for r in rows]),
+        'волатильность': (
+            lambda: indicators.volatility(prices, indicators.TRADING_DAYS),
+            lambda: [loop_volatility(r, indicators.TRADING_DAYS) for r in rows],
+        ),
+        'макс. просадка': (lambda: indicators.max_drawdown(prices), lambda: [loop_max_drawdown(r) for r in rows]),
+        'корреляция': (lambda: indicators.correlation(prices), lambda: loop_correlation(rows)),
+        'всё сразу': (
+            lambda: (indicators.summary(prices), indicators.correlation(prices)),
+            None,
+        ),
+    }
+
+
+def run(tickers: int, years: int, number: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    bars = years * indicators.TRADING_DAYS
+    prices = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (tickers, bars)), axis=1))
+    rows = prices.tolist()
+    print(f"Вселенная: {tickers} тикеров x {bars} баров")
+
+    for name, (vectorized, looped) in cases(prices, rows).items():
+        fast = min(timeit.repeat(vectorized, number=number, repeat=3)) / number
+        line = f"{name:>15}: NumPy {fast * 1e3:7.3f} мс"
+        if looped is not None:
+            expected = np.array(looped(), dtype=float)
+            assert np.allclose(vectorized(), expected, rtol=1e-9, atol=1e-9, equal_nan=True), name
+            slow = min(timeit.repeat(looped, number=1, repeat=3))
+            line += f", циклы {slow * 1e3:9.1f} мс, x{slow / fast:.0f}"
+        print(line)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickers', type=int, default=10)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--number', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args.tickers, args.years, args.number, args.seed)
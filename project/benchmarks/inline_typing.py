@@ -0,0 +1,83 @@
+"""Inline-режим под "быстрым набором": каждый пользователь печатает тикер по букве.
+
+Отвечать нужно только на последний запрос пользователя и укладываться в бюджет
+по p99 от прихода этого запроса до answerInlineQuery.
+
+Пример: python -m benchmarks.inline_typing --users 300 --latency 0.2
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import random
+import time
+from datetime import datetime
+
+from aiogram import Dispatcher
+from aiogram.methods import AnswerInlineQuery
+from aiogram.types import InlineQuery, Update, User
+
+from benchmarks.harness import make_bot, percentile
+from bot import inline, market_data
+from bot.inline import INLINE_BUDGET, router
+from bot.providers import FakeProvider
+
+WORDS = ['AAPL', 'appl', 'Тесла', 'nvidia', 'micros', 'GOOGL', 'amazn', 'Сбер', 'Газпром', 'meta']
+
+
+def inline_update(update_id: int, user_id: int, query: str) -> Update:
+    return Update(
+        update_id=update_id,
+        inline_query=InlineQuery(
+            id=str(update_id),
+            from_user=User(id=user_id, is_bot=False, first_name=f'user{user_id}'),
+            query=query,
+            offset='',
+        ),
+    )
+
+
+async def type_word(dp, bot, user_id: int, word: str, arrivals: dict, keystroke: float) -> None:
+    for length in range(1, len(word) + 1):
+        update = inline_update(user_id * 100 + length, user_id, word[:length])
+        arrivals[update.inline_query.id] = time.perf_counter()
+        asyncio.ensure_future(dp.feed_update(bot, update))
+        await asyncio.sleep(keystroke * random.uniform(0.5, 1.5))
+
+
+async def run(users: int, latency: float, keystroke: float) -> None:
+    market_data.set_provider(FakeProvider(latency=latency))
+    bot = make_bot()
+    dp = Dispatcher()
+    dp.include_router(router)
+    # Как в main.py: объекты после старта не участвуют в сборке мусора
+    gc.freeze()
+
+    arrivals = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        type_word(dp, bot, user_id, random.choice(WORDS), arrivals, keystroke)
+        for user_id in range(1, users + 1)
+    ))
+    await asyncio.sleep(INLINE_BUDGET * 2)
+    elapsed = time.perf_counter() - started
+
+    answers = [(sent_at, method) for sent_at, method in bot.session.sent if isinstance(method, AnswerInlineQuery)]
+    latencies = [sent_at - arrivals[method.inline_query_id] for sent_at, method in answers]
+    cards = inline.stats()
+    print(f"Запросов: {len(arrivals)}, ответов: {len(answers)} за {elapsed:.2f} c")
+    print(f"Задержка ответа: p50={percentile(latencies, 50) * 1000:.0f} мс, "
+          f"p99={percentile(latencies, 99) * 1000:.0f} мс (бюджет {INLINE_BUDGET * 1000:.0f} мс)")
+    print(f"Карточек с ценой: {cards['priced']}/{cards['cards']}; кэш: {market_data.cache_stats()}")
+    market_data.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=0.2, help='задержка FakeProvider, c')
+    parser.add_argument('--keystroke', type=float, default=0.08, help='средний интервал между нажатиями, c')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    random.seed(0)
+    asyncio.run(run(args.users, args.latency, args.keystroke))
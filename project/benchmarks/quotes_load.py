@@ -0,0 +1,66 @@
+"""Нагрузочный тест show_selected_stock_price на FakeProvider.
+
+Пример: python -m benchmarks.quotes_load --updates 500 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.base import StorageKey
+
+from benchmarks.harness import make_bot, make_message_update, report
+from bot import market_data
+from bot.handlers import router
+from bot.providers import FakeProvider
+from bot.states import StockStates
+from bot.stocks_data import TICKERS
+
+
+async def timed_feed(dp, bot, update):
+    started = time.perf_counter()
+    await dp.feed_update(bot, update)
+    return time.perf_counter() - started
+
+
+async def run(updates: int, latency: float) -> None:
+    market_data.set_provider(FakeProvider(latency=latency))
+    bot = make_bot()
+    dp = Dispatcher()
+    dp.include_router(router)
+
+    tickers = list(TICKERS)
+    quote_updates = []
+    for i in range(updates):
+        user_id = 10_000 + i
+        key = StorageKey(bot_id=bot.id, chat_id=user_id, user_id=user_id)
+        await dp.storage.set_state(key, StockStates.waiting_for_ticker_selection)
+        quote_updates.append(make_message_update(i, user_id, tickers[i % len(tickers)]))
+
+    # Апдейты других чатов, которые не ждут котировок и не должны тормозить
+    other_updates = [make_message_update(updates + i, 1 + i, '/start') for i in range(updates // 10)]
+
+    started = time.perf_counter()
+    quote_tasks = [asyncio.create_task(timed_feed(dp, bot, u)) for u in quote_updates]
+    await asyncio.sleep(0)
+    other_started = time.perf_counter()
+    other_latencies = await asyncio.gather(*(timed_feed(dp, bot, u) for u in other_updates))
+    other_elapsed = time.perf_counter() - other_started
+    quote_latencies = await asyncio.gather(*quote_tasks)
+    elapsed = time.perf_counter() - started
+
+    report('show_selected_stock_price', quote_latencies, elapsed)
+    report('/start во время загрузки котировок', other_latencies, other_elapsed)
+    print(f"Кэш котировок: {market_data.cache_stats()}")
+    await bot.session.close()
+    market_data.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--updates', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help='задержка фейкового источника, c')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.updates, args.latency))
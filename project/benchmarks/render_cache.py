@@ -0,0 +1,54 @@
+"""Микробенчмарк кэша отрисовки: сколько CPU на апдейт экономят готовые клавиатуры и тексты.
+
+Пример: python -m benchmarks.render_cache
+Без --number число вызовов подбирается так, чтобы замер занимал около MEASURE_TIME.
+"""
+import argparse
+import timeit
+
+from bot import keyboards, render_cache
+from bot.config import ADMIN_USERNAME
+from bot.stocks_data import TICKERS
+
+
+def build_tickers_text():
+    tickers_list = "\n".join(
+        [f"<b>{ticker}</b> - {data['name']} ({data['description']})" for ticker, data in TICKERS.items()]
+    )
+    return "📊 <b>Популярные тикеры:</b>\n\n" + tickers_list
+
+
+CASES = {
+    'main_kb': (keyboards.main_kb, render_cache.main_kb),
+    'tickers_kb': (lambda: keyboards.tickers_kb(TICKERS.keys()), render_cache.tickers_kb),
+    'help_kb': (lambda: keyboards.help_kb(ADMIN_USERNAME), render_cache.help_kb),
+    'список тикеров': (build_tickers_text, render_cache.tickers_list_text),
+}
+
+
+MEASURE_TIME = 0.02
+
+
+def per_call(func, number: int = None, repeat: int = 3) -> float:
+    timer = timeit.Timer(func)
+    if number is None:
+        # Как timeit.Timer.autorange, но с коротким замером: сборка клавиатуры - миллисекунды
+        number = 1
+        while timer.timeit(number) < MEASURE_TIME:
+            number *= 2
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def run(number: int = None) -> None:
+    render_cache.warm_up()
+    for name, (build, cached) in CASES.items():
+        built = per_call(build, number)
+        hit = per_call(cached, number)
+        print(f"{name:>16}: сборка {built * 1e6:8.2f} мкс, из кэша {hit * 1e6:6.3f} мкс, x{built / hit:.0f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, help='вызовов на замер (по умолчанию - подбирается)')
+    args = parser.parse_args()
+    run(args.number)
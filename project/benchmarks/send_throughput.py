@@ -0,0 +1,98 @@
+"""Доставка исходящих сообщений под лимитами Telegram: с SendScheduler и без него.
+
+FloodSession имитирует flood control Bot API (глобальный и поканальный лимиты)
+и отвечает 429 с retry_after, если их превысить. Без планировщика каждое
+сообщение отправляется сразу и повторяется после retry_after.
+
+Пример: python -m benchmarks.send_throughput --chats 200 --alerts 300
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+from benchmarks.harness import FAKE_TOKEN, FakeSession, percentile
+from bot.sender import NOTIFICATION, SendScheduler, TokenBucket, priority
+
+TELEGRAM_GLOBAL_RATE = 30.0
+TELEGRAM_CHAT_RATE = 1.0
+TELEGRAM_CHAT_BURST = 3
+RETRY_AFTER = 1
+
+
+class FloodSession(FakeSession):
+    def __init__(self, rtt: float):
+        super().__init__(latency=rtt)
+        self.global_bucket = TokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_RATE)
+        self.chat_buckets = {}
+        self.flood_errors = 0
+
+    async def make_request(self, bot, method, timeout=None):
+        chat_id = getattr(method, 'chat_id', None)
+        if chat_id is not None:
+            chat = self.chat_buckets.setdefault(chat_id, TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST))
+            if self.global_bucket.delay() > 0 or chat.delay() > 0:
+                self.flood_errors += 1
+                raise TelegramRetryAfter(method=method, message='Flood control exceeded', retry_after=RETRY_AFTER)
+            self.global_bucket.take()
+            chat.take()
+        return await super().make_request(bot, method, timeout)
+
+
+async def naive_send(bot, chat_id, text):
+    while True:
+        try:
+            return await bot.send_message(chat_id=chat_id, text=text)
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    await coro
+    return time.perf_counter() - started
+
+
+async def run_scenario(use_scheduler: bool, chats: int, alerts: int, rtt: float) -> None:
+    session = FloodSession(rtt)
+    bot = Bot(token=FAKE_TOKEN, session=session)
+    scheduler = SendScheduler()
+    if use_scheduler:
+        session.middleware(scheduler)
+
+    async def alert(chat_id):
+        with priority(NOTIFICATION):
+            return await timed(naive_send(bot, chat_id, 'alert'))
+
+    started = time.perf_counter()
+    # Сначала волна алертов, затем пользователи пишут боту и ждут ответов
+    alert_tasks = [asyncio.create_task(alert(10_000 + i)) for i in range(alerts)]
+    await asyncio.sleep(0.05)
+    reply_tasks = [asyncio.create_task(timed(naive_send(bot, 1 + i % chats, 'reply'))) for i in range(chats * 2)]
+    reply_latencies = await asyncio.gather(*reply_tasks)
+    alert_latencies = await asyncio.gather(*alert_tasks)
+    elapsed = time.perf_counter() - started
+
+    delivered = session.calls
+    name = 'с планировщиком' if use_scheduler else 'без планировщика'
+    print(f"{name}: доставлено {delivered} за {elapsed:.2f} c ({delivered / elapsed:.1f}/c), ошибок 429: {session.flood_errors}")
+    print(f"    ответы: p50={percentile(reply_latencies, 50):.2f} c, p99={percentile(reply_latencies, 99):.2f} c; "
+          f"алерты: p50={percentile(alert_latencies, 50):.2f} c, p99={percentile(alert_latencies, 99):.2f} c")
+
+
+async def run(chats: int, alerts: int, rtt: float) -> None:
+    for use_scheduler in (False, True):
+        await run_scenario(use_scheduler, chats, alerts, rtt)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=100)
+    parser.add_argument('--alerts', type=int, default=300)
+    parser.add_argument('--rtt', type=float, default=0.05, help='задержка ответа Bot API, c')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    asyncio.run(run(args.chats, args.alerts, args.rtt))
@@ -0,0 +1,59 @@
+"""Скорость поиска в реестре тикеров на синтетической вселенной из 10k+ символов.
+
+Пример: python -m benchmarks.ticker_registry --symbols 12000
+"""
+import argparse
+import random
+import string
+import time
+
+from benchmarks.harness import percentile
+from bot.config import TICKERS_FILE
+from bot.stocks_data import TICKERS
+from bot.ticker_registry import TickerRegistry
+
+WORDS = ['global', 'energy', 'capital', 'systems', 'holdings', 'pharma', 'bank', 'motors', 'foods', 'digital',
+         'networks', 'resources', 'industries', 'therapeutics', 'realty', 'mining', 'airlines', 'software']
+
+
+def synthetic_registry(size: int, seed: int = 0) -> TickerRegistry:
+    rng = random.Random(seed)
+    registry = TickerRegistry.from_tickers(TICKERS, TICKERS_FILE)
+    while len(registry) < size:
+        symbol = ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(2, 5)))
+        name = ' '.join(w.capitalize() for w in rng.sample(WORDS, 2)) + f" {rng.choice(string.ascii_uppercase)}{rng.randint(1, 999)}"
+        registry.add(symbol, name)
+    return registry
+
+
+QUERIES = {
+    'точный тикер': ['AAPL', 'TSLA', 'NVDA', 'SBER.ME'],
+    'название/синоним': ['Apple', 'Тесла', 'Газпром', 'Microsoft'],
+    'префикс': ['appl', 'micros', 'nvid', 'alpha'],
+    'опечатка': ['nvidea', 'teslla', 'amazn', 'майкрасофт'],
+}
+
+
+def run(size: int, repeat: int) -> None:
+    started = time.perf_counter()
+    registry = synthetic_registry(size)
+    print(f"Реестр: {len(registry)} тикеров, построен за {time.perf_counter() - started:.2f} c")
+    registry.prefix('aa')
+
+    for name, queries in QUERIES.items():
+        timings = []
+        for _ in range(repeat):
+            for query in queries:
+                started = time.perf_counter()
+                registry.resolve(query)
+                timings.append(time.perf_counter() - started)
+        resolved = ', '.join(f"{q}->{registry.resolve(q)}" for q in queries)
+        print(f"{name:>16}: p50={percentile(timings, 50) * 1e6:.0f} мкс, p99={percentile(timings, 99) * 1e6:.0f} мкс  ({resolved})")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--symbols', type=int, default=12000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    run(args.symbols, args.repeat)
@@ -0,0 +1,102 @@
+"""Пропускная способность приёма апдейтов: long polling против вебхука.
+
+Polling читает синтетические апдейты из FakeSession (poll-rtt имитирует сетевую
+задержку getUpdates), вебхук получает их настоящими HTTP-запросами на локальный
+aiohttp-сервер. Ответы бота никуда не уходят.
+
+Пример: python -m benchmarks.updates_throughput --mode both --updates 2000
+"""
+import argparse
+import asyncio
+import logging
+import subprocess
+import sys
+import time
+
+from aiogram import Dispatcher
+from aiohttp import ClientSession, TCPConnector, web
+
+from benchmarks.harness import make_bot, make_message_update
+from bot import market_data
+from bot.handlers import router
+from bot.providers import FakeProvider
+from bot.webhook import SECRET_HEADER, WebhookServer
+
+SECRET = 'benchmark-secret'
+
+
+async def wait_for(predicate, timeout: float = 120.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError('updates were not processed in time')
+        await asyncio.sleep(0.005)
+
+
+async def bench_polling(dp, updates: int, poll_rtt: float) -> float:
+    bot = make_bot(poll_latency=poll_rtt)
+    polling = asyncio.create_task(dp.start_polling(bot, handle_signals=False, close_bot_session=False))
+    started = time.perf_counter()
+    for i in range(updates):
+        bot.session.updates.put_nowait(make_message_update(i, 1 + i % 1000, '/start'))
+    await wait_for(lambda: bot.session.calls >= updates)
+    elapsed = time.perf_counter() - started
+    await dp.stop_polling()
+    await polling
+    return elapsed
+
+
+async def bench_webhook(dp, updates: int, port: int, concurrency: int) -> float:
+    bot = make_bot()
+    server = WebhookServer(dp, bot, path='/webhook', secret_token=SECRET, concurrency=concurrency)
+    runner = web.AppRunner(server.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+
+    payloads = [
+        make_message_update(i, 1 + i % 1000, '/start').model_dump(mode='json', exclude_none=True)
+        for i in range(updates)
+    ]
+    url = f'http://127.0.0.1:{port}/webhook'
+    async with ClientSession(connector=TCPConnector(limit=concurrency)) as http:
+        async def post(payload):
+            async with http.post(url, json=payload, headers={SECRET_HEADER: SECRET}) as response:
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(post(p) for p in payloads))
+        await wait_for(lambda: server.processed >= updates)
+        elapsed = time.perf_counter() - started
+
+    await runner.cleanup()
+    return elapsed
+
+
+async def run(args) -> None:
+    market_data.set_provider(FakeProvider())
+    dp = Dispatcher()
+    dp.include_router(router)
+    if args.mode == 'polling':
+        elapsed = await bench_polling(dp, args.updates, args.poll_rtt)
+    else:
+        elapsed = await bench_webhook(dp, args.updates, args.port, args.concurrency)
+    print(f"{args.mode}: {args.updates} апдейтов за {elapsed:.2f} c, {args.updates / elapsed:.0f} апдейтов/c")
+    market_data.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=['polling', 'webhook', 'both'], default='both')
+    parser.add_argument('--updates', type=int, default=2000)
+    parser.add_argument('--poll-rtt', type=float, default=0.05, help='задержка одного getUpdates, c')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--concurrency', type=int, default=100)
+    args = parser.parse_args()
+
+    if args.mode == 'both':
+        # Роутер можно подключить только к одному диспетчеру, поэтому каждый режим - в своём процессе
+        for mode in ('polling', 'webhook'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.updates_throughput', *sys.argv[1:], '--mode', mode], check=True)
+    else:
+        logging.disable(logging.INFO)
+        asyncio.run(run(args))
@@ -0,0 +1,44 @@
+"""Постоянное хранилище алертов в SQLite.
+
+Индексы порогов (bot/alerts.py) строятся в памяти, а здесь лежат сами алерты,
+чтобы после перезапуска бота их можно было восстановить. Читаем один раз при
+старте, пишем при создании, удалении и срабатывании алерта. Записи маленькие и
+редкие, а в режиме WAL с synchronous=NORMAL commit не ждёт fsync, поэтому
+запись идёт прямо из event loop.
+"""
+import sqlite3
+
+
+class AlertStore:
+    def __init__(self, path: str):
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS alerts ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL, ticker TEXT NOT NULL, '
+            'metric TEXT NOT NULL, direction TEXT NOT NULL, threshold REAL NOT NULL)'
+        )
+        self._db.commit()
+
+    def load(self) -> list:
+        """Сохранённые алерты кортежами (id, user_id, ticker, metric, direction, threshold)"""
+        return self._db.execute(
+            'SELECT id, user_id, ticker, metric, direction, threshold FROM alerts ORDER BY id'
+        ).fetchall()
+
+    def last_id(self) -> int:
+        """Наибольший выданный номер, включая удалённые алерты: номера не переиспользуются"""
+        row = self._db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'alerts'").fetchone()
+        return row[0] if row else 0
+
+    def add(self, alert: tuple) -> None:
+        self._db.execute('INSERT INTO alerts VALUES (?, ?, ?, ?, ?, ?)', tuple(alert))
+        self._db.commit()
+
+    def remove(self, alert_ids: list) -> None:
+        self._db.executemany('DELETE FROM alerts WHERE id = ?', [(alert_id,) for alert_id in alert_ids])
+        self._db.commit()
+
+    def close(self) -> None:
+        self._db.close()
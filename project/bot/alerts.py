@@ -0,0 +1,332 @@
+"""Ценовые алерты: подписки пользователей на уровень цены или изменение за день.
+
+Для каждого тикера, метрики (цена или изменение в %) и направления хранится
+отсортированный список порогов. При новом тике сработавшие алерты - это
+непрерывный диапазон порогов между старым и новым значением, поэтому он
+находится двумя bisect и удаляется одним срезом, без перебора всех алертов.
+Алерты одноразовые: сработав, удаляются. Если подключено хранилище
+(bot/alert_store.py), алерты сохраняются в SQLite и восстанавливаются после
+перезапуска; сработавшие за время простоя придут с первым снимком цен.
+"""
+import asyncio
+import itertools
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from typing import NamedTuple
+
+from aiogram import Bot, Router, types
+from aiogram.filters import Command, CommandObject
+
+from bot import market_data
+from bot.alert_store import AlertStore
+from bot.poller import universe
+from bot.sender import NOTIFICATION, priority
+from bot.ticker_registry import get_registry
+
+PRICE = 'price'
+CHANGE = 'change'
+ABOVE = '>'
+BELOW = '<'
+MAX_ALERTS_PER_USER = 50
+NOTIFY_CONCURRENCY = 100
+NOTIFY_SHUTDOWN_TIMEOUT = 5.0
+
+
+class Alert(NamedTuple):
+    id: int
+    user_id: int
+    ticker: str
+    metric: str
+    direction: str
+    threshold: float
+
+
+class ThresholdIndex:
+    """Отсортированные пороги одного тикера/метрики/направления"""
+
+    def __init__(self):
+        self.keys = []
+        self.ids = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, threshold: float, alert_id: int) -> None:
+        index = bisect_right(self.keys, threshold)
+        self.keys.insert(index, threshold)
+        self.ids.insert(index, alert_id)
+
+    def remove(self, threshold: float, alert_id: int) -> None:
+        lo = bisect_left(self.keys, threshold)
+        hi = bisect_right(self.keys, threshold)
+        index = self.ids.index(alert_id, lo, hi)
+        del self.keys[index]
+        del self.ids[index]
+
+    def pop_slice(self, lo: int, hi: int) -> list:
+        ids = self.ids[lo:hi]
+        del self.keys[lo:hi]
+        del self.ids[lo:hi]
+        return ids
+
+    def pop_crossed_up(self, old, new: float) -> list:
+        """Пороги из (old, new]: значение поднялось до порога или выше"""
+        lo = 0 if old is None else bisect_right(self.keys, old)
+        hi = bisect_right(self.keys, new)
+        return self.pop_slice(lo, hi) if lo < hi else []
+
+    def pop_crossed_down(self, old, new: float) -> list:
+        """Пороги из [new, old): значение опустилось до порога или ниже"""
+        lo = bisect_left(self.keys, new)
+        hi = len(self.keys) if old is None else bisect_left(self.keys, old)
+        return self.pop_slice(lo, hi) if lo < hi else []
+
+
+def metric_values(closes: list) -> dict:
+    current = closes[-1]
+    previous = closes[0]
+    return {PRICE: current, CHANGE: (current / previous - 1) * 100}
+
+
+class AlertEngine:
+    def __init__(self, store: AlertStore = None):
+        self.store = store
+        self.alerts = {}
+        self.by_user = {}
+        self._indexes = {}
+        self._last = {}
+        last_id = 0
+        if store is not None:
+            for row in store.load():
+                self._insert(Alert(*row))
+            last_id = store.last_id()
+        self._ids = itertools.count(last_id + 1)
+
+    def __len__(self):
+        return len(self.alerts)
+
+    def _index(self, ticker: str, metric: str, direction: str) -> ThresholdIndex:
+        key = (ticker, metric, direction)
+        index = self._indexes.get(key)
+        if index is None:
+            self._indexes[key] = index = ThresholdIndex()
+        return index
+
+    def is_satisfied(self, ticker: str, metric: str, direction: str, threshold: float) -> bool:
+        """Выполнено ли условие уже сейчас (по последнему известному значению)"""
+        value = self._last.get((ticker, metric))
+        if value is None:
+            return False
+        return value >= threshold if direction == ABOVE else value <= threshold
+
+    def add(self, user_id: int, ticker: str, metric: str, direction: str, threshold: float) -> Alert:
+        if len(self.by_user.get(user_id, ())) >= MAX_ALERTS_PER_USER:
+            raise ValueError(f"не больше {MAX_ALERTS_PER_USER} алертов на пользователя")
+        alert = Alert(next(self._ids), user_id, ticker, metric, direction, threshold)
+        self._insert(alert)
+        if self.store is not None:
+            self.store.add(alert)
+        return alert
+
+    def _insert(self, alert: Alert) -> None:
+        self.alerts[alert.id] = alert
+        self.by_user.setdefault(alert.user_id, {})[alert.id] = alert
+        self._index(alert.ticker, alert.metric, alert.direction).add(alert.threshold, alert.id)
+
+    def remove(self, user_id: int, alert_id: int) -> bool:
+        alert = self.by_user.get(user_id, {}).get(alert_id)
+        if alert is None:
+            return False
+        self._index(alert.ticker, alert.metric, alert.direction).remove(alert.threshold, alert.id)
+        self._forget(alert)
+        if self.store is not None:
+            self.store.remove([alert.id])
+        return True
+
+    def _forget(self, alert: Alert) -> None:
+        del self.alerts[alert.id]
+        user_alerts = self.by_user[alert.user_id]
+        del user_alerts[alert.id]
+        if not user_alerts:
+            del self.by_user[alert.user_id]
+
+    def user_alerts(self, user_id: int) -> list:
+        return sorted(self.by_user.get(user_id, {}).values())
+
+    def evaluate(self, quotes: dict) -> list:
+        """Проверяет новый снимок цен и возвращает сработавшие (и уже удалённые) алерты"""
+        triggered = []
+        for ticker, closes in quotes.items():
+            if not closes:
+                continue
+            for metric, value in metric_values(closes).items():
+                old = self._last.get((ticker, metric))
+                self._last[(ticker, metric)] = value
+                up = self._indexes.get((ticker, metric, ABOVE))
+                if up:
+                    triggered.extend(up.pop_crossed_up(old, value))
+                down = self._indexes.get((ticker, metric, BELOW))
+                if down:
+                    triggered.extend(down.pop_crossed_down(old, value))
+
+        alerts = [self.alerts[alert_id] for alert_id in triggered]
+        for alert in alerts:
+            self._forget(alert)
+        if self.store is not None and triggered:
+            self.store.remove(triggered)
+        return alerts
+
+
+def describe(alert: Alert) -> str:
+    word = 'выше' if alert.direction == ABOVE else 'ниже'
+    if alert.metric == PRICE:
+        return f"{alert.ticker} {word} {alert.threshold:.2f} {market_data.currency(alert.ticker)}"
+    return f"{alert.ticker}: изменение за день {word} {alert.threshold:+.2f}%"
+
+
+def notification_text(alert: Alert, closes: list) -> str:
+    values = metric_values(closes)
+    return (
+        f"🔔 <b>Алерт сработал:</b> {describe(alert)}\n"
+        f"Сейчас: <b>{values[PRICE]:.2f} {market_data.currency(alert.ticker)} ({values[CHANGE]:+.2f}%)</b>"
+    )
+
+
+class AlertNotifier:
+    """Очередь уведомлений об алертах.
+
+    Темп отправки задаёт SendScheduler (bot/sender.py): уведомления идут с приоритетом
+    NOTIFICATION, после ответов пользователям. Здесь только ограничено число
+    одновременно ожидающих отправки уведомлений.
+    """
+
+    def __init__(self, bot: Bot, concurrency: int = NOTIFY_CONCURRENCY):
+        self.bot = bot
+        self.queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks = set()
+        self.sent = 0
+        self.failed = 0
+
+    async def put(self, chat_id: int, text: str) -> None:
+        await self.queue.put((chat_id, text))
+
+    async def run(self) -> None:
+        while True:
+            chat_id, text = await self.queue.get()
+            await self._slots.acquire()
+            task = asyncio.create_task(self._send(chat_id, text))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, chat_id: int, text: str) -> None:
+        try:
+            with priority(NOTIFICATION):
+                await self.bot.send_message(chat_id=chat_id, text=text)
+            self.sent += 1
+        except Exception as e:
+            self.failed += 1
+            logging.error(f"Error sending alert to {chat_id}: {e}")
+        finally:
+            self._slots.release()
+
+    async def drain(self, timeout: float = NOTIFY_SHUTDOWN_TIMEOUT) -> None:
+        """Ждёт уведомления, которые уже отправляются"""
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=timeout)
+
+
+alert_engine = AlertEngine()
+_notifier = None
+
+
+def open_store(path: str) -> int:
+    """Подключает постоянное хранилище и восстанавливает из него алерты; возвращает их число"""
+    global alert_engine
+    alert_engine = AlertEngine(AlertStore(path))
+    return len(alert_engine)
+
+
+def close_store() -> None:
+    if alert_engine.store is not None:
+        alert_engine.store.close()
+
+
+def start_notifier(bot: Bot) -> asyncio.Task:
+    global _notifier
+    _notifier = AlertNotifier(bot)
+    return asyncio.create_task(_notifier.run())
+
+
+async def stop_notifier(task: asyncio.Task) -> None:
+    """Перестаёт брать уведомления из очереди и дожидается уже начатых"""
+    task.cancel()
+    if _notifier is not None:
+        await _notifier.drain()
+
+
+async def on_prices(quotes: dict) -> None:
+    """Слушатель PricePoller: проверяет алерты по каждому новому снимку"""
+    for alert in alert_engine.evaluate(quotes):
+        if _notifier is not None:
+            await _notifier.put(alert.user_id, notification_text(alert, quotes[alert.ticker]))
+
+
+router = Router()
+
+ALERT_RE = re.compile(r'^\s*(\S+)\s*([<>])\s*([+-]?\d+(?:[.,]\d+)?)\s*(%?)\s*$')
+ALERT_HELP = (
+    "Формат: <code>/alert AAPL &gt; 200</code> - цена выше 200 в валюте тикера,\n"
+    "<code>/alert TSLA &lt; 150</code> - цена ниже 150,\n"
+    "<code>/alert NVDA &gt; 5%</code> или <code>/alert NVDA &lt; -3%</code> - изменение за день.\n"
+    "Список: /alerts, удалить: <code>/unalert номер</code>"
+)
+
+
+@router.message(Command("alert"))
+async def cmd_alert(message: types.Message, command: CommandObject):
+    match = ALERT_RE.match(command.args or '')
+    if not match:
+        await message.answer(ALERT_HELP)
+        return
+
+    query, direction, number, percent = match.groups()
+    ticker = get_registry().resolve(query)
+    if ticker not in universe():
+        await message.answer("❌ Алерты доступны только для тикеров из списка акций")
+        return
+
+    # Валюта нужна для подписи алерта сейчас и в уведомлении потом
+    await market_data.get_currency(ticker)
+    metric = CHANGE if percent else PRICE
+    threshold = float(number.replace(',', '.'))
+    if alert_engine.is_satisfied(ticker, metric, direction, threshold):
+        await message.answer("ℹ️ Условие уже выполнено, алерт не создан")
+        return
+
+    try:
+        alert = alert_engine.add(message.from_user.id, ticker, metric, direction, threshold)
+    except ValueError as e:
+        await message.answer(f"❌ Не удалось создать алерт: {e}")
+        return
+    await message.answer(f"✅ Алерт #{alert.id}: {describe(alert)}")
+
+
+@router.message(Command("alerts"))
+async def cmd_alerts(message: types.Message):
+    alerts = alert_engine.user_alerts(message.from_user.id)
+    if not alerts:
+        await message.answer("У вас нет активных алертов.\n\n" + ALERT_HELP)
+        return
+    lines = [f"#{alert.id}: {describe(alert)}" for alert in alerts]
+    await message.answer("🔔 <b>Ваши алерты:</b>\n\n" + "\n".join(lines))
+
+
+@router.message(Command("unalert"))
+async def cmd_unalert(message: types.Message, command: CommandObject):
+    alert_id = (command.args or '').strip().lstrip('#')
+    if alert_id.isdigit() and alert_engine.remove(message.from_user.id, int(alert_id)):
+        await message.answer(f"🗑 Алерт #{alert_id} удалён")
+    else:
+        await message.answer("❌ Алерт не найден. Список: /alerts")
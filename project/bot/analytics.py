@@ -0,0 +1,122 @@
+"""Меню "📈 Аналитика": индикаторы и корреляции по локальной истории.
+
+История читается из HistoryStore (bot/history_store.py) срезами memmap; если
+тикера там ещё нет, он догружается один раз. Все выбранные тикеры
+выравниваются по общим датам и считаются одним векторизованным проходом
+(bot/indicators.py).
+"""
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from aiogram import F, Router, types
+from aiogram.fsm.context import FSMContext
+
+from bot import indicators, market_data
+from bot.history_store import get_store
+from bot.render_cache import cancel_kb, main_kb
+from bot.states import StockStates
+from bot.stocks_data import COMPARISON_STOCKS
+from bot.ticker_registry import get_registry
+
+ANALYTICS_DAYS = 3 * 365
+MAX_ANALYTICS = len(COMPARISON_STOCKS)
+# Минимум общих баров, чтобы индикаторы имели смысл
+MIN_BARS = 60
+ALL_WORDS = {'все', 'all', '*'}
+
+router = Router()
+
+
+async def load_closes(tickers: list, days: int = ANALYTICS_DAYS) -> tuple:
+    """Выровненная матрица цен закрытия (тикеры, бары); тикеры без истории пропускаются"""
+    store = get_store()
+    start = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
+    columns, loaded = [], []
+    for ticker in tickers:
+        if store.last_timestamp(ticker) is None:
+            try:
+                await store.refresh(ticker)
+            except Exception as e:
+                logging.warning(f"History refresh failed for {ticker}: {e}")
+                continue
+        window = store.window(ticker, start=start)
+        if len(window['timestamp']):
+            columns.append((window['timestamp'], window['close']))
+            loaded.append(ticker)
+    if not columns:
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0))
+    timestamps, closes = indicators.align(columns)
+    return loaded, timestamps, closes
+
+
+def format_analytics(tickers: list, timestamps, closes, currencies: dict) -> str:
+    values = indicators.summary(closes)
+    first = datetime.fromtimestamp(int(timestamps[0]), timezone.utc).strftime('%d.%m.%Y')
+    lines = [f"📈 <b>Аналитика с {first}</b> ({len(timestamps)} торговых дней)"]
+    for row, ticker in enumerate(tickers):
+        lines.append(
+            f"\n<b>{ticker}</b>: {values['price'][row]:.2f} {currencies[ticker]}\n"
+            f"SMA20 / SMA50: {values['sma20'][row]:.2f} / {values['sma50'][row]:.2f}\n"
+            f"EMA20: {values['ema20'][row]:.2f}\n"
+            f"RSI14: {values['rsi14'][row]:.0f}\n"
+            f"Волатильность (год): {values['volatility'][row] * 100:.1f}%\n"
+            f"Макс. просадка: {values['max_drawdown'][row] * 100:.1f}%"
+        )
+
+    if len(tickers) > 1:
+        matrix = indicators.correlation(closes)
+        header = "      " + " ".join(f"{ticker[:5]:>5}" for ticker in tickers)
+        rows = [
+            f"{ticker[:5]:<5} " + " ".join(f"{value:+.2f}" for value in matrix[row])
+            for row, ticker in enumerate(tickers)
+        ]
+        lines.append("\n🔗 <b>Корреляция дневных доходностей</b>\n<pre>" + "\n".join([header, *rows]) + "</pre>")
+    return "\n".join(lines)
+
+
+@router.message(F.text == "📈 Аналитика")
+async def start_analytics(message: types.Message, state: FSMContext):
+    await state.set_state(StockStates.waiting_for_analytics_tickers)
+    await message.answer(
+        f"Введите до {MAX_ANALYTICS} тикеров через пробел или запятую, "
+        f"либо «все» для всего списка сравнения.\n"
+        f"Доступные: {', '.join(COMPARISON_STOCKS)}",
+        reply_markup=cancel_kb()
+    )
+
+
+@router.message(StockStates.waiting_for_analytics_tickers)
+async def process_analytics_tickers(message: types.Message, state: FSMContext):
+    queries = [q for q in re.split(r"[\s,;]+", message.text or '') if q]
+    if any(q.lower() in ALL_WORDS for q in queries):
+        tickers = list(COMPARISON_STOCKS)
+    else:
+        registry = get_registry()
+        resolved = {q: registry.resolve(q) for q in queries}
+        unknown = [q for q, t in resolved.items() if t not in COMPARISON_STOCKS]
+        if unknown or not queries:
+            await message.answer(f"❌ Тикер не найден: {', '.join(unknown) or '-'}. Попробуйте ещё раз:")
+            return
+        tickers = list(dict.fromkeys(resolved.values()))
+    if len(tickers) > MAX_ANALYTICS:
+        await message.answer(f"❌ Не больше {MAX_ANALYTICS} тикеров. Попробуйте ещё раз:")
+        return
+
+    started = time.perf_counter()
+    loaded, timestamps, closes = await load_closes(tickers)
+    if len(timestamps) < MIN_BARS:
+        await message.answer("❌ Недостаточно истории для расчёта", reply_markup=main_kb())
+        await state.clear()
+        return
+
+    text = format_analytics(loaded, timestamps, closes, await market_data.get_currencies(loaded))
+    missing = [ticker for ticker in tickers if ticker not in loaded]
+    if missing:
+        text += f"\n\nНет данных: {', '.join(missing)}"
+    logging.info(f"Analytics for {len(loaded)} tickers in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    await message.answer(text, reply_markup=main_kb())
+    await state.clear()
@@ -0,0 +1,93 @@
+"""Отрисовка графиков в процессах пула (bot/charts.py).
+
+Модуль импортируется в дочерних процессах, поэтому зависит только от NumPy и
+matplotlib. init_worker один раз на процесс включает бэкенд Agg и строит
+шаблон фигуры; render_chart только подменяет данные линий и подписи.
+"""
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Периоды графика и их длина в календарных днях
+CHART_PERIODS = {'1mo': 30, '3mo': 91, '6mo': 182, '1y': 365, '5y': 1826}
+CHART_SIZE = (8, 4.5)
+CHART_DPI = 100
+LINE_COLOR = '#1f77b4'
+SMA_COLOR = '#ff7f0e'
+SMA_WINDOW = 20
+PNG_COMPRESS_LEVEL = 6
+
+_template = None
+
+
+class _Template:
+    def __init__(self):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.price_line, = self.axes.plot([], [], color=LINE_COLOR, linewidth=1.4, label='Close')
+        self.sma_line, = self.axes.plot([], [], color=SMA_COLOR, linewidth=1.0, label=f'SMA{SMA_WINDOW}')
+        self.fill = None
+        locator = AutoDateLocator()
+        self.axes.xaxis.set_major_locator(locator)
+        self.axes.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+        self.axes.grid(True, alpha=0.3)
+        self.axes.legend(loc='upper left')
+        # Поля фиксированы: tight_layout считался бы до появления заголовка и подписей
+        self.figure.subplots_adjust(left=0.08, right=0.98, top=0.92, bottom=0.1)
+
+    def to_png(self) -> bytes:
+        # Один проход отрисовки и PNG без альфа-канала: savefig рисует фигуру дважды,
+        # а прозрачность графику не нужна, RGB заметно меньше по размеру
+        from PIL import Image
+
+        canvas = self.figure.canvas
+        canvas.draw()
+        image = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='PNG', compress_level=PNG_COMPRESS_LEVEL)
+        return buffer.getvalue()
+
+
+def init_worker() -> None:
+    """Инициализатор процесса пула: импорт matplotlib и шаблон фигуры заранее"""
+    global _template
+    import matplotlib
+    matplotlib.use('Agg')
+    _template = _Template()
+
+
+def render_chart(ticker: str, period: str, timestamps: np.ndarray, closes: np.ndarray, currency: str) -> bytes:
+    """PNG с ценой закрытия и SMA; timestamps - секунды UTC, currency - код валюты для подписи"""
+    from matplotlib.dates import date2num
+
+    if _template is None:
+        init_worker()
+    template = _template
+    days = date2num(np.asarray(timestamps, dtype='datetime64[s]'))
+    closes = np.asarray(closes, dtype=float)
+
+    template.price_line.set_data(days, closes)
+    if len(closes) >= SMA_WINDOW:
+        sma = np.convolve(closes, np.full(SMA_WINDOW, 1 / SMA_WINDOW), mode='valid')
+        template.sma_line.set_data(days[SMA_WINDOW - 1:], sma)
+    else:
+        template.sma_line.set_data([], [])
+    if template.fill is not None:
+        template.fill.remove()
+    low = closes.min()
+    template.fill = template.axes.fill_between(days, closes, low, color=LINE_COLOR, alpha=0.08)
+
+    template.axes.set_xlim(days[0], days[-1] if len(days) > 1 else days[0] + 1)
+    margin = (closes.max() - low) * 0.05 or 1.0
+    template.axes.set_ylim(low - margin, closes.max() + margin)
+    change = (closes[-1] / closes[0] - 1) * 100
+    last_day = datetime.fromtimestamp(int(timestamps[-1]), timezone.utc).strftime('%d.%m.%Y')
+    template.axes.set_title(f"{ticker} · {period} · {closes[-1]:.2f} {currency} ({change:+.2f}%) · {last_day}")
+
+    return template.to_png()
@@ -0,0 +1,191 @@
+"""Графики цен: отрисовка в пуле процессов и кэш готовых картинок.
+
+matplotlib работает в отдельных процессах (bot/chart_render.py), поэтому
+отрисовка не блокирует event loop и масштабируется по ядрам. Картинки
+кэшируются по (тикер, период, время и цена закрытия последнего бара): пока не
+пришёл новый бар и не обновилась цена текущего, график не перерисовывается.
+После первой отправки запоминается file_id Telegram, и повторно картинка
+отправляется по нему, без загрузки байтов.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import numpy as np
+from aiogram import Bot, F, Router, types
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+from aiogram.types import BufferedInputFile
+
+from bot import market_data
+from bot.chart_render import CHART_PERIODS, init_worker, render_chart
+from bot.history_store import get_store
+from bot.quote_cache import QuoteCache
+from bot.render_cache import chart_periods_kb, tickers_kb
+from bot.states import StockStates
+from bot.ticker_registry import get_registry
+
+CHART_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+CHART_TIMEOUT = 30.0
+CHART_CACHE_SIZE = 256
+# Ключ уже содержит время последнего бара, TTL лишь ограничивает жизнь file_id
+CHART_TTL = 24 * 60 * 60.0
+DEFAULT_PERIOD = '1y'
+
+
+class ChartImage:
+    __slots__ = ('png', 'file_id')
+
+    def __init__(self, png: bytes):
+        self.png = png
+        self.file_id = None
+
+
+class ChartService:
+    def __init__(self, workers: int = CHART_WORKERS, cache_size: int = CHART_CACHE_SIZE):
+        self.workers = workers
+        self.cache = QuoteCache(ttl=CHART_TTL, stale_ttl=0, max_size=cache_size)
+        self._pool = None
+        self.rendered = 0
+        self.uploads = 0
+        self.upload_bytes = 0
+        self.file_id_sends = 0
+
+    def start(self) -> None:
+        if self._pool is None:
+            # spawn: дочерним процессам не достаются потоки и event loop родителя
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=init_worker,
+            )
+
+    async def warm_up(self) -> None:
+        """Поднимает все процессы пула заранее, чтобы первый график не ждал импорта matplotlib"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _render(self, ticker: str, period: str, timestamps, closes, currency: str) -> ChartImage:
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._pool, render_chart, ticker, period, np.array(timestamps), np.array(closes), currency
+        )
+        png = await asyncio.wait_for(future, CHART_TIMEOUT)
+        self.rendered += 1
+        return ChartImage(png)
+
+    async def chart(self, ticker: str, period: str = DEFAULT_PERIOD):
+        """Картинка из кэша или новая отрисовка; None, если истории нет"""
+        store = get_store()
+        if store.last_timestamp(ticker) is None:
+            await store.refresh(ticker)
+        start = int((datetime.now(timezone.utc) - timedelta(days=CHART_PERIODS[period])).timestamp())
+        window = store.window(ticker, start=start)
+        if len(window['timestamp']) < 2:
+            return None
+        # Бар текущего дня дописывается на месте, поэтому одного времени бара в ключе мало
+        key = (ticker, period, int(window['timestamp'][-1]), float(window['close'][-1]))
+        currency = await market_data.get_currency(ticker)
+        return await self.cache.get(
+            key, partial(self._render, ticker, period, window['timestamp'], window['close'], currency)
+        )
+
+    async def send(self, bot: Bot, chat_id: int, ticker: str, image: ChartImage, reply_markup=None) -> None:
+        if image.file_id is not None:
+            try:
+                await bot.send_photo(chat_id=chat_id, photo=image.file_id, reply_markup=reply_markup)
+                self.file_id_sends += 1
+                return
+            except TelegramBadRequest as e:
+                logging.warning(f"Cached chart file_id rejected for {ticker}: {e}")
+                image.file_id = None
+
+        message = await bot.send_photo(
+            chat_id=chat_id,
+            photo=BufferedInputFile(image.png, filename=f"{ticker}.png"),
+            reply_markup=reply_markup,
+        )
+        self.uploads += 1
+        self.upload_bytes += len(image.png)
+        if message.photo:
+            image.file_id = message.photo[-1].file_id
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.workers,
+            'cached': len(self.cache),
+            'rendered': self.rendered,
+            'uploads': self.uploads,
+            'upload_kb': f"{self.upload_bytes / 1024:.0f}",
+            'file_id_sends': self.file_id_sends,
+        }
+
+
+service = ChartService()
+
+router = Router()
+
+
+async def send_chart(bot: Bot, chat_id: int, ticker: str, period: str = DEFAULT_PERIOD) -> bool:
+    try:
+        image = await service.chart(ticker, period)
+    except Exception as e:
+        logging.error(f"Error rendering chart for {ticker}: {e}")
+        image = None
+    if image is None:
+        await bot.send_message(chat_id=chat_id, text=f"❌ Не удалось построить график {ticker}")
+        return False
+    await service.send(bot, chat_id, ticker, image, reply_markup=chart_periods_kb(ticker))
+    return True
+
+
+@router.message(F.text == "📉 График")
+async def start_chart(message: types.Message, state: FSMContext):
+    await state.set_state(StockStates.waiting_for_chart_ticker)
+    await message.answer(
+        "Выберите акцию для графика (период можно сменить кнопками под графиком):",
+        reply_markup=tickers_kb()
+    )
+
+
+@router.message(StockStates.waiting_for_chart_ticker)
+async def process_chart_ticker(message: types.Message, bot: Bot):
+    # Состояние не сбрасываем: можно листать графики разных тикеров до "❌ Отмена"
+    ticker = get_registry().resolve(message.text or '')
+    if ticker is None:
+        await message.answer("❌ Тикер не найден. Выберите из списка ниже:")
+        return
+    await send_chart(bot, message.chat.id, ticker)
+
+
+@router.message(Command("chart"))
+async def cmd_chart(message: types.Message, command: CommandObject, bot: Bot):
+    args = (command.args or '').split()
+    ticker = get_registry().resolve(args[0]) if args else None
+    period = args[1] if len(args) > 1 else DEFAULT_PERIOD
+    if ticker is None or period not in CHART_PERIODS:
+        await message.answer(f"Формат: <code>/chart AAPL 3mo</code>, периоды: {', '.join(CHART_PERIODS)}")
+        return
+    await send_chart(bot, message.chat.id, ticker, period)
+
+
+@router.callback_query(F.data.startswith("chart:"))
+async def switch_chart_period(callback: types.CallbackQuery, bot: Bot):
+    _, _, data = callback.data.partition(":")
+    ticker, _, period = data.rpartition(":")
+    await callback.answer()
+    # callback_data приходит от клиента: принимаем только известные тикеры и периоды
+    if ticker in get_registry() and period in CHART_PERIODS:
+        await send_chart(bot, callback.message.chat.id, ticker, period)
@@ -0,0 +1,36 @@
+import os
+from pathlib import Path
+
+BOT_TOKEN = os.getenv('BOT_TOKEN', '7584464829:AAEI8fBuLtzbYAbv_Lt_6X91LoCJhg6bc_s')
+ADMIN_USERNAME = 'maryana_avdeenko1'
+MARKET_DATA_PROVIDER = os.getenv('MARKET_DATA_PROVIDER', 'yfinance')
+# Файл со всеми тикерами для поиска (symbol,name,description,aliases)
+TICKERS_FILE = os.getenv('TICKERS_FILE', str(Path(__file__).parent / 'data' / 'tickers.csv'))
+
+# Локальное хранилище дневной истории (bot/history_store.py)
+HISTORY_DIR = os.getenv('HISTORY_DIR', str(Path(__file__).parent.parent / 'history'))
+
+# Дивиденды: scrape - страницы Yahoo/investing.com с провайдером как запасным вариантом, provider - только провайдер
+DIVIDEND_SOURCE = os.getenv('DIVIDEND_SOURCE', 'scrape')
+# Постоянный кэш дивидендов (bot/dividend_cache.py)
+DIVIDEND_CACHE_PATH = os.getenv('DIVIDEND_CACHE_PATH', str(Path(__file__).parent.parent / 'dividends.sqlite3'))
+# Алерты пользователей (bot/alert_store.py), переживают перезапуск бота
+ALERTS_PATH = os.getenv('ALERTS_PATH', str(Path(__file__).parent.parent / 'alerts.sqlite3'))
+
+# Режим получения апдейтов: polling или webhook
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+# Публичный адрес, который сообщаем Telegram (например, https://bot.example.com)
+WEBHOOK_BASE_URL = os.getenv('WEBHOOK_BASE_URL', '')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', '')
+WEBHOOK_CONCURRENCY = int(os.getenv('WEBHOOK_CONCURRENCY', '100'))
+
+# FSM-хранилище: memory (один процесс), redis (несколько воркеров) или fakeredis (локальная проверка)
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'memory')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+# Брошенные диалоги истекают через час
+FSM_STATE_TTL = int(os.getenv('FSM_STATE_TTL', '3600'))
+FSM_DATA_TTL = int(os.getenv('FSM_DATA_TTL', '3600'))
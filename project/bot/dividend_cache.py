@@ -0,0 +1,166 @@
+"""Кэш дивидендов: SQLite на диске и LRU в памяти перед ним.
+
+Дивиденды меняются несколько раз в год, поэтому срок жизни записи считается
+не фиксированным TTL, а по календарю: до ближайшей известной экс-дивидендной
+даты или даты закрытия реестра (после неё история обновится). Если будущих
+дат нет, следующая выплата прогнозируется по среднему интервалу между
+прошлыми. Срок всегда лежит между MIN_TTL и MAX_TTL: объявление нового
+дивиденда может появиться в любой момент.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+MEMORY_SIZE = 512
+MIN_TTL = 60 * 60
+DEFAULT_TTL = 24 * 60 * 60
+MAX_TTL = 7 * 24 * 60 * 60
+# Пустой ответ (тикер без дивидендов или неизвестный) проверяем чаще
+EMPTY_TTL = 6 * 60 * 60
+# Данные обновляются на следующий день после события
+EVENT_GRACE = 24 * 60 * 60
+
+DATE_FORMATS = ('%b %d, %Y', '%d.%m.%Y', '%Y-%m-%d')
+
+
+def parse_date(value) -> datetime:
+    """Дата в одном из форматов Yahoo/investing.com (UTC) или None"""
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def upcoming_events(data: dict) -> list:
+    """Известные даты событий по тикеру: следующий дивиденд и даты из истории"""
+    dates = []
+    next_dividend = data.get('next_dividend') or {}
+    for key in ('ex_date', 'record_date'):
+        dates.append(parse_date(next_dividend.get(key)))
+    for dividend in data.get('dividends') or ():
+        for key in ('Date', 'Record Date', 'Payment Date'):
+            dates.append(parse_date(dividend.get(key)))
+    return [date for date in dates if date is not None]
+
+
+def expires_at(data: dict, now: float) -> float:
+    """Момент, до которого запись считается актуальной"""
+    if not data or not data.get('dividends'):
+        return now + EMPTY_TTL
+
+    events = sorted(date.timestamp() for date in upcoming_events(data))
+    future = [event for event in events if event > now]
+    if future:
+        expiry = future[0] + EVENT_GRACE
+    else:
+        # Прогноз следующей выплаты по среднему интервалу между прошлыми
+        dates = (parse_date(dividend.get('Date')) for dividend in data['dividends'])
+        payments = sorted({date.timestamp() for date in dates if date is not None})
+        if len(payments) >= 2:
+            interval = (payments[-1] - payments[0]) / (len(payments) - 1)
+            expiry = payments[-1] + interval
+            if expiry <= now:
+                expiry = now + DEFAULT_TTL
+        else:
+            expiry = now + DEFAULT_TTL
+    return min(max(expiry, now + MIN_TTL), now + MAX_TTL)
+
+
+class DividendCache:
+    def __init__(self, path: str, memory_size: int = MEMORY_SIZE, clock=time.time):
+        self.memory_size = memory_size
+        self._clock = clock
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS dividends ('
+            'ticker TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._db.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, ticker: str):
+        """Актуальные данные по тикеру или None"""
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(ticker)
+            if entry is not None:
+                data, expiry = entry
+                if expiry > now:
+                    self._memory.move_to_end(ticker)
+                    self.memory_hits += 1
+                    return data
+                del self._memory[ticker]
+
+            row = self._db.execute(
+                'SELECT data, expires_at FROM dividends WHERE ticker = ? AND expires_at > ?', (ticker, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            data = json.loads(row[0])
+            self._remember(ticker, data, row[1])
+            self.disk_hits += 1
+            return data
+
+    def put(self, ticker: str, data: dict) -> float:
+        now = self._clock()
+        expiry = expires_at(data, now)
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO dividends (ticker, data, fetched_at, expires_at) VALUES (?, ?, ?, ?)',
+                (ticker, json.dumps(data, ensure_ascii=False), now, expiry),
+            )
+            self._db.commit()
+            self._remember(ticker, data, expiry)
+        return expiry
+
+    def _remember(self, ticker: str, data: dict, expiry: float) -> None:
+        self._memory[ticker] = (data, expiry)
+        self._memory.move_to_end(ticker)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def invalidate(self, ticker: str = None) -> None:
+        with self._lock:
+            if ticker is None:
+                self._memory.clear()
+                self._db.execute('DELETE FROM dividends')
+            else:
+                self._memory.pop(ticker, None)
+                self._db.execute('DELETE FROM dividends WHERE ticker = ?', (ticker,))
+            self._db.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            deleted = self._db.execute('DELETE FROM dividends WHERE expires_at <= ?', (self._clock(),)).rowcount
+            self._db.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            stored = self._db.execute('SELECT COUNT(*) FROM dividends').fetchone()[0]
+        return {
+            'memory': len(self._memory),
+            'stored': stored,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
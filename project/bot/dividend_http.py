@@ -0,0 +1,93 @@
+"""Асинхронный HTTP-клиент для парсеров дивидендов.
+
+Одна сессия aiohttp на процесс: соединения переиспользуются (keep-alive),
+число одновременных запросов ограничено и в целом, и на каждый хост.
+У каждого запроса есть таймаут, временные ошибки (сеть, 429, 5xx) повторяются
+с экспоненциальной задержкой.
+"""
+import asyncio
+import logging
+import random
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+TOTAL_TIMEOUT = 15.0
+CONNECT_TIMEOUT = 5.0
+CONNECTION_LIMIT = 32
+PER_HOST_LIMIT = 4
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableStatus(Exception):
+    def __init__(self, status: int, retry_after: float = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after(response) -> float:
+    value = response.headers.get('Retry-After', '')
+    return float(value) if value.replace('.', '', 1).isdigit() else None
+
+
+class HttpClient:
+    def __init__(self, limit: int = CONNECTION_LIMIT, limit_per_host: int = PER_HOST_LIMIT,
+                 total_timeout: float = TOTAL_TIMEOUT, connect_timeout: float = CONNECT_TIMEOUT,
+                 retries: int = RETRIES, headers: dict = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.retries = retries
+        self.headers = headers or HEADERS
+        self._session = None
+        self.requests = 0
+        self.retried = 0
+
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, headers=self.headers)
+        return self._session
+
+    async def get_text(self, url: str) -> str:
+        """Тело страницы; после retries неудачных попыток пробрасывает последнюю ошибку"""
+        for attempt in range(self.retries + 1):
+            self.requests += 1
+            try:
+                async with self.session().get(url) as response:
+                    if response.status in RETRY_STATUSES:
+                        raise RetryableStatus(response.status, _retry_after(response))
+                    response.raise_for_status()
+                    return await response.text()
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                    asyncio.TimeoutError, RetryableStatus) as e:
+                if attempt == self.retries:
+                    raise
+                delay = min(BACKOFF_BASE * 2 ** attempt, BACKOFF_MAX) * random.uniform(0.5, 1.0)
+                if isinstance(e, RetryableStatus) and e.retry_after is not None:
+                    delay = min(e.retry_after, BACKOFF_MAX)
+                self.retried += 1
+                logger.warning(f"GET {url} failed ({e!r}), retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def get_many(self, urls: list) -> list:
+        """Страницы параллельно; вместо неудачной страницы в списке стоит исключение"""
+        return await asyncio.gather(*(self.get_text(url) for url in urls), return_exceptions=True)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
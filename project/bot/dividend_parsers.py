@@ -0,0 +1,169 @@
+"""Извлечение дивидендов из страниц Yahoo Finance и investing.com.
+
+Вместо полного дерева BeautifulSoup по всей странице:
+- нужный участок сначала находится в тексте заранее скомпилированным
+  регулярным выражением (якорь - id таблицы или текст подписи);
+- разбирается только этот участок (таблица или блок вокруг подписи),
+  парсером lxml на C;
+- значения достаются заранее скомпилированными XPath-выражениями.
+Если якоря на странице нет, страница вообще не разбирается.
+"""
+import re
+
+from lxml import etree, html
+
+# Сколько символов после подписи захватывать, если конец блока заранее неизвестен
+LABEL_WINDOW = 2000
+
+YAHOO_HISTORY_RE = re.compile(r'data-test=["\']historical-prices["\']')
+FORWARD_DIVIDEND_RE = re.compile(r'Forward Dividend (?:&amp;|&#38;|&) Yield')
+EX_DIVIDEND_RE = re.compile(r'>\s*Ex-Dividend Date\s*<')
+TRAILING_YIELD_RE = re.compile(r'Trailing Annual Dividend Yield')
+INVESTING_HISTORY_RE = re.compile(r'id=["\']dividendsHistoryData["\']')
+NEXT_DIVIDEND_RE = re.compile(r'Прогноз дивиденда')
+RECORD_DATE_RE = re.compile(r'Дата закрытия реестра')
+DIVIDEND_DIV_RE = re.compile(r'<div\b[^>]*class=["\'][^"\']*\bdividend\b', re.I)
+NEXT_DIVIDEND_DIV_RE = re.compile(r'<div\b[^>]*class=["\'][^"\']*\bnext-dividend-info\b', re.I)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+TABLE_ROWS = etree.XPath('.//tr')
+ROW_CELLS = etree.XPath('./td')
+FORWARD_DIVIDEND_CELL = etree.XPath(
+    f"//td[{_has_class('Ta(end)')}][preceding-sibling::*[1][contains(., 'Forward Dividend & Yield')]]"
+)
+EX_DIVIDEND_VALUE = etree.XPath("//span[normalize-space(.)='Ex-Dividend Date'][1]/following::span[1]")
+TRAILING_YIELD_VALUE = etree.XPath("(//td[contains(., 'Trailing Annual Dividend Yield')])[1]/following::td[1]")
+NEXT_DIVIDEND_SPAN = etree.XPath(f"(//div[{_has_class('dividend')}][contains(., 'Прогноз дивиденда')])[1]//span[1]")
+RECORD_DATE_SPAN = etree.XPath(
+    f"(//div[{_has_class('next-dividend-info')}][contains(., 'Дата закрытия реестра')])[1]//span[1]"
+)
+
+
+def _text(element) -> str:
+    return element.text_content().strip()
+
+
+def _last_before(opener, page: str, position: int) -> int:
+    if isinstance(opener, str):
+        return page.rfind(opener, 0, position)
+    start = -1
+    for match in opener.finditer(page, 0, position):
+        start = match.start()
+    return start
+
+
+def table_section(page: str, anchor: re.Pattern) -> str:
+    """Текст таблицы, внутри открывающего тега которой стоит якорь, или None"""
+    match = anchor.search(page)
+    if match is None:
+        return None
+    start = page.rfind('<table', 0, match.start())
+    end = page.find('</table>', match.end())
+    if start < 0 or end < 0:
+        return None
+    return page[start:end + len('</table>')]
+
+
+def label_section(page: str, label: re.Pattern, opener) -> str:
+    """Участок от ближайшего открывающего тега opener (строка или регулярное выражение)
+    перед подписью до LABEL_WINDOW символов после неё.
+
+    Незакрытые теги в конце участка lxml достраивает сам.
+    """
+    match = label.search(page)
+    if match is None:
+        return None
+    start = _last_before(opener, page, match.start())
+    if start < 0:
+        return None
+    return page[start:match.end() + LABEL_WINDOW]
+
+
+def _fragment(section: str):
+    return html.fromstring(section)
+
+
+def parse_yahoo_history(page: str):
+    """История дивидендов со страницы Yahoo; None, если таблицы нет"""
+    section = table_section(page, YAHOO_HISTORY_RE)
+    if section is None:
+        return None
+    dividends = []
+    for row in TABLE_ROWS(_fragment(section))[1:]:  # Пропускаем заголовок
+        cols = ROW_CELLS(row)
+        if len(cols) == 2:
+            dividends.append({'Date': _text(cols[0]), 'Dividend': _text(cols[1])})
+    return dividends
+
+
+def parse_yahoo_next_dividend(page: str) -> dict:
+    """Следующий дивиденд со страницы котировки Yahoo"""
+    dividend_info = {}
+
+    section = label_section(page, FORWARD_DIVIDEND_RE, '<table')
+    if section is not None:
+        cells = FORWARD_DIVIDEND_CELL(_fragment(section))
+        if cells:
+            parts = _text(cells[0]).split('(')
+            if len(parts) == 2:
+                dividend_info['amount'] = parts[0].strip()
+                dividend_info['yield'] = parts[1].replace(')', '').strip()
+
+    section = label_section(page, EX_DIVIDEND_RE, '<span')
+    if section is not None:
+        values = EX_DIVIDEND_VALUE(_fragment(section))
+        if values:
+            dividend_info['ex_date'] = _text(values[0])
+
+    return dividend_info
+
+
+def parse_yahoo_dividend_yield(page: str) -> str:
+    """Дивидендная доходность со страницы статистики Yahoo"""
+    section = label_section(page, TRAILING_YIELD_RE, '<table')
+    if section is None:
+        return "N/A"
+    values = TRAILING_YIELD_VALUE(_fragment(section))
+    return _text(values[0]) if values else "N/A"
+
+
+def parse_investing_history(page: str):
+    """История дивидендов со страницы investing.com; None, если таблицы нет"""
+    section = table_section(page, INVESTING_HISTORY_RE)
+    if section is None:
+        return None
+    dividends = []
+    for row in TABLE_ROWS(_fragment(section))[1:]:  # Пропускаем заголовок
+        cols = ROW_CELLS(row)
+        if len(cols) >= 5:
+            dividends.append({
+                'Date': _text(cols[0]),
+                'Dividend': _text(cols[1]),
+                'Declaration Date': _text(cols[2]),
+                'Record Date': _text(cols[3]),
+                'Payment Date': _text(cols[4])
+            })
+    return dividends
+
+
+def parse_investing_next_dividend(page: str) -> dict:
+    """Прогноз дивиденда и дата закрытия реестра со страницы акции на investing.com"""
+    dividend_info = {}
+
+    section = label_section(page, NEXT_DIVIDEND_RE, DIVIDEND_DIV_RE)
+    if section is not None:
+        spans = NEXT_DIVIDEND_SPAN(_fragment(section))
+        if spans:
+            dividend_info['amount'] = _text(spans[0])
+
+    section = label_section(page, RECORD_DATE_RE, NEXT_DIVIDEND_DIV_RE)
+    if section is not None:
+        spans = RECORD_DATE_SPAN(_fragment(section))
+        if spans:
+            dividend_info['record_date'] = _text(spans[0])
+
+    return dividend_info
@@ -0,0 +1,206 @@
+"""Данные о дивидендах для бота: постоянный кэш и загрузка со страниц источников.
+
+Запись берётся из DividendCache (bot/dividend_cache.py): SQLite на диске и LRU
+в памяти, срок жизни - до ближайшей даты события, поэтому данные переживают
+перезапуск бота. При промахе страницы Yahoo Finance или investing.com (для
+тикеров .ME) загружаются параллельно через общую сессию aiohttp
+(bot/dividend_http.py) и разбираются bot/dividend_parsers.py. Если страницы
+недоступны или их разметка не распознана, выплаты берутся у провайдера рыночных
+данных (bot/market_data.py). Одновременные промахи по одному тикеру ждут одну
+и ту же загрузку.
+"""
+import asyncio
+import logging
+import re
+from datetime import date, datetime
+
+from bot import config, market_data
+from bot.dividend_cache import DividendCache, parse_date
+from bot.dividend_http import HttpClient
+from bot.dividend_parsers import (
+    parse_investing_history,
+    parse_investing_next_dividend,
+    parse_yahoo_dividend_yield,
+    parse_yahoo_history,
+    parse_yahoo_next_dividend,
+)
+
+FETCH_TIMEOUT = 30.0
+# scrape - страницы источников, провайдер как запасной вариант; provider - только провайдер
+SOURCES = ('scrape', 'provider')
+
+_amount_re = re.compile(r'\d+(?:[.,]\d+)?')
+
+http = HttpClient()
+source = 'scrape'
+_cache = None
+_inflight = {}
+
+
+def get_cache() -> DividendCache:
+    global _cache
+    if _cache is None:
+        _cache = DividendCache(config.DIVIDEND_CACHE_PATH)
+    return _cache
+
+
+def set_cache(cache: DividendCache) -> None:
+    """Подменяет кэш (например, на SQLite в памяти в бенчмарках)"""
+    global _cache
+    _cache = cache
+
+
+def set_source(name: str) -> None:
+    global source
+    if name not in SOURCES:
+        raise ValueError(f"Unknown dividend source: {name}")
+    source = name
+
+
+def is_moex(ticker: str) -> bool:
+    return ticker.upper().endswith('.ME')
+
+
+def yahoo_urls(ticker: str) -> list:
+    """Страницы Yahoo Finance для тикера: история дивидендов, котировка, статистика"""
+    return [
+        f"https://finance.yahoo.com/quote/{ticker}/history?period1=0&period2={int(datetime.now().timestamp())}&interval=div%7Csplit&filter=div&frequency=1d",
+        f"https://finance.yahoo.com/quote/{ticker}",
+        f"https://finance.yahoo.com/quote/{ticker}/key-statistics",
+    ]
+
+
+def investing_urls(ticker: str) -> list:
+    """Страницы investing.com для тикера без суффикса .ME: история дивидендов и карточка акции"""
+    return [
+        f"https://ru.investing.com/equities/{ticker.lower()}-dividends",
+        f"https://ru.investing.com/equities/{ticker.lower()}",
+    ]
+
+
+def parse_optional(parser, page, default, what: str):
+    """Разбор второстепенной страницы: при ошибке загрузки или разбора - значение по умолчанию"""
+    if isinstance(page, Exception):
+        logging.warning(f"Error getting {what}: {page}")
+        return default
+    try:
+        return parser(page)
+    except Exception as e:
+        logging.warning(f"Error getting {what}: {e}")
+        return default
+
+
+async def fetch_foreign_dividends(ticker: str):
+    """Все три страницы Yahoo запрашиваются параллельно; None, если истории на странице нет"""
+    history_page, quote_page, stats_page = await http.get_many(yahoo_urls(ticker))
+    if isinstance(history_page, Exception):
+        raise history_page
+
+    dividends = parse_yahoo_history(history_page)
+    if dividends is None:
+        return None
+    return {
+        'dividends': dividends,
+        'next_dividend': parse_optional(parse_yahoo_next_dividend, quote_page, {}, "next dividend"),
+        'dividend_yield': parse_optional(parse_yahoo_dividend_yield, stats_page, "N/A", "dividend yield"),
+    }
+
+
+async def fetch_russian_dividends(ticker: str):
+    """Обе страницы investing.com запрашиваются параллельно; None, если истории на странице нет"""
+    history_page, quote_page = await http.get_many(investing_urls(ticker.upper().removesuffix('.ME')))
+    if isinstance(history_page, Exception):
+        raise history_page
+
+    dividends = parse_investing_history(history_page)
+    if dividends is None:
+        return None
+    return {
+        'dividends': dividends,
+        'next_dividend': parse_optional(parse_investing_next_dividend, quote_page, {}, "next Russian dividend"),
+    }
+
+
+async def fetch(ticker: str) -> dict:
+    """Свежие данные мимо кэша: страницы источника, а при неудаче - провайдер"""
+    if source == 'scrape':
+        scrape = fetch_russian_dividends if is_moex(ticker) else fetch_foreign_dividends
+        try:
+            data = await scrape(ticker)
+        except Exception as e:
+            logging.warning(f"Dividend pages for {ticker} failed: {e!r}")
+            data = None
+        if data is not None:
+            return data
+        logging.info(f"Falling back to market data provider for {ticker} dividends")
+    return {'dividends': await market_data.get_dividends(ticker)}
+
+
+def cached(ticker: str):
+    """Данные из постоянного кэша без обращения к сети или None"""
+    return get_cache().get(ticker)
+
+
+async def get_dividends(ticker: str, timeout: float = FETCH_TIMEOUT) -> dict:
+    """Данные из кэша или от источника; одновременные промахи по тикеру объединяются"""
+    data = get_cache().get(ticker)
+    if data is not None:
+        return data
+    task = _inflight.get(ticker)
+    if task is None:
+        task = _inflight[ticker] = asyncio.ensure_future(_load(ticker, timeout))
+        task.add_done_callback(lambda done: _inflight.pop(ticker, None) if _inflight.get(ticker) is done else None)
+    # shield: отмена одного ожидающего не должна отменять общую загрузку
+    return await asyncio.shield(task)
+
+
+async def _load(ticker: str, timeout: float) -> dict:
+    data = await asyncio.wait_for(fetch(ticker), timeout)
+    # Запись в SQLite с commit - в потоке, чтобы не задерживать event loop
+    await asyncio.to_thread(get_cache().put, ticker, data)
+    return data
+
+
+def payments(data: dict) -> list:
+    """Выплаты в формате провайдера ({'Date': 'YYYY-MM-DD', 'Dividend': float}) из записи кэша.
+
+    Страницы дают даты в своих форматах и суммы строками ('0.25 Dividend', '33,30'),
+    провайдер - уже готовые значения; нераспознанные строки пропускаются.
+    """
+    result = []
+    for dividend in data.get('dividends') or ():
+        day = parse_date(dividend.get('Date'))
+        amount = dividend.get('Dividend')
+        if not isinstance(amount, (int, float)):
+            match = _amount_re.search(str(amount or ''))
+            amount = float(match.group().replace(',', '.')) if match else None
+        if day is not None and amount is not None:
+            result.append({'Date': day.date().isoformat(), 'Dividend': float(amount)})
+    return result
+
+
+def announced_date(data: dict, today: date = None):
+    """Объявленная дата следующей выплаты (экс-дивидендная или закрытия реестра) в ISO или None"""
+    today = today or date.today()
+    next_dividend = data.get('next_dividend') or {}
+    for key in ('ex_date', 'record_date'):
+        day = parse_date(next_dividend.get(key))
+        if day is not None and day.date() >= today:
+            return day.date().isoformat()
+    return None
+
+
+def stats() -> dict:
+    return {
+        **get_cache().stats(),
+        'source': source,
+        'inflight': len(_inflight),
+        'http_requests': http.requests,
+        'http_retried': http.retried,
+    }
+
+
+async def close() -> None:
+    await http.close()
+    if _cache is not None:
+        _cache.close()
@@ -0,0 +1,154 @@
+"""Меню "💰 Дивиденды": история выплат, доходность и прогноз следующей выплаты.
+
+Перенос hw/dividend_bot.py на общий стек бота. Выплаты берёт
+bot/dividend_sources.py: постоянный кэш с календарным сроком жизни, а при
+промахе - асинхронная загрузка страниц источника в том же event loop, поэтому
+медленный ответ сайта не блокирует других пользователей. Цена для доходности -
+из общего кэша котировок (bot/market_data.py). Выбор пользователя хранится
+в FSM, а не в глобальном dict.
+"""
+import asyncio
+import logging
+from datetime import date, timedelta
+
+from aiogram import Bot, F, Router, types
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+
+from bot import dividend_sources, market_data
+from bot.providers import DEFAULT_CURRENCY
+from bot.render_cache import tickers_kb
+from bot.states import StockStates
+from bot.ticker_registry import get_registry
+
+DIVIDEND_TIMEOUT = 20.0
+# По скольким последним выплатам считается периодичность
+CADENCE_PAYMENTS = 8
+CONSISTENCY_YEARS = 5
+RECENT_PAYMENTS = 5
+
+router = Router()
+
+
+def summarize(ticker: str, payments: list, price: float = None, today: date = None, announced: str = None,
+              currency: str = DEFAULT_CURRENCY) -> dict:
+    """Сводка по выплатам провайдера (от новых к старым, 'Date' в ISO-формате).
+
+    announced - объявленная дата следующей выплаты; она важнее прогноза по интервалам.
+    """
+    today = today or date.today()
+    payments = sorted(
+        ((date.fromisoformat(p['Date']), float(p['Dividend'])) for p in payments),
+        reverse=True,
+    )
+    info = {
+        'ticker': ticker,
+        'currency': currency,
+        'price': price,
+        'payments': [(day.isoformat(), amount) for day, amount in payments],
+        'trailing': sum(amount for day, amount in payments if day > today - timedelta(days=365)),
+        'yield': None,
+        'per_year': 0,
+        'next_date': None,
+        'consistency': 0.0,
+    }
+    if price and info['trailing']:
+        info['yield'] = info['trailing'] / price
+
+    recent = [day for day, _ in payments[:CADENCE_PAYMENTS]]
+    if len(recent) >= 2:
+        interval = (recent[0] - recent[-1]).days / (len(recent) - 1)
+        if interval > 0:
+            info['per_year'] = max(1, round(365 / interval))
+            next_date = recent[0] + timedelta(days=round(interval))
+            # Пропущенные выплаты не сдвигают прогноз в прошлое
+            while next_date <= today:
+                next_date += timedelta(days=round(interval))
+            if next_date - recent[0] <= timedelta(days=2 * interval):
+                info['next_date'] = next_date.isoformat()
+    if announced is not None and date.fromisoformat(announced) > today:
+        info['next_date'] = announced
+
+    years = {day.year for day, _ in payments}
+    info['consistency'] = sum(today.year - i in years for i in range(1, CONSISTENCY_YEARS + 1)) / CONSISTENCY_YEARS
+    return info
+
+
+async def get_dividend_info(ticker: str):
+    """Сводка по данным из кэша или от источника; None, если источник не ответил"""
+    try:
+        data, price, currency = await asyncio.gather(
+            dividend_sources.get_dividends(ticker, timeout=DIVIDEND_TIMEOUT),
+            market_data.get_real_stock_price(ticker),
+            market_data.get_currency(ticker),
+        )
+        return summarize(
+            ticker, dividend_sources.payments(data), price,
+            announced=dividend_sources.announced_date(data), currency=currency,
+        )
+    except asyncio.TimeoutError:
+        logging.warning(f"Timeout getting dividends for {ticker}")
+    except Exception as e:
+        logging.error(f"Error getting dividends for {ticker}: {e}")
+    return None
+
+
+def format_dividends(info: dict) -> str:
+    ticker, currency = info['ticker'], info['currency']
+    if not info['payments']:
+        return f"💰 <b>{ticker}</b> не выплачивает дивиденды"
+
+    lines = [f"💰 <b>Дивиденды {ticker}</b>\n"]
+    if info['price']:
+        lines.append(f"Цена: <b>{info['price']:.2f} {currency}</b>")
+    trailing = f"Выплаты за 12 мес.: <b>{info['trailing']:.2f} {currency}</b>"
+    if info['yield'] is not None:
+        trailing += f" ({info['yield'] * 100:.2f}%)"
+    lines.append(trailing)
+    if info['per_year']:
+        lines.append(f"Выплат в год: {info['per_year']}")
+    if info['next_date']:
+        lines.append(f"Следующая выплата (прогноз): {date.fromisoformat(info['next_date']):%d.%m.%Y}")
+    lines.append(f"Платил в {info['consistency'] * CONSISTENCY_YEARS:.0f} из {CONSISTENCY_YEARS} последних лет")
+
+    lines.append(f"\n<b>Последние {min(RECENT_PAYMENTS, len(info['payments']))} выплат:</b>")
+    for day, amount in info['payments'][:RECENT_PAYMENTS]:
+        lines.append(f"{date.fromisoformat(day):%d.%m.%Y}: {amount:.4g} {currency}")
+    return "\n".join(lines)
+
+
+async def send_dividends(bot: Bot, chat_id: int, ticker: str) -> None:
+    info = await get_dividend_info(ticker)
+    if info is None:
+        await bot.send_message(chat_id=chat_id, text=f"❌ Не удалось получить дивиденды {ticker}")
+        return
+    await bot.send_message(chat_id=chat_id, text=format_dividends(info))
+
+
+@router.message(F.text == "💰 Дивиденды")
+async def start_dividends(message: types.Message, state: FSMContext):
+    await state.set_state(StockStates.waiting_for_dividend_ticker)
+    await message.answer(
+        "Выберите акцию или введите тикер, чтобы узнать о дивидендах.\n"
+        "Рейтинг по доходности для многих тикеров сразу: /screener",
+        reply_markup=tickers_kb()
+    )
+
+
+@router.message(StockStates.waiting_for_dividend_ticker)
+async def process_dividend_ticker(message: types.Message, bot: Bot):
+    # Состояние не сбрасываем: можно смотреть несколько тикеров подряд до "❌ Отмена"
+    ticker = get_registry().resolve(message.text or '')
+    if ticker is None:
+        await message.answer("❌ Тикер не найден. Выберите из списка ниже:")
+        return
+    await send_dividends(bot, message.chat.id, ticker)
+
+
+@router.message(Command("dividends"))
+async def cmd_dividends(message: types.Message, command: CommandObject, bot: Bot):
+    ticker = get_registry().resolve(command.args or '') if command.args else None
+    if ticker is None:
+        await message.answer("Формат: <code>/dividends AAPL</code>")
+        return
+    await send_dividends(bot, message.chat.id, ticker)
@@ -1,42 +1,42 @@
+import asyncio
 import random
-import yfinance as yf
+import re
 from aiogram import F, Bot, Router, types
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
-from aiogram.types import KeyboardButton
 
-from bot.keyboards import main_kb
+from bot import charts, dividend_sources
+from bot.history_store import get_store
+from bot.market_data import (
+    cache_stats,
+    currency,
+    get_currencies,
+    get_currency,
+    get_real_stock_prices,
+    get_stock_data,
+    get_stocks_data,
+)
+from bot.sender import NOTIFICATION, priority, scheduler
+from bot.render_cache import cancel_kb, help_kb, main_kb, ticker_symbols, tickers_kb, tickers_list_text
 from bot.states import StockStates
-from bot.stocks_data import TICKERS
+from bot.stocks_data import COMPARISON_STOCKS, TICKERS
+from bot.ticker_registry import get_registry
 
 import logging
 logging.basicConfig(level=logging.DEBUG)
 
 router = Router()
 
-def tickers_kb():
-    builder = ReplyKeyboardBuilder()
-    for ticker in TICKERS.keys():
-        builder.add(KeyboardButton(text=ticker))
-    builder.add(KeyboardButton(text="❌ Отмена"))
-    builder.adjust(4)
-    return builder.as_markup(resize_keyboard=True)
-
 @router.message(lambda message: message.text == '📋 Список акций')
 async def show_tickers(message: types.Message):
-    tickers_list = "\n".join(
-        [f"<b>{ticker}</b> - {data['name']} ({data['description']})" 
-         for ticker, data in TICKERS.items()]
-    )
     await message.answer(
-        "📊 <b>Популярные тикеры:</b>\n\n" + tickers_list,
+        tickers_list_text(),
         reply_markup=main_kb()
     )
 
 @router.message(F.text == "📜 Исторический факт")
 async def random_fact(message: types.Message):
-    ticker = random.choice(list(TICKERS.keys()))
+    ticker = random.choice(ticker_symbols())
     fact = random.choice(TICKERS[ticker]["facts"])
     
     await message.answer(
@@ -53,20 +53,13 @@ async def cmd_start(message: types.Message):
     )
 
 ADMIN_ID = 1371735198
-ADMIN_USERNAME = 'maryana_avdeenko1'
 
 @router.message(F.text == "🆘 Помощь")
 async def help_command(message: types.Message, bot: Bot):
-    builder = InlineKeyboardBuilder()
-    builder.button(
-        text="💬 Написать администратору", 
-        url=f"https://t.me/{ADMIN_USERNAME}"
-    )
-    
     await message.answer(
         "✉️ <b>Связь с администратором</b>\n\n"
         "Нажмите кнопку ниже, чтобы написать администратору:",
-        reply_markup=builder.as_markup(),
+        reply_markup=help_kb(),
         parse_mode="HTML"
     )
     
@@ -74,19 +67,35 @@ async def help_command(message: types.Message, bot: Bot):
     user_profile = f"@{user.username}" if user.username else f"[Пользователь](tg://user?id={user.id})"
     
     try:
-        await bot.send_message(
-            chat_id=ADMIN_ID,
-            text=f"🆘 Пользователь запросил помощь:\n"
-                 f"ID: {user.id}\n"
-                 f"Имя: {user.full_name}\n"
-                 f"Профиль: {user_profile}\n"
-                 f"Напишите ему: [ссылка](tg://user?id={user.id})",
-            parse_mode="Markdown",
-            disable_web_page_preview=True
-        )
+        with priority(NOTIFICATION):
+            await bot.send_message(
+                chat_id=ADMIN_ID,
+                text=f"🆘 Пользователь запросил помощь:\n"
+                     f"ID: {user.id}\n"
+                     f"Имя: {user.full_name}\n"
+                     f"Профиль: {user_profile}\n"
+                     f"Напишите ему: [ссылка](tg://user?id={user.id})",
+                parse_mode="Markdown",
+                disable_web_page_preview=True
+            )
     except Exception as e:
         logging.error(f"Ошибка уведомления администратора: {e}")
     
+@router.message(Command("stats"), F.from_user.id == ADMIN_ID)
+async def stats_command(message: types.Message):
+    await message.answer(
+        "📈 <b>Кэш котировок</b>\n" +
+        "\n".join(f"{name}: {value}" for name, value in cache_stats().items()) +
+        "\n\n📤 <b>Очередь отправки</b>\n" +
+        "\n".join(f"{name}: {value}" for name, value in scheduler.stats().items()) +
+        "\n\n🗄 <b>История</b>\n" +
+        "\n".join(f"{name}: {value}" for name, value in get_store().stats().items()) +
+        "\n\n📉 <b>Графики</b>\n" +
+        "\n".join(f"{name}: {value}" for name, value in charts.service.stats().items()) +
+        "\n\n💰 <b>Дивиденды</b>\n" +
+        "\n".join(f"{name}: {value}" for name, value in dividend_sources.stats().items())
+    )
+
 @router.message(lambda message: message.text == "❌ Отмена")
 async def cmd_cancel(message: types.Message, state: FSMContext):
     await state.clear()
@@ -100,66 +109,36 @@ async def ask_stock_symbol(message: types.Message, state: FSMContext):
         reply_markup=tickers_kb()
     )
 
-async def get_real_stock_price(ticker: str) -> float:
-    try:
-        stock = yf.Ticker(ticker)
-        data = stock.history(period="1d")
-        
-        if data.empty:
-            logging.warning(f"No data for {ticker}")
-            return None
-        
-        return data['Close'].iloc[-1]
-    
-    except Exception as e:
-        logging.error(f"Error getting price for {ticker}: {e}")
-        return None
+def format_stock_price(ticker: str, stock_data: dict, currency_code: str = None) -> str:
+    currency_code = currency_code or currency(ticker)
+    current_price = stock_data['current_price']
+    previous_close = stock_data['previous_close']
+    change = current_price - previous_close
+    change_percent = (change / previous_close) * 100
 
-async def get_stock_data(ticker: str):
-    try:
-        stock = yf.Ticker(ticker)
-        data = stock.history(period="1d")
-        
-        if data.empty:
-            logging.warning(f"No data for {ticker}")
-            return None
-            
-        current_price = data['Close'].iloc[-1]
-        previous_close = data['Close'].iloc[0] if len(data) > 1 else current_price
-        
-        return {
-            'current_price': current_price,
-            'previous_close': previous_close
-        }
-    
-    except Exception as e:
-        logging.error(f"Error getting data for {ticker}: {e}")
-        return None
+    return (
+        f"<b>📊 {ticker}</b>\n"
+        f"Цена: <b>{current_price:.2f} {currency_code}</b>\n"
+        f"Изменение: <b>{change:.2f} ({change_percent:.2f}%)</b>"
+    )
 
 @router.message(StockStates.waiting_for_ticker_selection)
 async def show_selected_stock_price(message: types.Message, state: FSMContext):
-    ticker = message.text.upper()
+    ticker = get_registry().resolve(message.text or '')
     
-    if ticker not in TICKERS:
+    if ticker is None:
         await message.answer("❌ Тикер не найден. Выберите из списка ниже:")
         return
         
-    stock_data = await get_stock_data(ticker)
+    stock_data, currency_code = await asyncio.gather(get_stock_data(ticker), get_currency(ticker))
     
     if stock_data is None:
         await message.answer("❌ Не удалось получить данные по акции", reply_markup=main_kb())
         await state.clear()
         return
         
-    current_price = stock_data['current_price']
-    previous_close = stock_data['previous_close']
-    change = current_price - previous_close
-    change_percent = (change / previous_close) * 100
-        
     await message.answer(
-        f"<b>📊 {ticker}</b>\n"
-        f"Цена: <b>{current_price:.2f} USD</b>\n"
-        f"Изменение: <b>{change:.2f} ({change_percent:.2f}%)</b>",
+        format_stock_price(ticker, stock_data, currency_code),
         reply_markup=main_kb()
     )
     await state.clear()
@@ -174,9 +153,9 @@ async def start_compare(message: types.Message, state: FSMContext):
 
 @router.message(StockStates.waiting_for_first_ticker)
 async def process_first_ticker(message: types.Message, state: FSMContext):
-    ticker = message.text.upper()
+    ticker = get_registry().resolve(message.text or '')
     
-    if ticker not in TICKERS:
+    if ticker is None:
         await message.answer("❌ Тикер не найден. Выберите из списка ниже:")
         return
         
@@ -189,9 +168,9 @@ async def process_first_ticker(message: types.Message, state: FSMContext):
 
 @router.message(StockStates.waiting_for_second_ticker)
 async def process_second_ticker(message: types.Message, state: FSMContext):
-    ticker = message.text.upper()
+    ticker = get_registry().resolve(message.text or '')
     
-    if ticker not in TICKERS:
+    if ticker is None:
         await message.answer("❌ Тикер не найден. Выберите из списка ниже:")
         return
         
@@ -202,24 +181,88 @@ async def process_second_ticker(message: types.Message, state: FSMContext):
         await message.answer("❌ Вы выбрали ту же акцию. Пожалуйста, выберите другую:")
         return
     
-    price_a = await get_real_stock_price(first_ticker)
-    price_b = await get_real_stock_price(ticker)
+    prices, currencies = await asyncio.gather(
+        get_real_stock_prices([first_ticker, ticker]),
+        get_currencies([first_ticker, ticker]),
+    )
+    currency_a = currencies[first_ticker]
+    currency_b = currencies[ticker]
+    price_a = prices[first_ticker]
+    price_b = prices[ticker]
     
     if price_a is None or price_b is None:
         await message.answer("❌ Не удалось получить данные для сравнения", reply_markup=main_kb())
         await state.clear()
         return
         
-    difference = abs(price_a - price_b)
-    change_percent = (difference / min(price_a, price_b)) * 100
+    if currency_a == currency_b:
+        difference = abs(price_a - price_b)
+        change_percent = (difference / min(price_a, price_b)) * 100
+        summary = f"📊 Разница: <b>{difference:.2f} {currency_a} ({change_percent:.2f}%)</b>"
+    else:
+        # Цены в разных валютах напрямую не сравниваются
+        summary = f"📊 Разница не считается: цены в разных валютах ({currency_a}, {currency_b})"
     
     await message.answer(
         f"⚔️ <b>Сравнение акций:</b>\n\n"
-        f"{first_ticker}: <b>{price_a:.2f}$</b>\n"
-        f"{ticker}: <b>{price_b:.2f}$</b>\n\n"
-        f"📊 Разница: <b>{difference:.2f}$ ({change_percent:.2f}%)</b>",
+        f"{first_ticker}: <b>{price_a:.2f} {currency_a}</b>\n"
+        f"{ticker}: <b>{price_b:.2f} {currency_b}</b>\n\n"
+        f"{summary}",
         parse_mode="HTML",
         reply_markup=main_kb()
     )
     
-    await state.clear()
\ No newline at end of file
+    await state.clear()
+
+MIN_COMPARE = 2
+MAX_COMPARE = 10
+
+@router.message(F.text == "📊 Сравнить несколько")
+async def start_multi_compare(message: types.Message, state: FSMContext):
+    await state.set_state(StockStates.waiting_for_multi_tickers)
+    await message.answer(
+        f"Введите от {MIN_COMPARE} до {MAX_COMPARE} тикеров через пробел или запятую.\n"
+        f"Доступные: {', '.join(COMPARISON_STOCKS)}",
+        reply_markup=cancel_kb()
+    )
+
+@router.message(StockStates.waiting_for_multi_tickers)
+async def process_multi_tickers(message: types.Message, state: FSMContext):
+    queries = [q for q in re.split(r"[\s,;]+", message.text or '') if q]
+    registry = get_registry()
+    resolved = {q: registry.resolve(q) for q in queries}
+    tickers = list(dict.fromkeys(t for t in resolved.values() if t in COMPARISON_STOCKS))
+    unknown = [q for q, t in resolved.items() if t not in COMPARISON_STOCKS]
+
+    if unknown:
+        await message.answer(f"❌ Тикер не найден: {', '.join(unknown)}. Попробуйте ещё раз:")
+        return
+    if not MIN_COMPARE <= len(tickers) <= MAX_COMPARE:
+        await message.answer(f"❌ Нужно от {MIN_COMPARE} до {MAX_COMPARE} разных тикеров. Попробуйте ещё раз:")
+        return
+
+    stocks, currencies = await asyncio.gather(get_stocks_data(tickers), get_currencies(tickers))
+    missing = [t for t, data in stocks.items() if data is None]
+    if len(missing) == len(tickers):
+        await message.answer("❌ Не удалось получить данные для сравнения", reply_markup=main_kb())
+        await state.clear()
+        return
+
+    ranking = []
+    for ticker, data in stocks.items():
+        if data is None:
+            continue
+        change_percent = (data['current_price'] - data['previous_close']) / data['previous_close'] * 100
+        ranking.append((change_percent, ticker, data['current_price']))
+    ranking.sort(reverse=True)
+
+    lines = [
+        f"{place}. {ticker}: <b>{price:.2f} {currencies[ticker]}</b> ({change_percent:+.2f}%)"
+        for place, (change_percent, ticker, price) in enumerate(ranking, start=1)
+    ]
+    text = "🏆 <b>Рейтинг по изменению за день:</b>\n\n" + "\n".join(lines)
+    if missing:
+        text += f"\n\nНет данных: {', '.join(missing)}"
+
+    await message.answer(text, reply_markup=main_kb())
+    await state.clear()
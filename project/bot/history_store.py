@@ -0,0 +1,200 @@
+"""Локальное колоночное хранилище дневной истории (OHLCV).
+
+Для каждого тикера - отдельный каталог, в нём по бинарному файлу на колонку:
+timestamp.bin (int64, секунды UTC) и open/high/low/close/volume.bin (float64).
+Файлы дописываются: refresh запрашивает у источника бары начиная с последнего
+сохранённого и добавляет новые в конец. Последний бар может быть снят во время
+торговой сессии, поэтому бар с той же датой перезаписывается на месте: файл
+не укорачивается, и открытые memmap остаются целы. Чтение идёт через np.memmap,
+поэтому срезы для графиков и аналитики не копируют данные и не ходят в сеть.
+
+Сначала дописываются ценовые колонки, последним - timestamp; при чтении
+берётся минимальная длина колонок, так что оборванная запись не ломает данные.
+"""
+import asyncio
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from bot import config, market_data
+from bot.providers import HISTORY_FIELDS
+
+HISTORY_PERIOD = '5y'
+HISTORY_REFRESH_INTERVAL = 6 * 60 * 60.0
+WARMUP_CONCURRENCY = 8
+
+DTYPES = {field: np.dtype('<f8') for field in HISTORY_FIELDS}
+DTYPES['timestamp'] = np.dtype('<i8')
+# timestamp пишется последним - он подтверждает, что строка записана целиком
+WRITE_ORDER = [field for field in HISTORY_FIELDS if field != 'timestamp'] + ['timestamp']
+
+
+def _empty() -> dict:
+    return {field: np.empty(0, dtype=DTYPES[field]) for field in HISTORY_FIELDS}
+
+
+class HistoryStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self._views = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _dir(self, ticker: str) -> Path:
+        name = ticker.upper()
+        # Тикер становится именем каталога: никаких разделителей пути, '.' и '..'
+        if not name or name.startswith('.') or '/' in name or '\\' in name:
+            raise ValueError(f"Invalid ticker for history store: {ticker!r}")
+        return self.root / name
+
+    def _ticker_lock(self, ticker: str) -> asyncio.Lock:
+        lock = self._locks.get(ticker)
+        if lock is None:
+            self._locks[ticker] = lock = asyncio.Lock()
+        return lock
+
+    def tickers(self) -> list:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if (path / 'timestamp.bin').exists())
+
+    def read(self, ticker: str) -> dict:
+        """Все бары тикера: словарь колонок-memmap (только чтение), без копирования"""
+        with self._lock:
+            views = self._views.get(ticker)
+            if views is None:
+                views = self._views[ticker] = self._map(ticker)
+            return views
+
+    def _map(self, ticker: str) -> dict:
+        directory = self._dir(ticker)
+        sizes = {}
+        for field in HISTORY_FIELDS:
+            path = directory / f'{field}.bin'
+            sizes[field] = path.stat().st_size // DTYPES[field].itemsize if path.exists() else 0
+        rows = min(sizes.values())
+        if rows == 0:
+            return _empty()
+        return {
+            field: np.memmap(directory / f'{field}.bin', dtype=DTYPES[field], mode='r', shape=(rows,))
+            for field in HISTORY_FIELDS
+        }
+
+    def rows(self, ticker: str) -> int:
+        return len(self.read(ticker)['timestamp'])
+
+    def last_timestamp(self, ticker: str):
+        timestamps = self.read(ticker)['timestamp']
+        return int(timestamps[-1]) if len(timestamps) else None
+
+    def window(self, ticker: str, start: int = None, end: int = None) -> dict:
+        """Бары с start <= timestamp < end; срез memmap, а не копия"""
+        data = self.read(ticker)
+        timestamps = data['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return {field: column[lo:hi] for field, column in data.items()}
+
+    def tail(self, ticker: str, bars: int) -> dict:
+        data = self.read(ticker)
+        return {field: column[-bars:] if bars else column[:0] for field, column in data.items()}
+
+    def append(self, ticker: str, history: dict) -> int:
+        """Дописывает бары новее последнего сохранённого и обновляет последний, если он
+        пришёл снова; возвращает число добавленных"""
+        timestamps = np.asarray(history.get('timestamp', ()), dtype=DTYPES['timestamp'])
+        if not len(timestamps):
+            return 0
+        last = self.last_timestamp(ticker)
+        # Источник может вернуть пересекающийся диапазон или неотсортированные бары
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[1:] = timestamps[1:] != timestamps[:-1]
+        if last is not None:
+            # Последний бар мог быть незавершённым - его берём заново
+            keep &= timestamps >= last
+        if not keep.any():
+            return 0
+
+        columns = {'timestamp': timestamps[keep]}
+        for field in HISTORY_FIELDS[1:]:
+            values = np.asarray(history[field], dtype=DTYPES[field])[order]
+            columns[field] = values[keep]
+
+        directory = self._dir(ticker)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            stored = self._map(ticker)['timestamp']
+            rows = len(stored)
+            start = rows - 1 if rows and stored[-1] == columns['timestamp'][0] else rows
+            for field in WRITE_ORDER:
+                path = directory / f'{field}.bin'
+                with open(path, 'r+b' if path.exists() else 'wb') as f:
+                    # Обрезаем хвост от оборванной прошлой записи
+                    f.truncate(rows * DTYPES[field].itemsize)
+                    f.seek(start * DTYPES[field].itemsize)
+                    f.write(columns[field].tobytes())
+            self._views.pop(ticker, None)
+        return len(columns['timestamp']) - (rows - start)
+
+    async def refresh(self, ticker: str) -> int:
+        """Догружает бары с последнего сохранённого; при пустом хранилище - историю за HISTORY_PERIOD"""
+        async with self._ticker_lock(ticker):
+            last = self.last_timestamp(ticker)
+            if last is None:
+                history = await market_data.get_history(ticker, HISTORY_PERIOD)
+            else:
+                history = await market_data.get_history(ticker, HISTORY_PERIOD, start=last)
+            return await asyncio.to_thread(self.append, ticker, history)
+
+    async def warm_up(self, tickers: list, concurrency: int = WARMUP_CONCURRENCY) -> dict:
+        """Параллельно обновляет все тикеры; ошибки отдельных тикеров не прерывают прогрев"""
+        slots = asyncio.Semaphore(concurrency)
+
+        async def refresh_one(ticker):
+            async with slots:
+                try:
+                    return await self.refresh(ticker)
+                except Exception as e:
+                    logging.warning(f"History refresh failed for {ticker}: {e}")
+                    return None
+
+        added = await asyncio.gather(*(refresh_one(ticker) for ticker in tickers))
+        return dict(zip(tickers, added))
+
+    async def run(self, tickers: list, interval: float = HISTORY_REFRESH_INTERVAL) -> None:
+        """Фоновая задача: периодически дописывает новые бары"""
+        while True:
+            added = await self.warm_up(tickers)
+            failed = sum(1 for count in added.values() if count is None)
+            logging.info(
+                f"History refreshed: {sum(count or 0 for count in added.values())} new bars, "
+                f"{failed} failed"
+            )
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        tickers = self.tickers()
+        return {
+            'history_tickers': len(tickers),
+            'history_bars': sum(self.rows(ticker) for ticker in tickers),
+        }
+
+
+_store = None
+
+
+def get_store() -> HistoryStore:
+    global _store
+    if _store is None:
+        _store = HistoryStore(config.HISTORY_DIR)
+    return _store
+
+
+def set_store(store: HistoryStore) -> None:
+    """Подменяет хранилище (например, на временный каталог в бенчмарках)"""
+    global _store
+    _store = store
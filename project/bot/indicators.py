@@ -0,0 +1,129 @@
+"""Технические индикаторы на NumPy без циклов Python по барам.
+
+Все функции принимают массив цен формы (бары,) или (тикеры, бары) и считают
+по последней оси, поэтому вся вселенная тикеров обрабатывается одним проходом.
+Там, где значения ещё нет (начало ряда короче окна), стоит NaN.
+"""
+import numpy as np
+
+TRADING_DAYS = 252
+# Предел показателя степени затухания в ewm: d**-n не больше e**EWM_BLOCK_LOG
+EWM_BLOCK_LOG = 200.0
+
+
+def _pad_front(values: np.ndarray, length: int) -> np.ndarray:
+    """Дополняет начало последней оси NaN до длины length"""
+    missing = length - values.shape[-1]
+    pad = np.full(values.shape[:-1] + (missing,), np.nan)
+    return np.concatenate([pad, values], axis=-1)
+
+
+def sma(prices, window: int) -> np.ndarray:
+    prices = np.asarray(prices, dtype=float)
+    length = prices.shape[-1]
+    if window > length:
+        return np.full(prices.shape, np.nan)
+    csum = np.cumsum(prices, axis=-1)
+    sums = csum[..., window - 1:].copy()
+    sums[..., 1:] -= csum[..., :-window]
+    return _pad_front(sums / window, length)
+
+
+def ewm(values, alpha: float) -> np.ndarray:
+    """Экспоненциальное сглаживание y[t] = (1 - alpha) * y[t-1] + alpha * x[t], y[0] = x[0].
+
+    Рекурсия раскрыта в накопленную сумму x[i] * d**-i, умноженную на d**t
+    (d = 1 - alpha). Чтобы степени не переполнялись, ряд режется на блоки длиной
+    EWM_BLOCK_LOG / -log(d) баров; для дневной истории это обычно один блок.
+    Рассчитано на неотрицательные ряды (цены, приросты, падения).
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[-1]
+    out = np.empty(values.shape)
+    if length == 0:
+        return out
+    decay = 1 - alpha
+    if decay <= 0:
+        out[...] = values
+        return out
+    block = max(1, int(EWM_BLOCK_LOG / -np.log(decay)))
+    previous = values[..., 0]
+    for start in range(0, length, block):
+        chunk = values[..., start:start + block]
+        powers = decay ** np.arange(1, chunk.shape[-1] + 1)
+        sums = np.cumsum(chunk / powers, axis=-1)
+        out[..., start:start + block] = powers * (previous[..., None] + alpha * sums)
+        previous = out[..., start + chunk.shape[-1] - 1]
+    return out
+
+
+def ema(prices, span: int) -> np.ndarray:
+    return ewm(prices, 2 / (span + 1))
+
+
+def rsi(prices, period: int = 14) -> np.ndarray:
+    """RSI Уайлдера: сглаживание приростов и падений с alpha = 1/period"""
+    prices = np.asarray(prices, dtype=float)
+    deltas = np.diff(prices, axis=-1)
+    gains = ewm(np.clip(deltas, 0, None), 1 / period)
+    losses = ewm(np.clip(-deltas, 0, None), 1 / period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = 100 - 100 / (1 + gains / losses)
+    values = np.where(losses == 0, np.where(gains == 0, 50.0, 100.0), values)
+    return _pad_front(values, prices.shape[-1])
+
+
+def log_returns(prices) -> np.ndarray:
+    return np.diff(np.log(np.asarray(prices, dtype=float)), axis=-1)
+
+
+def volatility(prices, window: int = None) -> np.ndarray:
+    """Годовая волатильность логарифмических доходностей за последние window баров"""
+    returns = log_returns(prices)
+    if window is not None:
+        returns = returns[..., -window:]
+    return returns.std(axis=-1, ddof=1) * np.sqrt(TRADING_DAYS)
+
+
+def drawdowns(prices) -> np.ndarray:
+    prices = np.asarray(prices, dtype=float)
+    return prices / np.maximum.accumulate(prices, axis=-1) - 1
+
+
+def max_drawdown(prices) -> np.ndarray:
+    """Наибольшее падение от предыдущего максимума, доля (отрицательное число)"""
+    return drawdowns(prices).min(axis=-1)
+
+
+def correlation(prices) -> np.ndarray:
+    """Матрица корреляций дневных логарифмических доходностей, prices - (тикеры, бары)"""
+    return np.corrcoef(log_returns(prices))
+
+
+def align(columns: list) -> tuple:
+    """Выравнивает ряды разных тикеров по общим датам.
+
+    columns - список пар (timestamps, closes); возвращает общие timestamps и
+    матрицу цен формы (тикеры, бары).
+    """
+    common = columns[0][0]
+    for timestamps, _ in columns[1:]:
+        common = np.intersect1d(common, timestamps, assume_unique=True)
+    matrix = np.empty((len(columns), len(common)))
+    for row, (timestamps, closes) in enumerate(columns):
+        matrix[row] = np.asarray(closes)[np.searchsorted(timestamps, common)]
+    return common, matrix
+
+
+def summary(prices) -> dict:
+    """Индикаторы на последний бар для каждого ряда; prices - (тикеры, бары)"""
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    return {
+        'price': prices[:, -1],
+        'sma20': sma(prices, 20)[:, -1],
+        'sma50': sma(prices, 50)[:, -1],
+        'ema20': ema(prices, 20)[:, -1],
+        'rsi14': rsi(prices, 14)[:, -1],
+        'volatility': volatility(prices, TRADING_DAYS),
+        'max_drawdown': max_drawdown(prices),
+    }
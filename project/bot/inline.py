@@ -0,0 +1,104 @@
+"""Inline-режим: "@bot AAPL" сразу возвращает карточки с ценами.
+
+Цены берутся из снимка опросчика и кэша котировок. Весь ответ, включая debounce,
+поиск и сборку карточек, укладывается в INLINE_BUDGET: на котировки остаётся
+бюджет за вычетом уже прошедшего времени и запаса INLINE_ANSWER_RESERVE. Если не
+успели, карточка уходит без цены, а загрузка продолжается в фоне и попадёт в кэш
+для следующего запроса; ответ с такими карточками Telegram кэширует лишь на
+INLINE_UNPRICED_CACHE_TIME.
+Пока пользователь печатает, отвечаем только на последний запрос (debounce).
+"""
+import asyncio
+import time
+
+from aiogram import Router, types
+from aiogram.types import InlineQueryResultArticle, InputTextMessageContent
+
+from bot import market_data
+from bot.handlers import format_stock_price
+from bot.stocks_data import TICKERS
+from bot.ticker_registry import get_registry
+
+INLINE_RESULTS = 5
+INLINE_DEBOUNCE = 0.15
+INLINE_BUDGET = 0.5
+# Запас на сборку карточек, отправку ответа и задержки event loop под нагрузкой
+INLINE_ANSWER_RESERVE = 0.1
+INLINE_CACHE_TIME = 30
+# Ответ с карточками без цены кэшируется ненадолго, чтобы повторный запрос получил цены
+INLINE_UNPRICED_CACHE_TIME = 1
+
+router = Router()
+
+_latest_query = {}
+_stats = {'answers': 0, 'cards': 0, 'priced': 0}
+
+
+def stats() -> dict:
+    return dict(_stats)
+
+
+def quote_card(ticker: str, stock_data) -> InlineQueryResultArticle:
+    record = get_registry().get(ticker)
+    name = record.name if record else ticker
+    if stock_data is None:
+        return InlineQueryResultArticle(
+            id=ticker,
+            title=f"{ticker} - цена загружается",
+            description=name,
+            input_message_content=InputTextMessageContent(message_text=f"<b>📊 {ticker}</b>\n{name}"),
+        )
+
+    text = format_stock_price(ticker, stock_data)
+    change_percent = (stock_data['current_price'] / stock_data['previous_close'] - 1) * 100
+    return InlineQueryResultArticle(
+        id=ticker,
+        title=f"{ticker}: {stock_data['current_price']:.2f} {market_data.currency(ticker)} ({change_percent:+.2f}%)",
+        description=name,
+        input_message_content=InputTextMessageContent(message_text=text),
+    )
+
+
+async def collect_quotes(tickers: list, budget: float) -> dict:
+    """Котировки из кэша, недостающие - с сетью, но не дольше budget секунд"""
+    quotes = {ticker: market_data.cached_stock_data(ticker) for ticker in tickers}
+    missing = [ticker for ticker, data in quotes.items() if data is None]
+    if missing and budget > 0:
+        tasks = {asyncio.ensure_future(market_data.get_stock_data(ticker)): ticker for ticker in missing}
+        done, _ = await asyncio.wait(tasks, timeout=budget)
+        for task in done:
+            quotes[tasks[task]] = task.result()
+    return quotes
+
+
+@router.inline_query()
+async def inline_quotes(inline_query: types.InlineQuery):
+    started = time.monotonic()
+    user_id = inline_query.from_user.id
+    _latest_query[user_id] = inline_query.id
+
+    await asyncio.sleep(INLINE_DEBOUNCE)
+    if _latest_query.get(user_id) != inline_query.id:
+        # Пользователь уже набрал следующий символ - Telegram покажет ответ на новый запрос
+        return
+
+    query = inline_query.query.strip()
+    if query:
+        tickers = [record.symbol for record in get_registry().search(query, INLINE_RESULTS)]
+    else:
+        tickers = list(TICKERS)[:INLINE_RESULTS]
+
+    budget = INLINE_BUDGET - INLINE_ANSWER_RESERVE - (time.monotonic() - started)
+    quotes = await collect_quotes(tickers, budget)
+    if _latest_query.get(user_id) == inline_query.id:
+        del _latest_query[user_id]
+
+    priced = sum(quotes[ticker] is not None for ticker in tickers)
+    _stats['answers'] += 1
+    _stats['cards'] += len(tickers)
+    _stats['priced'] += priced
+    await inline_query.answer(
+        [quote_card(ticker, quotes[ticker]) for ticker in tickers],
+        cache_time=INLINE_CACHE_TIME if priced == len(tickers) else INLINE_UNPRICED_CACHE_TIME,
+        is_personal=False,
+    )
@@ -1,16 +1,45 @@
-from aiogram.utils.keyboard import ReplyKeyboardBuilder
+from aiogram.types import KeyboardButton
+from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 
 def main_kb():
     builder = ReplyKeyboardBuilder()
     builder.button(text='💵 Цена акции')
     builder.button(text='📋 Список акций')
     builder.button(text='⚖️ Сравнить') 
+    builder.button(text='📊 Сравнить несколько')
+    builder.button(text='📈 Аналитика')
+    builder.button(text='📉 График')
+    builder.button(text='💰 Дивиденды')
     builder.button(text='📜 Исторический факт')
     builder.button(text='🆘 Помощь')
-    builder.adjust(2, 2, 1)
+    builder.adjust(2, 2, 2, 2, 1)
     return builder.as_markup(resize_keyboard=True)
 
 def cancel_kb():
     builder = ReplyKeyboardBuilder()
     builder.button(text='❌ Отмена')
-    return builder.as_markup(resize_keyboard=True)
\ No newline at end of file
+    return builder.as_markup(resize_keyboard=True)
+
+def tickers_kb(tickers):
+    builder = ReplyKeyboardBuilder()
+    for ticker in tickers:
+        builder.add(KeyboardButton(text=ticker))
+    builder.add(KeyboardButton(text="❌ Отмена"))
+    builder.adjust(4)
+    return builder.as_markup(resize_keyboard=True)
+
+def help_kb(admin_username):
+    builder = InlineKeyboardBuilder()
+    builder.button(
+        text="💬 Написать администратору", 
+        url=f"https://t.me/{admin_username}"
+    )
+    return builder.as_markup()
+
+
+def chart_periods_kb(ticker, periods):
+    builder = InlineKeyboardBuilder()
+    for period in periods:
+        builder.button(text=period, callback_data=f"chart:{ticker}:{period}")
+    builder.adjust(len(periods))
+    return builder.as_markup()
@@ -0,0 +1,195 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from bot.providers import MarketDataProvider, YFinanceProvider, exchange_currency
+from bot.quote_cache import PriceSnapshot, QuoteCache
+
+FETCH_WORKERS = 8
+FETCH_TIMEOUT = 10.0
+QUOTE_TTL = 30.0
+QUOTE_STALE_TTL = 300.0
+QUOTE_CACHE_SIZE = 1024
+
+_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='market-data')
+# Не даём очереди пула расти бесконечно: лишние запросы ждут здесь и могут быть отменены
+_slots = asyncio.Semaphore(FETCH_WORKERS * 4)
+
+quote_cache = QuoteCache(ttl=QUOTE_TTL, stale_ttl=QUOTE_STALE_TTL, max_size=QUOTE_CACHE_SIZE)
+# Снимок всей вселенной тикеров от фонового опросчика (bot/poller.py)
+snapshot = PriceSnapshot()
+
+
+provider = YFinanceProvider()
+# Валюта тикера не меняется: запрашиваем её у источника один раз
+_currencies = {}
+
+
+def set_provider(new_provider: MarketDataProvider) -> None:
+    """Подменяет источник данных (например, на FakeProvider для бенчмарков и тестов)"""
+    global provider
+    provider = new_provider
+    quote_cache.invalidate()
+    snapshot.clear()
+    _currencies.clear()
+
+
+def _release_slot(loop: asyncio.AbstractEventLoop) -> None:
+    try:
+        loop.call_soon_threadsafe(_slots.release)
+    except RuntimeError:
+        # Loop уже закрыт при остановке: освобождать слот некому
+        pass
+
+
+async def run_blocking(func, *args, timeout: float = FETCH_TIMEOUT):
+    """Выполняет блокирующую функцию в пуле потоков, не останавливая event loop.
+
+    Слот освобождается, когда поток действительно закончил работу, а не по
+    таймауту: поток с зависшим вызовом yfinance продолжает занимать слот,
+    и реальная параллельность не превышает лимит.
+    """
+    loop = asyncio.get_running_loop()
+    await _slots.acquire()
+    try:
+        future = _executor.submit(partial(func, *args))
+    except BaseException:
+        _slots.release()
+        raise
+    # Срабатывает и при отмене ещё не начатой задачи: тогда поток её не выполнит
+    future.add_done_callback(lambda _: _release_slot(loop))
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+
+async def get_history(ticker: str, period: str = '1y', start: int = None, timeout: float = FETCH_TIMEOUT) -> dict:
+    return await run_blocking(provider.get_history, ticker, period, start, timeout=timeout)
+
+
+async def get_dividends(ticker: str, timeout: float = FETCH_TIMEOUT) -> list:
+    return await run_blocking(provider.get_dividends, ticker, timeout=timeout)
+
+
+async def get_currency(ticker: str, timeout: float = FETCH_TIMEOUT) -> str:
+    """Код валюты тикера; если источник не ответил - по суффиксу биржи (без запоминания)"""
+    currency = _currencies.get(ticker)
+    if currency is not None:
+        return currency
+    try:
+        currency = await run_blocking(provider.get_currency, ticker, timeout=timeout)
+    except Exception as e:
+        logging.warning(f"Error getting currency for {ticker}: {e}")
+        return exchange_currency(ticker)
+    _currencies[ticker] = currency
+    return currency
+
+
+async def get_currencies(tickers: list) -> dict:
+    currencies = await asyncio.gather(*(get_currency(ticker) for ticker in tickers))
+    return dict(zip(tickers, currencies))
+
+
+def currency(ticker: str) -> str:
+    """Валюта тикера без обращения к сети: запомненная или по суффиксу биржи"""
+    return _currencies.get(ticker) or exchange_currency(ticker)
+
+
+async def _load_closes(ticker: str, timeout: float):
+    closes = await run_blocking(provider.get_closes, ticker, timeout=timeout)
+    return closes or None
+
+
+async def get_batch_closes(tickers: list, timeout: float = FETCH_TIMEOUT) -> dict:
+    """Цены закрытия по списку тикеров одним пакетным запросом"""
+    return await run_blocking(provider.get_batch_closes, list(tickers), timeout=timeout)
+
+
+async def prefetch_closes(tickers: list, timeout: float = FETCH_TIMEOUT) -> int:
+    """Загружает в кэш одним пакетным запросом котировки тикеров, которых нет ни в снимке, ни в кэше"""
+    missing = [ticker for ticker in tickers if snapshot.get(ticker) is None and quote_cache.peek(ticker) is None]
+    if not missing:
+        return 0
+    try:
+        quotes = await get_batch_closes(missing, timeout=timeout)
+    except Exception as e:
+        logging.warning(f"Batch prefetch of {len(missing)} quotes failed: {e}")
+        return 0
+    for ticker, closes in quotes.items():
+        quote_cache.put(ticker, closes)
+    return len(quotes)
+
+
+async def get_closes(ticker: str, timeout: float = FETCH_TIMEOUT):
+    """Цены закрытия: сначала из снимка опросчика, затем через кэш с одним запросом на тикер"""
+    closes = snapshot.get(ticker)
+    if closes is not None:
+        return closes
+
+    try:
+        closes = await quote_cache.get(ticker, partial(_load_closes, ticker, timeout))
+    except asyncio.TimeoutError:
+        logging.warning(f"Timeout getting data for {ticker}")
+        return None
+    except Exception as e:
+        logging.error(f"Error getting data for {ticker}: {e}")
+        return None
+
+    if closes is None:
+        logging.warning(f"No data for {ticker}")
+        return None
+    return closes
+
+
+async def get_real_stock_price(ticker: str) -> float:
+    closes = await get_closes(ticker)
+    if closes is None:
+        return None
+    return closes[-1]
+
+
+def _stock_data(closes: list) -> dict:
+    current_price = closes[-1]
+    previous_close = closes[0] if len(closes) > 1 else current_price
+
+    return {
+        'current_price': current_price,
+        'previous_close': previous_close
+    }
+
+
+async def get_stock_data(ticker: str):
+    closes = await get_closes(ticker)
+    if closes is None:
+        return None
+    return _stock_data(closes)
+
+
+def cached_stock_data(ticker: str):
+    """Данные из снимка или кэша (даже устаревшие) без обращения к сети"""
+    closes = snapshot.get(ticker) or quote_cache.peek(ticker)
+    if not closes:
+        return None
+    return _stock_data(closes)
+
+
+async def get_real_stock_prices(tickers: list) -> dict:
+    """Цены по нескольким тикерам параллельно: задержка равна самой медленной котировке"""
+    prices = await asyncio.gather(*(get_real_stock_price(ticker) for ticker in tickers))
+    return dict(zip(tickers, prices))
+
+
+async def get_stocks_data(tickers: list) -> dict:
+    data = await asyncio.gather(*(get_stock_data(ticker) for ticker in tickers))
+    return dict(zip(tickers, data))
+
+
+def cache_stats() -> dict:
+    stats = quote_cache.stats()
+    age = snapshot.age()
+    stats['snapshot_size'] = len(snapshot)
+    stats['snapshot_age'] = 'n/a' if age is None else f"{age:.0f} c"
+    return stats
+
+
+def shutdown() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
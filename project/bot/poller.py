@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, time as dt_time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from bot import market_data
+from bot.stocks_data import COMPARISON_STOCKS, TICKERS
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
+
+MARKET_INTERVAL = 60.0
+OFF_HOURS_INTERVAL = 30 * 60.0
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 10 * 60.0
+
+
+def is_market_open(now: datetime = None) -> bool:
+    """Открыта ли основная сессия NYSE/NASDAQ (праздники не учитываются)"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def seconds_until_open(now: datetime = None) -> float:
+    """Сколько секунд до ближайшего открытия сессии (0, если она уже идёт)"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    if is_market_open(now):
+        return 0.0
+    opening = datetime.combine(now.date(), MARKET_OPEN, tzinfo=MARKET_TZ)
+    if now >= opening:
+        opening += timedelta(days=1)
+    while opening.weekday() >= 5:
+        opening += timedelta(days=1)
+    # Разность в UTC: при общей tzinfo Python вычитает время по часам и теряет час перехода DST
+    return (opening.astimezone(timezone.utc) - now.astimezone(timezone.utc)).total_seconds()
+
+
+def poll_interval(now: datetime = None) -> float:
+    """Пауза до следующего опроса; вне сессии - не дольше, чем до её открытия"""
+    if is_market_open(now):
+        return MARKET_INTERVAL
+    return max(1.0, min(OFF_HOURS_INTERVAL, seconds_until_open(now)))
+
+
+def snapshot_ttl(interval: float, now: datetime = None) -> float:
+    """Срок действия снимка: до следующего опроса с запасом, но вне сессии - не дольше, чем до открытия"""
+    valid_for = interval * 2
+    if not is_market_open(now):
+        valid_for = min(valid_for, max(1.0, seconds_until_open(now)))
+    return valid_for
+
+
+def universe() -> list:
+    return list(dict.fromkeys([*TICKERS, *COMPARISON_STOCKS]))
+
+
+class PricePoller:
+    """Фоновая задача: по расписанию одним пакетным запросом обновляет снимок котировок"""
+
+    def __init__(self, tickers: list = None, snapshot=None, listeners=()):
+        self.tickers = tickers or universe()
+        self.snapshot = snapshot or market_data.snapshot
+        # Корутинные функции, которые получают каждый новый снимок (например, движок алертов)
+        self.listeners = list(listeners)
+        self.failures = 0
+
+    async def poll_once(self) -> None:
+        quotes = await market_data.get_batch_closes(self.tickers)
+        if not quotes:
+            raise RuntimeError("empty batch response")
+        now = datetime.now(MARKET_TZ)
+        # Снимок остаётся действительным до следующего опроса с запасом на его длительность;
+        # цены до открытия после открытия уже не считаются свежими
+        self.snapshot.publish(quotes, valid_for=snapshot_ttl(poll_interval(now), now))
+        logging.info(f"Price snapshot updated: {len(quotes)}/{len(self.tickers)} tickers")
+        for listener in self.listeners:
+            try:
+                await listener(quotes)
+            except Exception as e:
+                logging.error(f"Snapshot listener failed: {e}")
+
+    def next_delay(self) -> float:
+        if self.failures:
+            delay = min(BACKOFF_BASE * 2 ** (self.failures - 1), BACKOFF_MAX)
+            return delay * random.uniform(0.5, 1.0)
+        return poll_interval()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+                self.failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                age = self.snapshot.age()
+                logging.warning(
+                    f"Price poll failed ({self.failures} in a row): {e}; "
+                    f"snapshot age: {'n/a' if age is None else f'{age:.0f}s'}"
+                )
+            await asyncio.sleep(self.next_delay())
@@ -0,0 +1,211 @@
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+import yfinance as yf
+
+HISTORY_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+# Валюта по суффиксу биржи в тикере (как у Yahoo); тикеры без суффикса - биржи США
+EXCHANGE_CURRENCIES = {'ME': 'RUB', 'DE': 'EUR', 'PA': 'EUR', 'TO': 'CAD', 'HK': 'HKD', 'T': 'JPY'}
+DEFAULT_CURRENCY = 'USD'
+# Котировки берутся за несколько дней: за period="1d" yfinance отдаёт один бар,
+# и изменение за день считать не от чего. Из них остаются две последние сессии.
+CLOSES_PERIOD = '5d'
+CLOSES_KEEP = 2
+
+
+def exchange_currency(ticker: str) -> str:
+    """Валюта котировок, определённая только по суффиксу тикера"""
+    _, dot, suffix = ticker.upper().rpartition('.')
+    return EXCHANGE_CURRENCIES.get(suffix, DEFAULT_CURRENCY) if dot else DEFAULT_CURRENCY
+
+
+class ProviderError(Exception):
+    """Источник данных не смог вернуть ответ"""
+
+
+class MarketDataProvider(ABC):
+    """Интерфейс источника рыночных данных.
+
+    Все методы блокирующие: market_data вызывает их в пуле потоков.
+    История - словарь списков по полям HISTORY_FIELDS (timestamp в секундах UTC),
+    дивиденды - список словарей {'Date': 'YYYY-MM-DD', 'Dividend': float}.
+    Неполный источник (без какого-либо абстрактного метода) не создаётся.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get_closes(self, ticker: str) -> list:
+        """Цены закрытия последних сессий: предыдущее закрытие и текущая цена"""
+        raise NotImplementedError
+
+    def get_batch_closes(self, tickers: list) -> dict:
+        """Цены закрытия по нескольким тикерам; по умолчанию - по одному запросу на тикер"""
+        return {ticker: closes for ticker in tickers if (closes := self.get_closes(ticker))}
+
+    @abstractmethod
+    def get_history(self, ticker: str, period: str = '1y', start: int = None) -> dict:
+        """Дневные бары за period или, если задан start (секунды UTC), начиная с него"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_dividends(self, ticker: str) -> list:
+        raise NotImplementedError
+
+    def get_currency(self, ticker: str) -> str:
+        """Код валюты котировок и выплат; по умолчанию - по суффиксу биржи"""
+        return exchange_currency(ticker)
+
+
+class YFinanceProvider(MarketDataProvider):
+    name = 'yfinance'
+
+    def get_closes(self, ticker: str) -> list:
+        data = yf.Ticker(ticker).history(period=CLOSES_PERIOD)
+        return data['Close'].dropna().tolist()[-CLOSES_KEEP:]
+
+    def get_batch_closes(self, tickers: list) -> dict:
+        data = yf.download(tickers, period=CLOSES_PERIOD, group_by='ticker', progress=False, threads=False)
+        closes = {}
+        for ticker in tickers:
+            if ticker in data.columns.get_level_values(0):
+                values = data[ticker]['Close'].dropna().tolist()[-CLOSES_KEEP:]
+                if values:
+                    closes[ticker] = values
+        return closes
+
+    def get_history(self, ticker: str, period: str = '1y', start: int = None) -> dict:
+        if start is not None:
+            data = yf.Ticker(ticker).history(start=datetime.fromtimestamp(start, timezone.utc), interval='1d')
+        else:
+            data = yf.Ticker(ticker).history(period=period)
+        return {
+            'timestamp': [int(ts.timestamp()) for ts in data.index],
+            'open': data['Open'].tolist(),
+            'high': data['High'].tolist(),
+            'low': data['Low'].tolist(),
+            'close': data['Close'].tolist(),
+            'volume': data['Volume'].tolist(),
+        }
+
+    def get_dividends(self, ticker: str) -> list:
+        dividends = yf.Ticker(ticker).dividends
+        return [
+            {'Date': date.strftime('%Y-%m-%d'), 'Dividend': float(amount)}
+            for date, amount in dividends.items()
+        ][::-1]
+
+    def get_currency(self, ticker: str) -> str:
+        currency = getattr(yf.Ticker(ticker).fast_info, 'currency', None)
+        return currency or super().get_currency(ticker)
+
+
+FAKE_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+PERIOD_DAYS = {'1d': 1, '5d': 5, '1mo': 30, '3mo': 91, '6mo': 182, '1y': 365, '2y': 730, '5y': 1826, '10y': 3652}
+
+
+class FakeProvider(MarketDataProvider):
+    """Детерминированный локальный источник для бенчмарков и офлайн-запуска.
+
+    Цены - случайное блуждание, зависящее только от seed и тикера.
+    latency - задержка каждого вызова в секундах, error_rate - доля вызовов,
+    завершающихся ProviderError.
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.seed = seed
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _call(self, what: str) -> None:
+        with self._lock:
+            self.calls += 1
+            failed = self._rng.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise ProviderError(f"fake {what} failure")
+
+    def _ticker_rng(self, ticker: str) -> random.Random:
+        return random.Random(zlib.crc32(ticker.encode()) ^ self.seed)
+
+    def _walk(self, ticker: str, days: int) -> list:
+        rng = self._ticker_rng(ticker)
+        price = rng.uniform(20, 500)
+        closes = []
+        for _ in range(days):
+            price *= 1 + rng.gauss(0.0003, 0.02)
+            closes.append(round(price, 2))
+        return closes
+
+    def get_closes(self, ticker: str) -> list:
+        self._call('quote')
+        return self._walk(ticker, 2)
+
+    def get_batch_closes(self, tickers: list) -> dict:
+        self._call('batch quote')
+        return {ticker: self._walk(ticker, 2) for ticker in tickers}
+
+    def _daily_series(self, ticker: str) -> dict:
+        """Дневные бары от FAKE_EPOCH до сегодня; одни и те же даты всегда дают одни и те же цены"""
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        key = (ticker, today)
+        series = self._series.get(key)
+        if series is None:
+            days = (today - FAKE_EPOCH).days + 1
+            closes = self._walk(ticker, days)
+            series = {
+                'timestamp': [int((FAKE_EPOCH + timedelta(days=i)).timestamp()) for i in range(days)],
+                'open': closes[:1] + closes[:-1],
+                'high': [round(c * 1.01, 2) for c in closes],
+                'low': [round(c * 0.99, 2) for c in closes],
+                'close': closes,
+                'volume': [1_000_000 + (i * 7919) % 500_000 for i in range(days)],
+            }
+            self._series[key] = series
+        return series
+
+    def get_history(self, ticker: str, period: str = '1y', start: int = None) -> dict:
+        self._call('history')
+        series = self._daily_series(ticker)
+        if start is not None:
+            first = bisect_left(series['timestamp'], start)
+        else:
+            first = max(0, len(series['timestamp']) - PERIOD_DAYS.get(period, 365))
+        return {field: values[first:] for field, values in series.items()}
+
+    def get_dividends(self, ticker: str) -> list:
+        self._call('dividends')
+        rng = self._ticker_rng(ticker)
+        if rng.random() < 0.3:
+            return []
+        amount = round(rng.uniform(0.1, 2.0), 2)
+        today = datetime.now(timezone.utc).date()
+        return [
+            {'Date': (today - timedelta(days=91 * i + 30)).isoformat(), 'Dividend': amount}
+            for i in range(8)
+        ]
+
+
+PROVIDERS = {
+    YFinanceProvider.name: YFinanceProvider,
+    FakeProvider.name: FakeProvider,
+}
+
+
+def make_provider(name: str, **options) -> MarketDataProvider:
+    try:
+        return PROVIDERS[name](**options)
+    except KeyError:
+        raise ValueError(f"Unknown market data provider: {name}") from None
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+
+class QuoteCache:
+    """Кэш котировок в памяти процесса: TTL, вытеснение LRU и объединение одновременных запросов.
+
+    Свежие записи (моложе ttl) отдаются сразу. Устаревшие, но моложе ttl + stale_ttl,
+    тоже отдаются сразу, а обновление запускается в фоне (stale-while-revalidate).
+    Одновременные промахи по одному тикеру ждут один и тот же запрос (single-flight).
+    """
+
+    def __init__(self, ttl: float = 30.0, stale_ttl: float = 300.0, max_size: int = 1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def get(self, key, fetch):
+        """Возвращает значение по ключу; fetch - корутинная функция без аргументов"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self._clock() - stored_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    self._start_fetch(key, fetch).add_done_callback(self._log_refresh_error)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_fetch(key, fetch)
+        # shield: отмена одного ожидающего не должна отменять общий запрос
+        return await asyncio.shield(task)
+
+    def put(self, key, value) -> None:
+        self._entries[key] = (value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, key):
+        """Значение без учёта TTL и без обновления статистики"""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def invalidate(self, key=None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'inflight': len(self._inflight),
+        }
+
+    def _start_fetch(self, key, fetch):
+        task = asyncio.ensure_future(self._fetch(key, fetch))
+        self._inflight[key] = task
+        return task
+
+    @staticmethod
+    def _log_refresh_error(task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logging.warning(f"Background quote refresh failed: {task.exception()}")
+
+    async def _fetch(self, key, fetch):
+        try:
+            value = await fetch()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+class PriceSnapshot:
+    """Общий снимок котировок всей вселенной тикеров, который публикует фоновый опросчик.
+
+    Публикация заменяет словарь целиком, поэтому чтение - один поиск в dict без блокировок.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._quotes = {}
+        self.updated_at = None
+        self.expires_at = 0.0
+
+    def publish(self, quotes: dict, valid_for: float) -> None:
+        self._quotes = dict(quotes)
+        self.updated_at = self._clock()
+        self.expires_at = self.updated_at + valid_for
+
+    def clear(self) -> None:
+        self._quotes = {}
+        self.updated_at = None
+        self.expires_at = 0.0
+
+    def get(self, key):
+        """Значение из снимка или None, если снимок устарел или тикера в нём нет"""
+        if self._clock() >= self.expires_at:
+            return None
+        return self._quotes.get(key)
+
+    def age(self):
+        """Возраст снимка в секундах или None, если он ещё ни разу не публиковался"""
+        if self.updated_at is None:
+            return None
+        return self._clock() - self.updated_at
+
+    def __len__(self):
+        return len(self._quotes)
@@ -0,0 +1,66 @@
+"""Кэш статических клавиатур и текстов.
+
+Клавиатуры и список тикеров не меняются между апдейтами, поэтому строятся один
+раз (warm_up при старте или при первом обращении) и переиспользуются. Всё, что
+зависит от TICKERS, сбрасывается при update_tickers().
+"""
+from functools import lru_cache
+
+from bot import keyboards
+from bot.chart_render import CHART_PERIODS
+from bot.config import ADMIN_USERNAME
+from bot.stocks_data import TICKERS, on_tickers_changed
+
+
+@lru_cache(maxsize=None)
+def main_kb():
+    return keyboards.main_kb()
+
+
+@lru_cache(maxsize=None)
+def cancel_kb():
+    return keyboards.cancel_kb()
+
+
+@lru_cache(maxsize=None)
+def help_kb():
+    return keyboards.help_kb(ADMIN_USERNAME)
+
+
+@lru_cache(maxsize=None)
+def tickers_kb():
+    return keyboards.tickers_kb(TICKERS.keys())
+
+
+@lru_cache(maxsize=None)
+def ticker_symbols():
+    return tuple(TICKERS.keys())
+
+
+@lru_cache(maxsize=None)
+def tickers_list_text():
+    tickers_list = "\n".join(
+        [f"<b>{ticker}</b> - {data['name']} ({data['description']})" 
+         for ticker, data in TICKERS.items()]
+    )
+    return "📊 <b>Популярные тикеры:</b>\n\n" + tickers_list
+
+
+@lru_cache(maxsize=256)
+def chart_periods_kb(ticker):
+    return keyboards.chart_periods_kb(ticker, CHART_PERIODS)
+
+
+TICKER_DEPENDENT = (tickers_kb, ticker_symbols, tickers_list_text)
+ALL = (main_kb, cancel_kb, help_kb, *TICKER_DEPENDENT)
+
+
+@on_tickers_changed
+def invalidate():
+    for func in TICKER_DEPENDENT:
+        func.cache_clear()
+
+
+def warm_up():
+    for func in ALL:
+        func()
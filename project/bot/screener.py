@@ -0,0 +1,173 @@
+"""Скринер дивидендов: /screener ранжирует список тикеров или верх реестра.
+
+Запросы расходятся параллельно, но не больше SCREEN_CONCURRENCY одновременно,
+чтобы большой скрининг не занял весь пул market_data. Дивиденды берутся из
+постоянного кэша bot/dividend_sources.py, поэтому тикеры, загруженные за
+последние дни, готовы сразу; цены загружаются заранее одним пакетным запросом.
+Без списка скринер проверяет первые MAX_SCREEN тикеров реестра по приоритету
+(весь реестр - тысячи символов), длинный список тоже обрезается до MAX_SCREEN.
+Результат приходит по мере готовности: одно сообщение редактируется не чаще
+раза в PROGRESS_INTERVAL секунд, а в конце показывается итоговый рейтинг.
+"""
+import asyncio
+import logging
+import re
+import time
+from datetime import date
+
+from aiogram import Bot, Router, types
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command, CommandObject
+
+from bot import market_data
+from bot.dividends import CONSISTENCY_YEARS, get_dividend_info
+from bot.ticker_registry import get_registry
+
+SCREEN_CONCURRENCY = 16
+MAX_SCREEN = 200
+SCREEN_TOP = 25
+PROGRESS_INTERVAL = 1.5
+ALL_WORDS = {'все', 'all', '*'}
+
+SORT_TITLES = {'yield': 'доходность', 'consistency': 'стабильность выплат', 'exdate': 'ближайшая выплата'}
+SORT_ALIASES = {
+    'yield': 'yield', 'доходность': 'yield',
+    'consistency': 'consistency', 'стабильность': 'consistency',
+    'exdate': 'exdate', 'дата': 'exdate',
+}
+DEFAULT_SORT = 'yield'
+
+SCREENER_HELP = (
+    "Формат: <code>/screener [yield|consistency|exdate] [тикеры]</code>\n"
+    f"<code>/screener</code> - первые {MAX_SCREEN} тикеров реестра по доходности,\n"
+    "<code>/screener exdate AAPL MSFT KO</code> - по ближайшей выплате."
+)
+
+router = Router()
+
+
+def parse_args(args: str) -> tuple:
+    """Ключ сортировки, тикеры и нераспознанные запросы"""
+    queries = [q for q in re.split(r"[\s,;]+", args or '') if q]
+    sort = DEFAULT_SORT
+    if queries and queries[0].lower() in SORT_ALIASES:
+        sort = SORT_ALIASES[queries.pop(0).lower()]
+    registry = get_registry()
+    if not queries or any(q.lower() in ALL_WORDS for q in queries):
+        return sort, registry.symbols(MAX_SCREEN), []
+    resolved = {q: registry.resolve(q) for q in queries}
+    tickers = list(dict.fromkeys(t for t in resolved.values() if t is not None))
+    unknown = [q for q, t in resolved.items() if t is None]
+    return sort, tickers, unknown
+
+
+def rank(results: list, sort: str) -> list:
+    """Плательщики дивидендов в порядке рейтинга; тикеры без нужного значения отбрасываются"""
+    payers = [info for info in results if info['payments']]
+    if sort == 'yield':
+        return sorted((i for i in payers if i['yield'] is not None), key=lambda i: -i['yield'])
+    if sort == 'exdate':
+        return sorted((i for i in payers if i['next_date'] is not None), key=lambda i: i['next_date'])
+    return sorted(payers, key=lambda i: (-i['consistency'], -i['per_year'], -(i['yield'] or 0)))
+
+
+def format_screen(results: list, sort: str, total: int, failed: list, elapsed: float) -> str:
+    done = len(results) + len(failed)
+    status = f"готово {done}/{total}" if done < total else f"{total} тикеров за {elapsed:.1f} с"
+    lines = [f"💰 <b>Скринер дивидендов: {SORT_TITLES[sort]}</b> ({status})"]
+
+    ranking = rank(results, sort)
+    rows = []
+    for place, info in enumerate(ranking[:SCREEN_TOP], start=1):
+        dividend_yield = f"{info['yield'] * 100:5.2f}%" if info['yield'] is not None else "    -"
+        next_date = f"{date.fromisoformat(info['next_date']):%d.%m.%y}" if info['next_date'] else "-"
+        years = round(info['consistency'] * CONSISTENCY_YEARS)
+        rows.append(
+            f"{place:>2}. {info['ticker']:<8} {dividend_yield} "
+            f"{info['per_year']:>2}/год {years}/{CONSISTENCY_YEARS} {next_date}"
+        )
+    if rows:
+        lines.append("<pre>" + "\n".join(rows) + "</pre>")
+    elif done == total:
+        lines.append("Подходящих тикеров не найдено")
+
+    if len(ranking) > SCREEN_TOP:
+        lines.append(f"…и ещё {len(ranking) - SCREEN_TOP}")
+    skipped = len(results) - len(ranking)
+    if skipped:
+        lines.append(f"Без дивидендов или данных для сортировки: {skipped}")
+    if failed:
+        lines.append(f"Нет данных: {', '.join(failed)}")
+    return "\n".join(lines)
+
+
+async def screen(tickers: list, concurrency: int = SCREEN_CONCURRENCY):
+    """Асинхронный генератор пар (тикер, сводка или None) в порядке готовности"""
+    slots = asyncio.Semaphore(concurrency)
+    # Цены - одним пакетным запросом, а не отдельным вызовом на каждый тикер
+    await market_data.prefetch_closes(tickers)
+
+    async def load(ticker):
+        async with slots:
+            return ticker, await get_dividend_info(ticker)
+
+    tasks = [asyncio.ensure_future(load(ticker)) for ticker in tickers]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # Генератор могли бросить на полпути: оставшиеся запросы не нужны
+        for task in tasks:
+            task.cancel()
+
+
+class Progress:
+    """Сообщение с промежуточным результатом, которое редактируется не чаще interval"""
+
+    def __init__(self, bot: Bot, message: types.Message, text: str, interval: float = PROGRESS_INTERVAL):
+        self.bot = bot
+        self.message = message
+        self.interval = interval
+        self.text = text
+        self.updated = time.monotonic()
+        self.edits = 0
+
+    async def update(self, text: str, force: bool = False) -> None:
+        if text == self.text or (not force and time.monotonic() - self.updated < self.interval):
+            return
+        try:
+            await self.bot.edit_message_text(text=text, chat_id=self.message.chat.id, message_id=self.message.message_id)
+            self.edits += 1
+        except TelegramBadRequest as e:
+            logging.warning(f"Screener progress edit failed: {e}")
+        self.text = text
+        self.updated = time.monotonic()
+
+
+async def run_screen(bot: Bot, message: types.Message, sort: str, tickers: list) -> list:
+    started = time.perf_counter()
+    results, failed = [], []
+    text = format_screen(results, sort, len(tickers), failed, 0.0)
+    progress = Progress(bot, await message.answer(text), text)
+    async for ticker, info in screen(tickers):
+        if info is None:
+            failed.append(ticker)
+        else:
+            results.append(info)
+        await progress.update(format_screen(results, sort, len(tickers), failed, time.perf_counter() - started))
+    elapsed = time.perf_counter() - started
+    await progress.update(format_screen(results, sort, len(tickers), failed, elapsed), force=True)
+    logging.info(f"Dividend screen of {len(tickers)} tickers in {elapsed:.2f} s, {progress.edits} edits")
+    return results
+
+
+@router.message(Command("screener"))
+async def cmd_screener(message: types.Message, command: CommandObject, bot: Bot):
+    sort, tickers, unknown = parse_args(command.args)
+    if unknown:
+        await message.answer(f"❌ Тикер не найден: {', '.join(unknown)}\n\n{SCREENER_HELP}")
+        return
+    if len(tickers) > MAX_SCREEN:
+        await message.answer(f"ℹ️ За раз проверяется не больше {MAX_SCREEN} тикеров: беру первые {MAX_SCREEN} из {len(tickers)}")
+        tickers = tickers[:MAX_SCREEN]
+    await run_screen(bot, message, sort, tickers)
@@ -0,0 +1,281 @@
+"""Центральный планировщик исходящих сообщений с учётом лимитов Telegram.
+
+Подключается как middleware сессии бота, поэтому через него проходят все
+message.answer и bot.send_message. Вызовы без chat_id (getUpdates,
+answerInlineQuery и т. п.) идут напрямую.
+
+- глобальный token bucket (около 30 сообщений в секунду на бота);
+- token bucket на каждый чат (около 1 сообщения в секунду с небольшим запасом);
+- приоритеты: ответы пользователям раньше алертов, алерты раньше рассылок;
+- при 429 чат ставится на паузу на retry_after, сообщение отправляется повторно;
+- очередь ограничена: при переполнении отправители ждут (обратное давление).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+
+INTERACTIVE = 0
+NOTIFICATION = 1
+BROADCAST = 2
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', NOTIFICATION: 'notification', BROADCAST: 'broadcast'}
+
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30
+CHAT_RATE = 1.0
+CHAT_BURST = 3
+MAX_QUEUE = 10_000
+MAX_IN_FLIGHT = 30
+MAX_RETRIES = 3
+IDLE_CHAT_TTL = 600.0
+# Обход всех бакетов чатов - не чаще, чем раз в CLEANUP_INTERVAL секунд
+CLEANUP_INTERVAL = IDLE_CHAT_TTL / 10
+SHUTDOWN_TIMEOUT = 10.0
+
+send_priority = ContextVar('send_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int):
+    """Отправки внутри блока получают указанный приоритет"""
+    token = send_priority.set(level)
+    try:
+        yield
+    finally:
+        send_priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self) -> float:
+        """Через сколько секунд будет доступен один токен"""
+        self._refill(self._clock())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self._refill(self._clock())
+        self.tokens -= 1
+
+
+class _Job:
+    __slots__ = ('make_request', 'bot', 'method', 'chat_id', 'priority', 'future', 'enqueued', 'attempts')
+
+    def __init__(self, make_request, bot, method, chat_id, level):
+        self.make_request = make_request
+        self.bot = bot
+        self.method = method
+        self.chat_id = chat_id
+        self.priority = level
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+        self.attempts = 0
+
+
+class SendScheduler(BaseRequestMiddleware):
+    def __init__(self, global_rate: float = GLOBAL_RATE, chat_rate: float = CHAT_RATE,
+                 chat_burst: int = CHAT_BURST, max_queue: int = MAX_QUEUE, max_in_flight: int = MAX_IN_FLIGHT):
+        self.global_bucket = TokenBucket(global_rate, GLOBAL_BURST)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_queue = max_queue
+        self.max_in_flight = max_in_flight
+        self._chat_buckets = {}
+        self._paused_until = {}
+        self._last_cleanup = time.monotonic()
+        self._ready = []
+        self._delayed = []
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._space = None
+        self._in_flight = None
+        self._worker = None
+        self._tasks = set()
+        self._blocked = 0
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.retry_after_events = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def __call__(self, make_request, bot, method):
+        chat_id = getattr(method, 'chat_id', None)
+        if chat_id is None:
+            return await make_request(bot, method)
+        return await self.submit(make_request, bot, method, chat_id, send_priority.get())
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._space = asyncio.Condition()
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.create_task(self._run())
+
+    def __len__(self):
+        return len(self._ready) + len(self._delayed)
+
+    async def submit(self, make_request, bot, method, chat_id, level: int = INTERACTIVE):
+        self._ensure_worker()
+        if len(self) >= self.max_queue:
+            self._blocked += 1
+            try:
+                async with self._space:
+                    await self._space.wait_for(lambda: len(self) < self.max_queue)
+            finally:
+                self._blocked -= 1
+        job = _Job(make_request, bot, method, chat_id, level)
+        self._push_ready(job)
+        return await job.future
+
+    def _push_ready(self, job: _Job) -> None:
+        heapq.heappush(self._ready, (job.priority, next(self._seq), job))
+        self._wakeup.set()
+
+    def _push_delayed(self, job: _Job, ready_at: float) -> None:
+        heapq.heappush(self._delayed, (ready_at, next(self._seq), job))
+        self._wakeup.set()
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            self._chat_buckets[chat_id] = bucket = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _chat_delay(self, chat_id, now: float) -> float:
+        paused = self._paused_until.get(chat_id, 0.0) - now
+        return max(paused, self._chat_bucket(chat_id).delay())
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, job = heapq.heappop(self._delayed)
+                heapq.heappush(self._ready, (job.priority, next(self._seq), job))
+
+            if not self._ready:
+                self._wakeup.clear()
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, job = heapq.heappop(self._ready)
+            if job.future.done():
+                # Отправитель уже перестал ждать (его задачу отменили) - сообщение не нужно
+                continue
+            chat_delay = self._chat_delay(job.chat_id, now)
+            if chat_delay > 0:
+                # Чат исчерпал лимит - откладываем только его сообщение, остальные идут дальше
+                self._push_delayed(job, now + chat_delay)
+                continue
+
+            global_delay = self.global_bucket.delay()
+            if global_delay > 0:
+                heapq.heappush(self._ready, (job.priority, next(self._seq), job))
+                await asyncio.sleep(global_delay)
+                continue
+
+            self.global_bucket.take()
+            self._chat_bucket(job.chat_id).take()
+            await self._in_flight.acquire()
+            task = asyncio.create_task(self._deliver(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            if self._blocked:
+                async with self._space:
+                    self._space.notify_all()
+            self._cleanup_chats(now)
+
+    async def _deliver(self, job: _Job) -> None:
+        job.attempts += 1
+        try:
+            result = await job.make_request(job.bot, job.method)
+        except TelegramRetryAfter as e:
+            self.retry_after_events += 1
+            if job.attempts > MAX_RETRIES:
+                self._finish(job, error=e)
+            else:
+                self.retried += 1
+                ready_at = time.monotonic() + e.retry_after
+                self._paused_until[job.chat_id] = ready_at
+                self._push_delayed(job, ready_at)
+        except Exception as e:
+            self._finish(job, error=e)
+        else:
+            self._finish(job, result=result)
+        finally:
+            self._in_flight.release()
+
+    def _finish(self, job: _Job, result=None, error=None) -> None:
+        wait = time.monotonic() - job.enqueued
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if error is None:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        else:
+            self.failed += 1
+            logging.warning(f"Send to {job.chat_id} failed: {error}")
+            if not job.future.done():
+                job.future.set_exception(error)
+
+    async def stop(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Останавливает планировщик: ждёт начатые отправки, остальные отменяет"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=timeout)
+        for queue in (self._ready, self._delayed):
+            for _, _, job in queue:
+                job.future.cancel()
+            queue.clear()
+
+    def _cleanup_chats(self, now: float) -> None:
+        # Редкая чистка: бакеты давно молчащих чатов снова полны, хранить их незачем
+        if now - self._last_cleanup < CLEANUP_INTERVAL or len(self._chat_buckets) < 10_000:
+            return
+        self._last_cleanup = now
+        idle = [chat for chat, bucket in self._chat_buckets.items() if now - bucket.updated > IDLE_CHAT_TTL]
+        for chat in idle:
+            del self._chat_buckets[chat]
+            self._paused_until.pop(chat, None)
+
+    def stats(self) -> dict:
+        queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        for _, _, job in self._ready:
+            queued[PRIORITY_NAMES[job.priority]] += 1
+        finished = self.sent + self.failed
+        return {
+            **{f'queued_{name}': count for name, count in queued.items()},
+            'delayed': len(self._delayed),
+            'blocked_senders': self._blocked,
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+            'retry_after': self.retry_after_events,
+            'avg_wait': f"{self.total_wait / finished * 1000:.0f} мс" if finished else 'n/a',
+            'max_wait': f"{self.max_wait * 1000:.0f} мс",
+        }
+
+
+scheduler = SendScheduler()
@@ -4,4 +4,8 @@ class StockStates(StatesGroup):
     waiting_for_symbol = State()
     waiting_for_first_ticker = State()
     waiting_for_second_ticker = State()
-    waiting_for_ticker_selection = State()
\ No newline at end of file
+    waiting_for_ticker_selection = State()
+    waiting_for_multi_tickers = State()
+    waiting_for_analytics_tickers = State()
+    waiting_for_chart_ticker = State()
+    waiting_for_dividend_ticker = State()
\ No newline at end of file
@@ -91,4 +91,18 @@ TICKERS = {
     }
 }
 
-COMPARISON_STOCKS = ["AAPL", "TSLA", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "SPY", "AMD", "PYPL"]
\ No newline at end of file
+COMPARISON_STOCKS = ["AAPL", "TSLA", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "SPY", "AMD", "PYPL"]
+
+_change_listeners = []
+
+def on_tickers_changed(callback):
+    """Регистрирует функцию, которую нужно вызвать после изменения TICKERS"""
+    _change_listeners.append(callback)
+    return callback
+
+def update_tickers(tickers: dict):
+    """Заменяет содержимое реестра тикеров и сообщает об этом подписчикам (например, кэшу отрисовки)"""
+    TICKERS.clear()
+    TICKERS.update(tickers)
+    for callback in _change_listeners:
+        callback()
@@ -0,0 +1,94 @@
+import time
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+SWEEP_INTERVAL = 60.0
+
+
+class TTLMemoryStorage(BaseStorage):
+    """FSM-хранилище в памяти процесса, в котором состояние и данные истекают по TTL.
+
+    В отличие от MemoryStorage не создаёт записей при чтении и периодически
+    вычищает брошенные диалоги, поэтому память не растёт бесконечно.
+    Подходит только для одного процесса бота.
+    """
+
+    def __init__(self, state_ttl: float = None, data_ttl: float = None, clock=time.monotonic):
+        self.state_ttl = state_ttl
+        self.data_ttl = data_ttl
+        self._clock = clock
+        self._states = {}
+        self._data = {}
+        self._next_sweep = clock() + SWEEP_INTERVAL
+
+    def __len__(self):
+        return len(self._states.keys() | self._data.keys())
+
+    def _expires_at(self, ttl):
+        return None if ttl is None else self._clock() + ttl
+
+    def _get(self, records: dict, key: StorageKey):
+        record = records.get(key)
+        if record is None:
+            return None
+        value, expires_at = record
+        if expires_at is not None and self._clock() >= expires_at:
+            del records[key]
+            return None
+        return value
+
+    def _maybe_sweep(self) -> None:
+        now = self._clock()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL
+        for records in (self._states, self._data):
+            expired = [key for key, (_, expires_at) in records.items() if expires_at is not None and now >= expires_at]
+            for key in expired:
+                del records[key]
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        self._maybe_sweep()
+        state = state.state if isinstance(state, State) else state
+        if state is None:
+            self._states.pop(key, None)
+        else:
+            self._states[key] = (state, self._expires_at(self.state_ttl))
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return self._get(self._states, key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        self._maybe_sweep()
+        if not data:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = (dict(data), self._expires_at(self.data_ttl))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        data = self._get(self._data, key)
+        return {} if data is None else data.copy()
+
+    async def close(self) -> None:
+        pass
+
+
+def make_storage(backend: str = 'memory', redis_url: str = '', state_ttl: int = None, data_ttl: int = None) -> BaseStorage:
+    """Создаёт FSM-хранилище.
+
+    memory - TTLMemoryStorage (один процесс), redis - общее хранилище для нескольких
+    воркеров, fakeredis - тот же RedisStorage поверх локальной эмуляции Redis в памяти.
+    """
+    if backend == 'memory':
+        return TTLMemoryStorage(state_ttl=state_ttl, data_ttl=data_ttl)
+
+    from aiogram.fsm.storage.redis import RedisStorage
+
+    if backend == 'redis':
+        return RedisStorage.from_url(redis_url, state_ttl=state_ttl, data_ttl=data_ttl)
+    if backend == 'fakeredis':
+        from fakeredis.aioredis import FakeRedis
+        return RedisStorage(redis=FakeRedis(), state_ttl=state_ttl, data_ttl=data_ttl)
+    raise ValueError(f"Unknown FSM storage backend: {backend}")
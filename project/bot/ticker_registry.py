@@ -0,0 +1,203 @@
+"""Реестр тикеров с быстрым поиском: точное совпадение, префикс и опечатки.
+
+Ключи поиска - символ тикера, название компании (целиком и по словам) и синонимы,
+например русские названия. Все ключи нормализуются: нижний регистр, ё -> е,
+только буквы и цифры.
+
+- точное совпадение: словарь, O(1);
+- префикс: bisect по отсортированному списку ключей, O(log n + k);
+- опечатки: индекс удалений одного символа (symmetric delete) даёт кандидатов,
+  которые затем проверяются расстоянием Дамерау-Левенштейна с ограничением
+  (перестановка соседних букв - одна опечатка). Такой индекс находит только
+  одну опечатку: для двух пришлось бы хранить удаления пар символов, а это
+  на порядок больше памяти и времени построения.
+"""
+import csv
+import re
+from bisect import bisect_left
+from itertools import islice
+from pathlib import Path
+from typing import NamedTuple
+
+from bot.config import TICKERS_FILE
+from bot.stocks_data import TICKERS, on_tickers_changed
+
+MIN_PREFIX = 2
+
+_non_alnum = re.compile(r'[^0-9a-zа-я]+')
+
+
+def normalize(text: str) -> str:
+    return _non_alnum.sub('', text.lower().replace('ё', 'е'))
+
+
+def max_distance(key: str) -> int:
+    """Допустимое число опечаток: одна для запросов от 3 символов (больше индекс не находит)"""
+    if len(key) >= 3:
+        return 1
+    return 0
+
+
+def _deletes(key: str) -> set:
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def damerau_levenshtein(a: str, b: str, limit: int) -> int:
+    """Расстояние Левенштейна, где перестановка соседних символов - одна правка (OSA);
+    если оно больше limit, возвращает limit + 1"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i]
+        for j, cb in enumerate(b, start=1):
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class TickerRecord(NamedTuple):
+    symbol: str
+    name: str
+    description: str
+    rank: int
+
+
+class TickerRegistry:
+    def __init__(self):
+        self._records = {}
+        self._key_symbols = {}
+        self._deletes = {}
+        self._sorted_keys = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, symbol):
+        return symbol in self._records
+
+    def get(self, symbol: str):
+        return self._records.get(symbol)
+
+    def symbols(self, limit: int = None) -> list:
+        """Символы в порядке приоритета: все или первые limit"""
+        return list(islice(self._records, limit))
+
+    def add(self, symbol: str, name: str, description: str = '', aliases=()) -> None:
+        symbol = symbol.strip().upper()
+        # Повторное добавление только дополняет ключи поиска, запись остаётся прежней
+        if symbol not in self._records:
+            self._records[symbol] = TickerRecord(symbol, name, description, len(self._records))
+
+        keys = {normalize(symbol), normalize(symbol.split('.')[0]), normalize(name)}
+        keys.update(normalize(word) for word in name.split())
+        keys.update(normalize(alias) for alias in aliases)
+        for key in keys:
+            if key:
+                self._index_key(key, symbol)
+        self._sorted_keys = None
+
+    def _index_key(self, key: str, symbol: str) -> None:
+        symbols = self._key_symbols.get(key)
+        if symbols is None:
+            self._key_symbols[key] = symbols = set()
+            for variant in _deletes(key) | {key}:
+                self._deletes.setdefault(variant, set()).add(key)
+        symbols.add(symbol)
+
+    def _best(self, symbols):
+        return sorted(symbols, key=lambda symbol: self._records[symbol].rank)
+
+    def exact(self, query: str) -> list:
+        """Символы, у которых тикер, название или синоним совпадает с запросом"""
+        symbol = query.strip().upper()
+        if symbol in self._records:
+            return [symbol]
+        return self._best(self._key_symbols.get(normalize(query), ()))
+
+    def prefix(self, query: str, limit: int = 10) -> list:
+        key = normalize(query)
+        if len(key) < MIN_PREFIX:
+            return []
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._key_symbols)
+        found = set()
+        index = bisect_left(self._sorted_keys, key)
+        # Просматриваем ограниченное число ключей: короткие префиксы совпадают с тысячами
+        for candidate in self._sorted_keys[index:index + limit * 20]:
+            if not candidate.startswith(key):
+                break
+            found.update(self._key_symbols[candidate])
+        return self._best(found)[:limit]
+
+    def fuzzy(self, query: str, limit: int = 10) -> list:
+        key = normalize(query)
+        limit_distance = max_distance(key)
+        if not limit_distance:
+            return []
+        candidates = set()
+        for variant in _deletes(key) | {key}:
+            candidates.update(self._deletes.get(variant, ()))
+
+        scored = {}
+        for candidate in candidates:
+            distance = damerau_levenshtein(key, candidate, limit_distance)
+            if distance > limit_distance:
+                continue
+            for symbol in self._key_symbols[candidate]:
+                if distance < scored.get(symbol, limit_distance + 1):
+                    scored[symbol] = distance
+        ordered = sorted(scored, key=lambda symbol: (scored[symbol], self._records[symbol].rank))
+        return ordered[:limit]
+
+    def resolve(self, query: str):
+        """Лучший символ для пользовательского ввода или None"""
+        for lookup in (self.exact, self.prefix, self.fuzzy):
+            found = lookup(query)
+            if found:
+                return found[0]
+        return None
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Несколько подходящих записей: сначала точные, затем по префиксу, затем с опечатками"""
+        symbols = list(dict.fromkeys(self.exact(query) + self.prefix(query, limit) + self.fuzzy(query, limit)))
+        return [self._records[symbol] for symbol in symbols[:limit]]
+
+    def load_csv(self, path) -> None:
+        """Загружает тикеры из CSV с колонками symbol,name,description,aliases (синонимы через |)"""
+        with open(path, encoding='utf-8', newline='') as file:
+            for row in csv.DictReader(file):
+                aliases = [alias for alias in (row.get('aliases') or '').split('|') if alias]
+                self.add(row['symbol'], row['name'], row.get('description') or '', aliases)
+
+    @classmethod
+    def from_tickers(cls, tickers: dict, path=None):
+        """Реестр из словаря TICKERS (они получают высший приоритет) и файла с остальными тикерами"""
+        registry = cls()
+        for symbol, data in tickers.items():
+            registry.add(symbol, data['name'], data.get('description', ''))
+        if path is not None and Path(path).exists():
+            registry.load_csv(path)
+        return registry
+
+
+_registry = None
+
+
+def get_registry() -> TickerRegistry:
+    global _registry
+    if _registry is None:
+        _registry = TickerRegistry.from_tickers(TICKERS, TICKERS_FILE)
+    return _registry
+
+
+@on_tickers_changed
+def _reset_registry():
+    global _registry
+    _registry = None
@@ -0,0 +1,98 @@
+import asyncio
+import hmac
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+SHUTDOWN_TIMEOUT = 30.0
+
+
+class WebhookServer:
+    """Приём апдейтов по вебхуку с ограничением числа одновременно обрабатываемых.
+
+    Telegram получает ответ 200 сразу после постановки апдейта в обработку.
+    Когда все слоты заняты, ответ задерживается - это и есть обратное давление.
+    """
+
+    def __init__(self, dp: Dispatcher, bot: Bot, path: str = '/webhook', secret_token: str = '', concurrency: int = 100):
+        self.dp = dp
+        self.bot = bot
+        self.path = path
+        self.secret_token = secret_token
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks = set()
+        self._closing = False
+        self.processed = 0
+
+    def verify_secret(self, request: web.Request) -> bool:
+        if not self.secret_token:
+            return True
+        received = request.headers.get(SECRET_HEADER, '')
+        return hmac.compare_digest(received, self.secret_token)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not self.verify_secret(request):
+            return web.Response(status=401, text='Unauthorized')
+        if self._closing:
+            return web.Response(status=503, text='Shutting down')
+
+        try:
+            update = Update.model_validate(await request.json(), context={'bot': self.bot})
+        except Exception as e:
+            logging.warning(f"Bad webhook payload: {e}")
+            return web.Response(status=400, text='Bad update')
+
+        await self._slots.acquire()
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return web.Response()
+
+    async def _process(self, update: Update) -> None:
+        try:
+            await self.dp.feed_update(self.bot, update)
+        except Exception as e:
+            logging.error(f"Error processing update {update.update_id}: {e}")
+        finally:
+            self.processed += 1
+            self._slots.release()
+
+    async def drain(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Перестаёт принимать апдейты и ждёт завершения уже начатых"""
+        self._closing = True
+        if self._tasks:
+            await asyncio.wait(self._tasks, timeout=timeout)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        app.on_shutdown.append(lambda app: self.drain())
+        return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, host: str, port: int, path: str,
+                      base_url: str = '', secret_token: str = '', concurrency: int = 100) -> None:
+    server = WebhookServer(dp, bot, path=path, secret_token=secret_token, concurrency=concurrency)
+    runner = web.AppRunner(server.make_app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+
+    await dp.emit_startup(bot=bot)
+    if base_url:
+        await bot.set_webhook(
+            url=base_url.rstrip('/') + path,
+            secret_token=secret_token or None,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+    await site.start()
+    logging.info(f"Webhook server listening on {host}:{port}{path}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        # Сессию бота закрывает вызывающий (main.py) после остановки фоновых задач
+        await dp.emit_shutdown(bot=bot)
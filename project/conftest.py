@@ -0,0 +1 @@
+# Корень проекта в sys.path: тесты импортируют пакет bot так же, как main.py
@@ -1,20 +1,88 @@
+import argparse
 import asyncio
+import gc
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
 import logging
 
+from bot import alerts, analytics, charts, config, dividend_sources, dividends, market_data, render_cache, screener
+from bot.sender import scheduler
 from bot.handlers import router
+from bot.history_store import get_store
+from bot.inline import router as inline_router
+from bot.poller import PricePoller, universe
+from bot.providers import make_provider
+from bot.storage import make_storage
+from bot.ticker_registry import get_registry
+from bot.webhook import run_webhook
 
-async def main():
-    bot = Bot(token='7584464829:AAEI8fBuLtzbYAbv_Lt_6X91LoCJhg6bc_s', default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-    dp = Dispatcher()
+async def main(mode: str):
+    bot = Bot(token=config.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    bot.session.middleware(scheduler)
+    market_data.set_provider(make_provider(config.MARKET_DATA_PROVIDER))
+    dividend_sources.set_source(config.DIVIDEND_SOURCE)
+    storage = make_storage(
+        config.FSM_STORAGE,
+        redis_url=config.REDIS_URL,
+        state_ttl=config.FSM_STATE_TTL,
+        data_ttl=config.FSM_DATA_TTL,
+    )
+    dp = Dispatcher(storage=storage)
+    dp.include_router(alerts.router)
     dp.include_router(router)
-    await dp.start_polling(bot)
+    dp.include_router(analytics.router)
+    dp.include_router(charts.router)
+    # Скринер раньше дивидендов: /screener работает и в режиме выбора тикера
+    dp.include_router(screener.router)
+    dp.include_router(dividends.router)
+    dp.include_router(inline_router)
+    render_cache.warm_up()
+    get_registry()
+    restored = alerts.open_store(config.ALERTS_PATH)
+    logging.info(f"Restored {restored} alerts")
+    # Объекты, созданные при импорте и настройке, живут до выключения: убираем их из
+    # сборки мусора, иначе каждая полная сборка обходит их и останавливает event loop
+    gc.freeze()
+    notifier_task = alerts.start_notifier(bot)
+    poller_task = asyncio.create_task(PricePoller(listeners=[alerts.on_prices]).run())
+    # Прогрев и дозагрузка истории идут в фоне и не задерживают старт бота
+    history_task = asyncio.create_task(get_store().run(universe()))
+    charts_task = asyncio.create_task(charts.service.warm_up())
+    try:
+        if mode == 'webhook':
+            await run_webhook(
+                dp, bot,
+                host=config.WEBHOOK_HOST,
+                port=config.WEBHOOK_PORT,
+                path=config.WEBHOOK_PATH,
+                base_url=config.WEBHOOK_BASE_URL,
+                secret_token=config.WEBHOOK_SECRET,
+                concurrency=config.WEBHOOK_CONCURRENCY,
+            )
+        else:
+            await bot.delete_webhook()
+            # Сессию закрываем сами в finally: после неё ещё дорабатывают отправки из очереди
+            await dp.start_polling(bot, close_bot_session=False)
+    finally:
+        poller_task.cancel()
+        history_task.cancel()
+        charts_task.cancel()
+        await alerts.stop_notifier(notifier_task)
+        alerts.close_store()
+        await scheduler.stop()
+        charts.service.shutdown()
+        market_data.shutdown()
+        await dividend_sources.close()
+        await bot.session.close()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Биржевой бот')
+    parser.add_argument('--mode', choices=['polling', 'webhook'], default=config.BOT_MODE)
+    args = parser.parse_args()
+
     logging.basicConfig(level=logging.INFO)
     try:
-        asyncio.run(main())
+        asyncio.run(main(args.mode))
     except KeyboardInterrupt:
         print('Бот выключен')
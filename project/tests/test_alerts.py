@@ -0,0 +1,20 @@
+from bot.alert_store import AlertStore
+from bot.alerts import ABOVE, BELOW, CHANGE, PRICE, AlertEngine
+
+
+def test_alerts_survive_restart(tmp_path):
+    path = str(tmp_path / 'alerts.sqlite3')
+    engine = AlertEngine(AlertStore(path))
+    fired = engine.add(1, 'AAPL', PRICE, ABOVE, 200.0)
+    kept = engine.add(1, 'AAPL', PRICE, BELOW, 150.0)
+    removed = engine.add(2, 'TSLA', CHANGE, ABOVE, 5.0)
+    assert engine.remove(2, removed.id)
+    assert engine.evaluate({'AAPL': [190.0, 210.0]}) == [fired]
+    engine.store.close()
+
+    restored = AlertEngine(AlertStore(path))
+    assert restored.user_alerts(1) == [kept]
+    assert restored.user_alerts(2) == []
+    assert restored.add(2, 'TSLA', PRICE, BELOW, 100.0).id == removed.id + 1
+    assert restored.evaluate({'AAPL': [160.0, 140.0]}) == [kept]
+    restored.store.close()
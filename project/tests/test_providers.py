@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from bot import providers
+from bot.providers import YFinanceProvider
+
+
+def download_frame(closes: dict) -> pd.DataFrame:
+    """Ответ yf.download(..., group_by='ticker'): по одному столбцу Close на тикер, NaN - нет бара"""
+    days = pd.date_range('2024-06-03', periods=max(len(values) for values in closes.values()), freq='B')
+    columns = {}
+    for ticker, values in closes.items():
+        padded = [float('nan')] * (len(days) - len(values)) + values
+        columns[(ticker, 'Close')] = padded
+    return pd.DataFrame(columns, index=days)
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    frames, calls = [], []
+
+    def download(tickers, period, **kwargs):
+        calls.append(period)
+        return frames.pop(0)
+
+    monkeypatch.setattr(providers.yf, 'download', download)
+    return frames, calls
+
+
+def test_batch_closes_keep_previous_session(downloads):
+    frames, calls = downloads
+    frames.append(download_frame({'AAPL': [10.0, 11.0, 12.0, 13.0, 14.0], 'MSFT': [20.0, 21.0, 22.0, 23.0, 25.0]}))
+    closes = YFinanceProvider().get_batch_closes(['AAPL', 'MSFT'])
+    # Одного дня мало: без предыдущего закрытия изменение за день всегда 0
+    assert calls == [providers.CLOSES_PERIOD] and calls[0] != '1d'
+    assert closes == {'AAPL': [13.0, 14.0], 'MSFT': [23.0, 25.0]}
+
+
+def test_batch_closes_with_one_bar_per_ticker(downloads):
+    frames, _ = downloads
+    frames.append(download_frame({'AAPL': [14.0], 'NEW': [5.0]}))
+    closes = YFinanceProvider().get_batch_closes(['AAPL', 'NEW', 'GONE'])
+    assert closes == {'AAPL': [14.0], 'NEW': [5.0]}
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+
+from bot.states import StockStates
+from bot.storage import make_storage
+
+KEY = StorageKey(bot_id=1, chat_id=42, user_id=42)
+
+
+async def expire_dialog(backend: str, ttl: float) -> tuple:
+    storage = make_storage(backend, state_ttl=ttl, data_ttl=ttl)
+    try:
+        await storage.set_state(KEY, StockStates.waiting_for_second_ticker)
+        await storage.set_data(KEY, {'first_ticker': 'AAPL'})
+        before = await storage.get_state(KEY), await storage.get_data(KEY)
+        await asyncio.sleep(ttl + 0.2)
+        return before, (await storage.get_state(KEY), await storage.get_data(KEY))
+    finally:
+        await storage.close()
+
+
+@pytest.mark.parametrize('backend', ['memory', 'fakeredis'])
+def test_short_ttl_expires_dialog(backend):
+    if backend == 'fakeredis':
+        pytest.importorskip('fakeredis')
+    before, after = asyncio.run(expire_dialog(backend, ttl=1))
+    assert before == (StockStates.waiting_for_second_ticker.state, {'first_ticker': 'AAPL'})
+    assert after == (None, {})